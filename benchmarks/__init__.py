@@ -0,0 +1 @@
+"""Offline benchmark harness. See `benchmarks/run.py`."""
@@ -0,0 +1,129 @@
+# File: benchmarks/fake_google.py
+"""
+Local stand-in for Google's OAuth endpoints (token, JWKS, userinfo).
+
+Any authorization code is accepted: a code containing "@" is used as the
+account email, anything else becomes `<code>@example.com`. The returned
+`id_token` is RS256-signed with a key generated at startup and published on
+/certs, so the application's real verification path runs unchanged.
+
+In-process (what `benchmarks.run` does):
+
+    from src.app.utils.oauth import use_http_client
+    use_http_client(httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_google.app)))
+
+As a server, pointing the app at it through the environment:
+
+    python -m benchmarks.fake_google --port 9100
+    GOOGLE_TOKEN_URL=http://127.0.0.1:9100/token \
+    GOOGLE_JWKS_URL=http://127.0.0.1:9100/certs \
+    GOOGLE_USERINFO_URL=http://127.0.0.1:9100/userinfo uvicorn src.app.main:app
+
+GET /stats returns per-endpoint request counts (e.g. to check that sign-in
+no longer calls userinfo).
+"""
+import argparse
+import hashlib
+import secrets
+import time
+from collections import Counter
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import FastAPI, Form, Header, HTTPException
+from fastapi.responses import JSONResponse
+from jose import jwk, jwt
+
+ISSUER = "https://accounts.google.com"
+KEY_ID = "fake-google-1"
+TOKEN_LIFETIME = 3600
+
+_private_pem = rsa.generate_private_key(public_exponent=65537, key_size=2048).private_bytes(
+    serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+)
+_signing_key = jwk.construct(_private_pem, "RS256")   # Parsing the PEM per request is slow.
+_public_jwk = {
+    **_signing_key.public_key().to_dict(),
+    "kid": KEY_ID,
+    "use": "sig",
+}
+
+app = FastAPI(title="Fake Google OAuth")
+calls = Counter()
+_access_tokens: dict[str, dict] = {}
+
+
+def _profile(code: str) -> dict:
+    email = code if "@" in code else f"{code}@example.com"
+    name = email.split("@")[0]
+    return {
+        "sub": str(int(hashlib.sha256(email.encode()).hexdigest()[:16], 16)),
+        "email": email,
+        "email_verified": True,
+        "name": name.title(),
+        "given_name": name.title(),
+        "picture": f"https://example.com/avatars/{name}.png",
+    }
+
+
+@app.post("/token")
+def token(
+    code: str = Form(...),
+    client_id: str = Form(...),
+    grant_type: str = Form("authorization_code"),
+):
+    calls["token"] += 1
+    if grant_type != "authorization_code":
+        raise HTTPException(status_code=400, detail="unsupported_grant_type")
+    profile = _profile(code)
+    access_token = secrets.token_urlsafe(32)
+    _access_tokens[access_token] = profile
+    now = int(time.time())
+    id_token = jwt.encode(
+        {**profile, "iss": ISSUER, "aud": client_id, "iat": now, "exp": now + TOKEN_LIFETIME},
+        _signing_key,
+        algorithm="RS256",
+        headers={"kid": KEY_ID},
+        access_token=access_token,
+    )
+    return {
+        "access_token": access_token,
+        "id_token": id_token,
+        "expires_in": TOKEN_LIFETIME,
+        "token_type": "Bearer",
+        "scope": "openid email profile",
+    }
+
+
+@app.get("/certs")
+def certs():
+    calls["certs"] += 1
+    return JSONResponse({"keys": [_public_jwk]}, headers={"Cache-Control": "public, max-age=3600"})
+
+
+@app.get("/userinfo")
+def userinfo(authorization: str = Header("")):
+    calls["userinfo"] += 1
+    profile = _access_tokens.get(authorization.removeprefix("Bearer "))
+    if profile is None:
+        raise HTTPException(status_code=401, detail="invalid_token")
+    return profile
+
+
+@app.get("/stats")
+def stats():
+    return dict(calls)
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the fake Google OAuth endpoints.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    args = parser.parse_args()
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
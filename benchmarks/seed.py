@@ -0,0 +1,161 @@
+# File: benchmarks/seed.py
+"""
+Deterministic data generator for the benchmark harness.
+
+The same `Scale` and `seed` always produce the same ids and rows, so runs
+against different commits hit identical data. Rows are written with Core
+bulk inserts in batches; all users share one password hash (bcrypt would
+otherwise dominate seeding time).
+"""
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from src.app.models import (
+    Assignment,
+    AssignmentSubmission,
+    Course,
+    CourseProgress,
+    Enrollment,
+    Notification,
+    Option,
+    Question,
+    Quiz,
+    QuizSubmission,
+    User,
+    Video,
+    VideoProgress,
+)
+from src.app.utils.security import hash_password
+
+PASSWORD = "benchmark-password"
+BATCH_SIZE = 1000
+
+
+@dataclass
+class Scale:
+    courses: int = 20
+    videos_per_course: int = 15
+    students: int = 200
+    enrollments_per_student: int = 3
+    quizzes_per_course: int = 2
+    questions_per_quiz: int = 5
+    assignments_per_course: int = 2
+    submission_rate: float = 0.5   # Share of (enrolled student, quiz/assignment) pairs with a submission.
+    progress_rate: float = 0.5     # Share of enrolled videos marked completed.
+
+
+@dataclass
+class Dataset:
+    """Ids the load generator needs to build realistic requests."""
+    students: list = field(default_factory=list)
+    courses: list = field(default_factory=list)
+    enrollments: dict = field(default_factory=dict)   # student id -> [course id]
+    videos: dict = field(default_factory=dict)        # course id -> [video id]
+    quizzes: dict = field(default_factory=dict)       # course id -> [quiz id]
+    assignments: dict = field(default_factory=dict)   # course id -> [assignment id]
+
+
+def _insert(conn, model, rows: list) -> None:
+    for start in range(0, len(rows), BATCH_SIZE):
+        conn.execute(model.__table__.insert(), rows[start:start + BATCH_SIZE])
+
+
+def seed(engine, scale: Scale, seed: int = 42) -> Dataset:
+    rng = random.Random(seed)
+
+    def new_id() -> uuid.UUID:
+        return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+    now = datetime.utcnow()
+    created = datetime(2024, 1, 1)
+    password_hash = hash_password(PASSWORD)
+    data = Dataset()
+    rows = {model: [] for model in (
+        User, Course, Video, Quiz, Question, Option, Assignment, Enrollment,
+        VideoProgress, CourseProgress, QuizSubmission, AssignmentSubmission, Notification,
+    )}
+
+    for i in range(scale.students):
+        student_id = new_id()
+        data.students.append(student_id)
+        rows[User].append({
+            "id": student_id, "email": f"student{i}@bench.example.com", "hashed_password": password_hash,
+            "role": "student", "is_active": True, "full_name": f"Student {i}",
+        })
+
+    for c in range(scale.courses):
+        course_id = new_id()
+        data.courses.append(course_id)
+        rows[Course].append({
+            "id": course_id, "title": f"Course {c}", "description": "Benchmark course " * 20,
+            "price": float(rng.randint(0, 200)), "difficulty_level": rng.choice(["beginner", "intermediate", "advanced"]),
+            "created_at": created + timedelta(days=c), "updated_at": created + timedelta(days=c),
+            "outcomes": "Outcome\n" * 10, "prerequisites": "Prerequisite\n" * 5,
+            "curriculum": "Lesson\n" * 30, "status": "active",
+        })
+        data.videos[course_id] = []
+        for v in range(scale.videos_per_course):
+            video_id = new_id()
+            data.videos[course_id].append(video_id)
+            rows[Video].append({
+                "id": video_id, "course_id": course_id, "youtube_url": f"https://youtu.be/bench{c}x{v}",
+                "title": f"Video {v}", "description": "Benchmark video", "position": v,
+            })
+        data.quizzes[course_id] = []
+        for q in range(scale.quizzes_per_course):
+            quiz_id = new_id()
+            data.quizzes[course_id].append(quiz_id)
+            rows[Quiz].append({"id": quiz_id, "course_id": course_id, "title": f"Quiz {q}", "description": None})
+            for n in range(scale.questions_per_quiz):
+                question_id = new_id()
+                rows[Question].append({"id": question_id, "quiz_id": quiz_id, "text": f"Question {n}?", "is_multiple_choice": True})
+                correct = rng.randrange(4)
+                for o in range(4):
+                    rows[Option].append({"id": new_id(), "question_id": question_id, "text": f"Option {o}", "is_correct": o == correct})
+        data.assignments[course_id] = []
+        for a in range(scale.assignments_per_course):
+            assignment_id = new_id()
+            data.assignments[course_id].append(assignment_id)
+            rows[Assignment].append({
+                "id": assignment_id, "course_id": course_id, "title": f"Assignment {a}",
+                "description": "Benchmark assignment", "due_date": now + timedelta(days=30),
+            })
+
+    per_student = min(scale.enrollments_per_student, scale.courses)
+    for student_id in data.students:
+        courses = rng.sample(data.courses, per_student)
+        data.enrollments[student_id] = courses
+        for course_id in courses:
+            rows[Enrollment].append({
+                "id": new_id(), "user_id": student_id, "course_id": course_id, "status": "approved",
+                "enroll_date": now - timedelta(days=10), "expiration_date": now + timedelta(days=365),
+                "is_accessible": True, "days_remaining": 365, "audit_log": [],
+            })
+            completed = [video_id for video_id in data.videos[course_id] if rng.random() < scale.progress_rate]
+            for video_id in completed:
+                rows[VideoProgress].append({"id": new_id(), "user_id": student_id, "video_id": video_id, "completed": True})
+            total = len(data.videos[course_id]) or 1
+            rows[CourseProgress].append({
+                "id": new_id(), "user_id": student_id, "course_id": course_id,
+                "completed": len(completed) == total, "progress_percentage": 100.0 * len(completed) / total,
+            })
+            for quiz_id in data.quizzes[course_id]:
+                if rng.random() < scale.submission_rate:
+                    rows[QuizSubmission].append({"id": new_id(), "quiz_id": quiz_id, "student_id": student_id, "submitted_at": now})
+            for assignment_id in data.assignments[course_id]:
+                if rng.random() < scale.submission_rate:
+                    rows[AssignmentSubmission].append({
+                        "id": new_id(), "assignment_id": assignment_id, "student_id": student_id,
+                        "submitted_at": now, "content_url": "https://example.com/submission.pdf",
+                    })
+        rows[Notification].append({
+            "id": new_id(), "user_id": student_id, "event_type": "enrollment_approved",
+            "details": "Benchmark notification", "timestamp": now,
+        })
+
+    with engine.begin() as conn:
+        for model, model_rows in rows.items():
+            _insert(conn, model, model_rows)
+    return data
@@ -0,0 +1,117 @@
+# File location: src/app/config/logging_config.py
+"""
+Central logging setup.
+
+Every record goes through a `QueueHandler` on the root logger, so request
+threads and the event loop only enqueue it; a `QueueListener` thread does
+the formatting and the actual stream/file I/O.
+
+Configuration (environment):
+- LOG_LEVEL: root level (default INFO);
+- LOG_LEVELS: per-module overrides, e.g. `src.app.db.slow_query=WARNING,httpx=DEBUG`;
+- LOG_FORMAT: `json` (default, one object per line) or `text`;
+- LOG_FILE: optional path written in addition to stderr.
+"""
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Applied before LOG_LEVELS, which can override them.
+DEFAULT_LEVELS = {
+    "sqlalchemy": "WARNING",
+    "src.app.db.pool_metrics": "WARNING",
+    "passlib": "ERROR",
+    "httpx": "WARNING",
+}
+
+# Attributes every LogRecord has; anything else was passed via `extra=`.
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+_listener: QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(QueueHandler):
+    """Like QueueHandler, but keeps the traceback out of the message (`exc_text`)."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _parse_levels(spec: str) -> dict:
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, level = item.partition("=")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging() -> None:
+    """Install the queue-based handlers. Safe to call more than once."""
+    global _listener
+    if _listener is not None:
+        return
+
+    formatter = (
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        if os.getenv("LOG_FORMAT", "json").lower() == "text"
+        else JsonFormatter()
+    )
+    handlers = [logging.StreamHandler(sys.stderr)]
+    log_file = os.getenv("LOG_FILE")
+    if log_file:
+        os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+        handlers.append(logging.FileHandler(log_file))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers = [_QueueHandler(log_queue)]
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+
+    # Route uvicorn's loggers (configured before the app is imported) through the queue too.
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers = []
+        uvicorn_logger.propagate = True
+
+    for name, level in {**DEFAULT_LEVELS, **_parse_levels(os.getenv("LOG_LEVELS", ""))}.items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
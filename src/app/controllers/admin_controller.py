@@ -1,7 +1,8 @@
 # File: app/controllers/admin_controller.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, Body, Query, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Query, File, UploadFile, BackgroundTasks
 from sqlmodel import Session, select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List, Optional
 from src.app.models.user import User
 from src.app.models.course import Course
@@ -10,16 +11,31 @@ from src.app.models.enrollment import Enrollment
 from src.app.models.notification import Notification
 from src.app.models.video_progress import VideoProgress
 from src.app.models.course_progress import CourseProgress
-from src.app.db.session import get_db
+from src.app.db.session import get_db, get_async_db
+from src.app.db.pool_metrics import pool_status
+from src.app.db.statement_stats import statement_stats, SLOW_QUERY_MS
+from src.app.db.session import SERVERLESS, PGBOUNCER
+from src.app.utils.runtime_metrics import cold_start
+from src.app.utils.user_cache import user_cache
+from src.app.utils.token_revocation import revoke_user_tokens, token_revocations
+from src.app.utils.course_versions import course_versions
+from src.app.utils.catalog_cache import catalog_cache
+from src.app.utils.course_search import course_search_index
+from src.app.utils.password_hashing import password_hasher, bulk_password_hasher
+from src.app.utils.student_import import ENROLLMENT_STATUSES, ImportOptions, import_students
+from src.app.utils.email import send_reset_pin_email
+from src.app.controllers.auth_controller import forgot_password_limiter, reset_password_limiter
 from src.app.utils.dependencies import get_current_admin_user
 from uuid import UUID
-from sqlalchemy.orm import selectinload 
+from sqlalchemy.orm import selectinload, undefer
 from src.app.schemas.user import UserRead
+from src.app.schemas.student_import import StudentImportReport
 from src.app.schemas.course import (
     AdminCourseList, AdminCourseDetail, AdminCourseStats,
     CourseCreate, CourseUpdate, CourseRead, CourseCreateAdmin
 )
-from src.app.schemas.video import VideoUpdate, VideoRead
+from src.app.schemas.video import VideoUpdate, VideoRead, PlaylistVideo, PlaylistSyncResult
+from src.app.db.video_repository import PlaylistSyncError, course_playlist, sync_playlist
 from src.app.schemas.notification import NotificationRead, AdminNotificationRead
 import uuid
 import re
@@ -34,6 +50,8 @@ from src.app.schemas.assignment import AssignmentCreate, AssignmentRead, Assignm
 from src.app.schemas.quiz import QuizCreate, QuizRead, QuizUpdate, QuizResult, QuizSubmissionStatus
 import logging
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(tags=["Admin"])
 
 # 1. Enrollment Management
@@ -42,7 +60,95 @@ def list_students(session: Session = Depends(get_db), admin=Depends(get_current_
     query = select(User).where(User.role == "student")
     return session.exec(query).all()
 
+@router.post("/users/{user_id}/suspend", response_model=UserRead)
+def suspend_user(
+    user_id: UUID,
+    reason: Optional[str] = Body(None, embed=True),
+    session: Session = Depends(get_db),
+    admin=Depends(get_current_admin_user)
+):
+    """Deactivate an account and revoke its tokens; every worker rejects them within seconds."""
+    user = session.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if user.id == admin.id:
+        raise HTTPException(status_code=400, detail="You cannot suspend your own account")
+    user.is_active = False
+    user.suspended_at = datetime.utcnow().isoformat()
+    user.suspend_reason = reason
+    revoke_user_tokens(user)
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    logger.info("User %s suspended by %s", user.id, admin.id)
+    return user
 
+@router.post("/users/{user_id}/reactivate", response_model=UserRead)
+def reactivate_user(
+    user_id: UUID,
+    session: Session = Depends(get_db),
+    admin=Depends(get_current_admin_user)
+):
+    user = session.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    user.is_active = True
+    user.suspended_at = None
+    user.suspend_reason = None
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    logger.info("User %s reactivated by %s", user.id, admin.id)
+    return user
+
+
+
+@router.post("/students/import", response_model=StudentImportReport)
+async def import_students_file(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(..., description="CSV with a header row, or NDJSON (one object per line)"),
+    course_id: Optional[UUID] = Form(None, description="Enroll every row in this course unless the row names one"),
+    enrollment_status: str = Form("approved"),
+    duration_months: Optional[int] = Form(None, description="Access duration for approved enrollments"),
+    send_reset_pins: bool = Form(False, description="Email a reset PIN to rows without a password"),
+    dry_run: bool = Form(False),
+    session: AsyncSession = Depends(get_async_db),
+    admin=Depends(get_current_admin_user)
+):
+    """
+    Create student accounts (User + Profile, optional Enrollment) in bulk.
+
+    Columns / keys: `email` (required), `password`, `full_name`, `course_id`,
+    `enrollment_status`. Invalid rows are skipped and listed in `errors`;
+    everything else is created. With `dry_run` nothing is written.
+    """
+    name = (file.filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")) or file.content_type in ("application/x-ndjson", "application/jsonl"):
+        fmt = "ndjson"
+    elif name.endswith(".csv") or file.content_type == "text/csv":
+        fmt = "csv"
+    else:
+        raise HTTPException(status_code=400, detail="Upload a .csv or .ndjson file")
+    if enrollment_status not in ENROLLMENT_STATUSES:
+        raise HTTPException(status_code=400, detail=f"enrollment_status must be one of {', '.join(ENROLLMENT_STATUSES)}")
+
+    options = ImportOptions(
+        course_id=course_id,
+        enrollment_status=enrollment_status,
+        duration_months=duration_months,
+        send_reset_pins=send_reset_pins,
+        dry_run=dry_run,
+    )
+    result = await import_students(session, file.file, fmt, options)
+    for email, pin in result.pins:
+        background_tasks.add_task(send_reset_pin_email, email, pin)
+    report = result.report()
+    logger.info(
+        "Student import by %s: %d rows, %d created, %d failed in %.0f ms%s",
+        admin.id, report["total_rows"], report["created"], report["failed"], report["duration_ms"],
+        " (dry run)" if dry_run else "",
+    )
+    return report
 
 @router.get("/courses", response_model=list[AdminCourseList])
 def admin_list_courses(db: Session = Depends(get_db), admin=Depends(get_current_admin_user)):
@@ -142,6 +248,8 @@ async def create_course(
     if course_data.videos:
         for video_data in course_data.videos:
             all_video_objects.append(Video(**video_data.dict()))
+    for position, video in enumerate(all_video_objects):
+        video.position = position
 
     # 3. Establish relationships in the correct order
     # This populates video.course_id via back_populates
@@ -159,8 +267,9 @@ async def create_course(
         db.commit()
     except Exception as e:
         db.rollback()
-        print(f"Database commit failed: {e}")
+        logger.exception("Database commit failed while creating course")
         raise HTTPException(status_code=500, detail="An error occurred while creating the course.")
+    catalog_cache.bump()
 
     # 5. Refresh the objects to get DB-generated values
     db.refresh(new_course)
@@ -185,6 +294,7 @@ def get_course_detail(
         select(Course)
         .where(Course.id == course_id)
         .options(
+            undefer(Course.description),
             selectinload(Course.videos),
             selectinload(Course.preview_video)
         )
@@ -307,6 +417,7 @@ async def update_course(
         try:
             db.add(course)
             db.commit()
+            catalog_cache.bump()
             db.refresh(course)
             
             # Return simple success message
@@ -330,6 +441,38 @@ async def update_course(
             detail=f"Unexpected error updating course: {str(e)}"
         )
 
+@router.put("/courses/{course_id}/videos", response_model=PlaylistSyncResult)
+async def sync_course_playlist(
+    course_id: UUID,
+    videos: List[PlaylistVideo] = Body(..., description="The complete playlist in order"),
+    session: AsyncSession = Depends(get_async_db),
+    admin: User = Depends(get_current_admin_user)
+):
+    """
+    Replace the course's playlist with `videos`, in the order given.
+
+    Entries with an `id` keep that video (and its students' progress) and
+    change only the fields sent; entries without one are added; videos left
+    out are deleted. Only the differences are written, in one transaction.
+    """
+    try:
+        changes = await sync_playlist(session, course_id, videos)
+    except PlaylistSyncError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if changes is None:
+        raise HTTPException(status_code=404, detail="Course not found")
+    logger.info(
+        "Playlist of course %s synced by %s: %d added, %d updated, %d moved, %d deleted",
+        course_id, admin.id, changes.inserted, changes.updated, changes.moved, changes.deleted,
+    )
+    return PlaylistSyncResult(
+        inserted=changes.inserted,
+        updated=changes.updated,
+        moved=changes.moved,
+        deleted=changes.deleted,
+        videos=await course_playlist(session, course_id),
+    )
+
 # Delete a course (hard delete)
 @router.delete("/courses/{course_id}", status_code=status.HTTP_200_OK)
 def delete_course(
@@ -370,6 +513,7 @@ def delete_course(
         # will handle the deletion of related entities.
         db.delete(course)
         db.commit()
+        catalog_cache.bump()
         
         return {"message": "Course deleted successfully"}
 
@@ -515,7 +659,7 @@ async def get_course_detail(
         course = db.exec(
             select(Course)
             .where(Course.id == course_id)
-            .options(selectinload(Course.videos))
+            .options(undefer(Course.description), selectinload(Course.videos))
         ).first()
         
         if not course:
@@ -666,8 +810,7 @@ def approve_enrollment_by_user(
                 days_remaining=enrollment.days_remaining or 0
             )
     except Exception as e:
-        import logging
-        logging.getLogger(__name__).error(f"Failed to send enrollment approval email: {e}")
+        logger.error("Failed to send enrollment approval email: %s", e)
     # --- End email logic ---
 
     return {
@@ -1070,3 +1213,68 @@ def admin_delete_quiz(
             status_code=500,
             detail=f"Error deleting quiz: {str(e)}"
         )
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 3. System diagnostics
+# ──────────────────────────────────────────────────────────────────────────────
+
+@router.get("/system/db-pool", response_model=dict)
+def admin_db_pool_status(admin=Depends(get_current_admin_user)):
+    """
+    Live connection-pool metrics for every database engine in this worker:
+    checked-out connections, overflow, checkout wait-time histogram and
+    pre-ping failures. Use it to size DB_POOL_SIZE/DB_MAX_OVERFLOW against
+    the Postgres connection limit.
+    """
+    return pool_status()
+
+@router.get("/system/runtime", response_model=dict)
+def admin_runtime_status(admin=Depends(get_current_admin_user)):
+    """Deployment mode, cold-start timing, user-cache and password-hashing stats of the worker serving this request."""
+    return {
+        "serverless": SERVERLESS,
+        "pgbouncer": PGBOUNCER,
+        "cold_start": cold_start.snapshot(),
+        "user_cache": user_cache.stats(),
+        "password_hashing": password_hasher.stats(),
+        "bulk_password_hashing": bulk_password_hasher.stats(),
+        "token_revocations": token_revocations.stats(),
+        "course_versions": course_versions.stats(),
+        "catalog_cache": catalog_cache.stats(),
+        "course_search_index": course_search_index.stats(),
+        "password_reset_limits": {
+            "reset_password": reset_password_limiter.stats(),
+            "forgot_password": forgot_password_limiter.stats(),
+        },
+    }
+
+@router.get("/system/db-statements", response_model=dict)
+def admin_db_statement_stats(
+    limit: int = Query(20, ge=1, le=500),
+    order_by: str = Query("total_ms", pattern="^(total_ms|calls|mean_ms|max_ms|p50_ms|p95_ms|p99_ms)$"),
+    admin=Depends(get_current_admin_user),
+):
+    """
+    Top-N statement fingerprints of this worker by total DB time (or the
+    `order_by` column), with call counts and rolling p50/p95/p99 latency.
+    """
+    return {
+        "slow_query_ms": SLOW_QUERY_MS,
+        "evicted_fingerprints": statement_stats.evicted,
+        "statements": statement_stats.top(limit, order_by),
+    }
+
+@router.delete("/system/db-statements", status_code=status.HTTP_204_NO_CONTENT)
+def admin_reset_db_statement_stats(admin=Depends(get_current_admin_user)):
+    """Clear the collected statement statistics of this worker."""
+    statement_stats.reset()
+
+@router.get("/system/catalog-cache", response_model=dict)
+def admin_catalog_cache_stats(admin=Depends(get_current_admin_user)):
+    """Catalog version, size and hit/miss counters of this worker's course catalog cache."""
+    return catalog_cache.stats()
+
+@router.delete("/system/catalog-cache", response_model=dict)
+def admin_flush_catalog_cache(admin=Depends(get_current_admin_user)):
+    """Evict this worker's cached courses and catalog pages (e.g. after editing courses in SQL)."""
+    return {"version": catalog_cache.bump()}
@@ -6,21 +6,12 @@ from fastapi import HTTPException, status
 from datetime import datetime
 
 from ..models.assignment import Assignment, AssignmentSubmission
-from ..models.enrollment import Enrollment
+from ..db.enrollment_repository import has_course_access
 from ..schemas.assignment import SubmissionCreate
 
 def _ensure_enrollment(db: Session, course_id: UUID, student_id: UUID):
     """Raise 403 if the student isn't approved + accessible for this course."""
-    stmt = (
-        select(Enrollment)
-        .where(
-            Enrollment.course_id     == course_id,
-            Enrollment.user_id       == student_id,
-            Enrollment.status        == "approved",
-            Enrollment.is_accessible == True,
-        )
-    )
-    if not db.exec(stmt).first():
+    if not has_course_access(db, student_id, course_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="🚫 You are not enrolled in this course."
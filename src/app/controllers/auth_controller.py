@@ -1,19 +1,21 @@
 # File: application/src/app/controllers/auth_controller.py
 from fastapi import APIRouter, Depends, HTTPException, status, Response, BackgroundTasks, Request
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlalchemy import and_, update
+from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import datetime, timedelta
-from random import randint
 from fastapi.responses import RedirectResponse
 from authlib.integrations.starlette_client import OAuthError
 import os
+import secrets
 from uuid import uuid4
 from src.app.models.profile import Profile
 
-from src.app.db.session import get_db
+from src.app.db.session import get_async_db
+from src.app.db.oauth_repository import link_oauth_account
 from src.app.models.user import User
 from src.app.models.password_reset import PasswordReset
-from src.app.models.oauth import OAuthAccount
 from src.app.schemas.user import UserCreate, UserRead
 from src.app.schemas.password_reset import (
     ForgotPasswordRequest,
@@ -23,31 +25,62 @@ from src.app.schemas.password_reset import (
 )
 from src.app.schemas.oauth import OAuthResponse
 from src.app.utils.security import (
-    hash_password,
-    verify_password,
     create_access_token,
     decode_access_token,
+    hash_reset_pin,
 )
+from src.app.utils.password_hashing import password_hasher
+from src.app.utils.rate_limit import SlidingWindowLimiter
+from src.app.utils.token_revocation import revoke_user_tokens
+from src.app.utils.user_cache import CurrentUser, user_cache
+from src.app.utils.dependencies import get_current_user
 from src.app.utils.email import send_reset_pin_email
 from src.app.utils.oauth import (
     get_google_token,
-    get_google_user_info,
+    verify_google_id_token,
     create_oauth_response,
     GOOGLE_CLIENT_ID,
     GOOGLE_REDIRECT_URI
 )
 import logging
 
+logger = logging.getLogger(__name__)
+
+# Per-account limits on the password reset flow (in-memory, per process).
+PASSWORD_RESET_WINDOW_SECONDS = float(os.getenv("PASSWORD_RESET_WINDOW_SECONDS", 900))
+PASSWORD_RESET_MAX_ATTEMPTS = int(os.getenv("PASSWORD_RESET_MAX_ATTEMPTS", 5))
+FORGOT_PASSWORD_MAX_REQUESTS = int(os.getenv("FORGOT_PASSWORD_MAX_REQUESTS", 3))
+
+reset_password_limiter = SlidingWindowLimiter(PASSWORD_RESET_MAX_ATTEMPTS, PASSWORD_RESET_WINDOW_SECONDS)
+forgot_password_limiter = SlidingWindowLimiter(FORGOT_PASSWORD_MAX_REQUESTS, PASSWORD_RESET_WINDOW_SECONDS)
+
 router = APIRouter()
 
+
+async def _rehash_if_needed(session: AsyncSession, user: User, new_hash: str | None):
+    """Store a hash made with the current BCRYPT_ROUNDS after a successful login."""
+    if new_hash:
+        user.hashed_password = new_hash
+        session.add(user)
+        await session.commit()
+
+def _issue_access_token(user, subject_claim: str = "user_id") -> str:
+    """Token carrying what authorization needs, so requests skip the user lookup."""
+    return create_access_token({
+        subject_claim: str(user.id),
+        "role": user.role,
+        "email": user.email,
+        "ver": user.token_version,
+    })
+
 @router.post("/signup", response_model=UserRead)
-def signup(
+async def signup(
     user: UserCreate,
-    session: Session = Depends(get_db)
+    session: AsyncSession = Depends(get_async_db)
 ):
-    existing = session.exec(
+    existing = (await session.exec(
         select(User).where(User.email == user.email)
-    ).first()
+    )).first()
     if existing:
         raise HTTPException(
             status.HTTP_400_BAD_REQUEST,
@@ -57,11 +90,11 @@ def signup(
     # 1️⃣ Create the User
     new_user = User(
         email=user.email,
-        hashed_password=hash_password(user.password)
+        hashed_password=await password_hasher.hash(user.password)
     )
     session.add(new_user)
-    session.commit()
-    session.refresh(new_user)
+    await session.commit()
+    await session.refresh(new_user)
 
     # 2️⃣ Create a blank Profile for them
     profile = Profile(
@@ -71,21 +104,24 @@ def signup(
         bio=None
     )
     session.add(profile)
-    session.commit()
+    await session.commit()
 
     return new_user
 
 @router.post("/admin-login")
-def admin_login(
+async def admin_login(
     response: Response,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    session: Session = Depends(get_db)
+    session: AsyncSession = Depends(get_async_db)
 ):
-    logging.info("Attempting admin login for user: %s", form_data.username)
-    user = session.exec(
+    logger.info("Attempting admin login for user: %s", form_data.username)
+    user = (await session.exec(
         select(User).where(User.email == form_data.username)
-    ).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    )).first()
+    valid, new_hash = await password_hasher.verify_and_update(
+        form_data.password, user.hashed_password if user else None
+    )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -100,7 +136,8 @@ def admin_login(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You are not authorized to access the admin panel."
         )
-    access_token = create_access_token({"sub": str(user.id), "role": user.role})
+    await _rehash_if_needed(session, user, new_hash)
+    access_token = _issue_access_token(user, subject_claim="sub")
     response.set_cookie(
         key="access_token",
         value=access_token,
@@ -117,21 +154,30 @@ def admin_login(
     }
 
 @router.post("/token")
-def login(
+async def login(
     response: Response,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    session: Session = Depends(get_db)
+    session: AsyncSession = Depends(get_async_db)
 ):
-    user = session.exec(
+    user = (await session.exec(
         select(User).where(User.email == form_data.username)
-    ).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    )).first()
+    valid, new_hash = await password_hasher.verify_and_update(
+        form_data.password, user.hashed_password if user else None
+    )
+    if not valid:
         raise HTTPException(
             status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    token = create_access_token({"user_id": str(user.id), "role": user.role})
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is not active"
+        )
+    await _rehash_if_needed(session, user, new_hash)
+    token = _issue_access_token(user)
     response.set_cookie(
         key="access_token",
         value=token,
@@ -146,19 +192,24 @@ def login(
     "/forgot-password",
     response_model=ForgotPasswordResponse
 )
-def forgot_password(
+async def forgot_password(
     request: ForgotPasswordRequest,
     background_tasks: BackgroundTasks,
-    session: Session = Depends(get_db)
+    session: AsyncSession = Depends(get_async_db)
 ):
+    forgot_password_limiter.hit(
+        request.email.lower(),
+        "Too many password reset requests. Please try again later."
+    )
+
     # Check if user exists and is active
-    user = session.exec(
-        select(User)
+    user_id = (await session.exec(
+        select(User.id)
         .where(User.email == request.email)
         .where(User.is_active == True)
-    ).first()
+    )).first()
 
-    if not user:
+    if not user_id:
         # Return a user-friendly message for non-existent or inactive users
         return {
             "message": "This email is not registered in our system. Please check the email address or sign up for a new account.",
@@ -166,35 +217,32 @@ def forgot_password(
         }
 
     # Generate a 6-digit PIN
-    pin = f"{randint(100000, 999999)}"
-    
-    # Create password reset record
-    reset = PasswordReset(
-        user_id=user.id,
-        pin=pin,
-        created_at=datetime.utcnow(),
-        expires_at=datetime.utcnow() + timedelta(minutes=15)
-    )
-    
+    pin = f"{secrets.randbelow(900000) + 100000}"
+    now = datetime.utcnow()
+
     # Invalidate any existing unused PINs for this user
-    existing_resets = session.exec(
-        select(PasswordReset)
-        .where(PasswordReset.user_id == user.id)
-        .where(PasswordReset.used == False)
-        .where(PasswordReset.expires_at > datetime.utcnow())
-    ).all()
-    
-    for existing in existing_resets:
-        existing.used = True
-        session.add(existing)
-    
-    # Add new reset record
-    session.add(reset)
-    session.commit()
-    
+    await session.exec(
+        update(PasswordReset)
+        .where(
+            PasswordReset.user_id == user_id,
+            PasswordReset.used == False,
+            PasswordReset.expires_at > now
+        )
+        .values(used=True)
+    )
+
+    # Add new reset record; only the keyed hash of the PIN is stored
+    session.add(PasswordReset(
+        user_id=user_id,
+        pin_hash=hash_reset_pin(pin),
+        created_at=now,
+        expires_at=now + timedelta(minutes=15)
+    ))
+    await session.commit()
+
     # Send email in background
-    background_tasks.add_task(send_reset_pin_email, user.email, pin)
-    
+    background_tasks.add_task(send_reset_pin_email, request.email, pin)
+
     # Return success message for valid users
     return {
         "message": "We've sent a password reset PIN to your email. Please check your inbox and spam folder.",
@@ -205,82 +253,69 @@ def forgot_password(
     "/reset-password",
     response_model=ResetPasswordResponse
 )
-def reset_password(
+async def reset_password(
     data: ResetPasswordRequest,
-    session: Session = Depends(get_db)
+    session: AsyncSession = Depends(get_async_db)
 ):
-    # First check if user exists
-    user = session.exec(
-        select(User)
-        .where(User.email == data.email)
-        .where(User.is_active == True)
-    ).first()
-    
-    if not user:
+    limiter_key = data.email.lower()
+    reset_password_limiter.hit(
+        limiter_key,
+        "Too many password reset attempts. Please request a new PIN later."
+    )
+
+    # One round trip resolves the user and the state of the matching PIN.
+    # Unused PINs sort first, then the latest expiry, so a valid PIN wins
+    # over an expired one, which wins over a used one.
+    row = (await session.exec(
+        select(User, PasswordReset.id, PasswordReset.used, PasswordReset.expires_at)
+        .outerjoin(
+            PasswordReset,
+            and_(
+                PasswordReset.user_id == User.id,
+                PasswordReset.pin_hash == hash_reset_pin(data.pin)
+            )
+        )
+        .where(User.email == data.email, User.is_active == True)
+        .order_by(PasswordReset.used, PasswordReset.expires_at.desc())
+        .limit(1)
+    )).first()
+
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid email address. Please check your email and try again."
         )
-    
-    # Check for valid, unused, and non-expired PIN
-    reset = session.exec(
-        select(PasswordReset)
-        .where(
-            PasswordReset.user_id == user.id,
-            PasswordReset.pin == data.pin,
-            PasswordReset.used == False,
-            PasswordReset.expires_at >= datetime.utcnow()
-        )
-        .order_by(PasswordReset.created_at.desc())
-    ).first()
-    
-    if not reset:
-        # Check if PIN exists but is expired
-        expired_reset = session.exec(
-            select(PasswordReset)
-            .where(
-                PasswordReset.user_id == user.id,
-                PasswordReset.pin == data.pin,
-                PasswordReset.used == False,
-                PasswordReset.expires_at < datetime.utcnow()
-            )
-        ).first()
-        
-        if expired_reset:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="The PIN has expired. Please request a new password reset PIN."
-            )
-        
-        # Check if PIN exists but was already used
-        used_reset = session.exec(
-            select(PasswordReset)
-            .where(
-                PasswordReset.user_id == user.id,
-                PasswordReset.pin == data.pin,
-                PasswordReset.used == True
-            )
-        ).first()
-        
-        if used_reset:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="This PIN has already been used. Please request a new password reset PIN."
-            )
-        
-        # If none of the above, PIN is invalid
+
+    user, reset_id, used, expires_at = row
+    if reset_id is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid PIN. Please check the PIN and try again."
         )
-    
-    # Update password and mark PIN as used
-    user.hashed_password = hash_password(data.new_password)
-    reset.used = True
+    if used:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="This PIN has already been used. Please request a new password reset PIN."
+        )
+    if expires_at < datetime.utcnow():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The PIN has expired. Please request a new password reset PIN."
+        )
+
+    # Update password, sign out existing sessions and invalidate every
+    # outstanding PIN for the user
+    user.hashed_password = await password_hasher.hash(data.new_password)
+    revoke_user_tokens(user)
     session.add(user)
-    session.add(reset)
-    session.commit()
-    
+    await session.exec(
+        update(PasswordReset)
+        .where(PasswordReset.user_id == user.id, PasswordReset.used == False)
+        .values(used=True)
+    )
+    await session.commit()
+    reset_password_limiter.reset(limiter_key)
+
     return {
         "message": "Your password has been successfully reset. You can now login with your new password.",
         "status": "success"
@@ -293,94 +328,63 @@ def logout(
     response.delete_cookie("access_token")
     return {"message": "Logged out"}
 
+@router.post("/logout-all")
+async def logout_all(
+    response: Response,
+    current_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_db)
+):
+    """Revoke every token issued to the current user, on all devices."""
+    user = await session.get(User, current_user.id)
+    revoke_user_tokens(user)
+    session.add(user)
+    await session.commit()
+    response.delete_cookie("access_token")
+    return {"message": "Logged out from all devices"}
+
 @router.get("/google/login")
 async def google_login():
     """Redirect to Google OAuth login page."""
     try:
         auth_url = f"https://accounts.google.com/o/oauth2/v2/auth?response_type=code&client_id={GOOGLE_CLIENT_ID}&redirect_uri={GOOGLE_REDIRECT_URI}&scope=openid%20email%20profile"
-        print(f"Generated auth URL: {auth_url}")  # Debug log
         return {"url": auth_url}
     except Exception as e:
-        print(f"Error generating auth URL: {str(e)}")  # Debug log
+        logger.exception("Error generating Google auth URL")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,  
             detail=f"Error generating auth URL: {str(e)}"
         )
 
 @router.get("/google/callback", response_model=OAuthResponse)
-async def google_callback(code: str, response: Response, session: Session = Depends(get_db)):
+async def google_callback(code: str, response: Response, session: AsyncSession = Depends(get_async_db)):
     """Handle Google OAuth callback."""
     try:
-        print(f"Received callback with code: {code}")  # Debug log
-        print(f"Using redirect URI: {GOOGLE_REDIRECT_URI}")  # Debug log
-        
         # Get tokens from Google
         tokens = await get_google_token(code)
-        print(f"Received tokens from Google")  # Debug log
-        
-        # Get user info from Google
-        user_info = await get_google_user_info(tokens.access_token)
-        print(f"Received user info: {user_info.email}")  # Debug log
         
-        # Check if user exists with this email
-        user = session.exec(
-            select(User).where(User.email == user_info.email)
-        ).first()
+        # Profile claims from the locally verified id_token (no userinfo call)
+        user_info = await verify_google_id_token(tokens.id_token, tokens.access_token)
         
-        if not user:
-            # Create new user
-            user = User(
-                email=user_info.email,
-                full_name=user_info.name,
-                avatar_url=user_info.picture,
-                is_active=True
-            )
-            session.add(user)
-            session.commit()
-            session.refresh(user)
-            print(f"Created new user: {user.email}")  # Debug log
-        
-        # Ensure profile exists for user
-        profile = session.exec(
-            select(Profile).where(Profile.user_id == user.id)
-        ).first()
-        if not profile:
-            profile = Profile(
-                user_id=user.id,
-                full_name=user_info.name,
-                avatar_url=user_info.picture
-            )
-            session.add(profile)
-            session.commit()
-            print(f"Created profile for user: {user.email}")  # Debug log
-        
-        # Create or update OAuth account
-        oauth_account = session.exec(
-            select(OAuthAccount)
-            .where(OAuthAccount.provider == "google")
-            .where(OAuthAccount.provider_account_id == user_info.sub)
-        ).first()
-        
-        if not oauth_account:
-            oauth_account = OAuthAccount(
-                user_id=user.id,
-                provider="google",
-                provider_account_id=user_info.sub,
-                access_token=tokens.access_token,
-                expires_at=datetime.utcnow() + timedelta(seconds=tokens.expires_in)
+        # User (by email), profile and OAuth account in one transaction
+        user = await link_oauth_account(
+            session,
+            provider="google",
+            provider_account_id=user_info.sub,
+            email=user_info.email,
+            full_name=user_info.name,
+            avatar_url=user_info.picture,
+            access_token=tokens.access_token,
+            expires_in=tokens.expires_in,
+        )
+        user_cache.invalidate(str(user.id))
+        if not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="User account is not active"
             )
-        else:
-            oauth_account.access_token = tokens.access_token
-            oauth_account.expires_at = datetime.utcnow() + timedelta(seconds=tokens.expires_in)
-        
-        session.add(oauth_account)
-        session.commit()
         
         # Create JWT token
-        access_token = create_access_token({
-            "user_id": str(user.id),
-            "role": user.role
-        })
+        access_token = _issue_access_token(user)
         
         # Set the access token as a cookie on the response
         response.set_cookie(
@@ -391,7 +395,6 @@ async def google_callback(code: str, response: Response, session: Session = Depe
             samesite="lax",
             max_age=60 * 60  # 1 hour
         )
-        print(f"[LOG] Set JWT access_token cookie: {access_token}")
 
         # Create and return the OAuth response
         return OAuthResponse(
@@ -403,8 +406,10 @@ async def google_callback(code: str, response: Response, session: Session = Depe
             avatar_url=user.avatar_url
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error in Google callback: {str(e)}")  # Debug log
+        logger.exception("Google callback failed")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Google authentication failed: {str(e)}"
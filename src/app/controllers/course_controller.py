@@ -1,20 +1,29 @@
 # File: application/src/app/controllers/course_controller.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlmodel import Session, select
-from sqlalchemy.orm import selectinload
+from sqlmodel.ext.asyncio.session import AsyncSession
 from src.app.models.course import Course
 from ..models.enrollment import Enrollment
 from ..models.video import Video
 from ..models.video_progress import VideoProgress
 from ..models.course_progress import CourseProgress
 from ..models.certificate import Certificate
-from ..schemas.course import CourseRead, CourseListRead, CourseExploreList, CourseExploreDetail, CourseCurriculumDetail, CourseDetail, CurriculumSchema, OutcomesSchema, PrerequisitesSchema, CourseBasicDetail, DescriptionSchema
+from ..models.user import User
+from ..schemas.course import CourseRead, CourseListRead, CourseExploreList, CourseSearchResult, CourseExploreDetail, CourseCurriculumDetail, CourseDetail, CurriculumSchema, OutcomesSchema, PrerequisitesSchema, CourseBasicDetail, DescriptionSchema
 from ..schemas.course import VideoWithCheckpoint, CourseProgress as CourseProgressSchema
-from ..db.session import get_db
+from ..db.session import get_db, get_async_db, get_read_db, get_async_read_db
+from ..db.enrollment_repository import has_course_access_async
+from ..db.video_repository import course_videos_with_progress
+from ..db.course_repository import CatalogFilters, InvalidCursor
 from ..utils.dependencies import get_current_user
+from ..utils.course_versions import course_validators, course_versions
+from ..utils.catalog_cache import CourseRecord, catalog_cache
+from ..utils.course_search import search_courses
 from ..utils.certificate_generator import CertificateGenerator
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 import json
+import logging
+from typing import Optional
 from datetime import datetime
 import uuid
 import os
@@ -22,20 +31,21 @@ from ..utils.time import get_pakistan_time
 from fastapi import File
 
 router = APIRouter(tags=["Courses"])
+logger = logging.getLogger(__name__)
 
 
 @router.get("/my-courses", response_model=list[CourseRead])
-def get_my_courses(user=Depends(get_current_user), session: Session = Depends(get_db)):
+async def get_my_courses(user=Depends(get_current_user), session: AsyncSession = Depends(get_async_read_db)):
     # Find all enrollments for the user that are approved, accessible and not expired
     current_time = get_pakistan_time()
     
     # Get all enrollments for the user
-    enrollments = session.exec(
+    enrollments = (await session.exec(
         select(Enrollment).where(
             Enrollment.user_id == user.id,
             Enrollment.status == "approved"
         )
-    ).all()
+    )).all()
     
     # Filter enrollments based on expiration
     valid_enrollments = []
@@ -52,10 +62,10 @@ def get_my_courses(user=Depends(get_current_user), session: Session = Depends(ge
         return []
     
     # Return only the courses the user is enrolled in with required fields
-    courses = session.exec(
+    courses = (await session.exec(
         select(Course)
         .where(Course.id.in_(course_ids))
-    ).all()
+    )).all()
     
     # Create response with only required fields
     return [
@@ -68,9 +78,39 @@ def get_my_courses(user=Depends(get_current_user), session: Session = Depends(ge
     ]
 
 # --- Explore Courses: List --
+EXPLORE_PAGE_SIZE = 24
+
 @router.get("/explore-courses", response_model=list[CourseExploreList])
-def explore_courses(session: Session = Depends(get_db)):
-    courses = session.exec(select(Course)).all()
+def explore_courses(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    difficulty_level: Optional[str] = None,
+    status: Optional[str] = None,
+    session: Session = Depends(get_read_db)
+):
+    """
+    Newest courses first. Without `limit` or `cursor` every course is
+    returned, as before pagination existed. Passing either opts in to pages
+    of `limit` (default EXPLORE_PAGE_SIZE) courses; when more courses follow,
+    the `X-Next-Cursor` response header holds the `cursor` for the next page.
+    """
+    if cursor is not None and limit is None:
+        limit = EXPLORE_PAGE_SIZE
+    filters = CatalogFilters(
+        min_price=min_price,
+        max_price=max_price,
+        difficulty_level=difficulty_level,
+        status=status,
+    )
+    try:
+        courses, next_cursor = catalog_cache.get_page(session, filters, cursor, limit)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     # Return only id, title, price, thumbnail_url
     return [
         CourseExploreList(
@@ -81,137 +121,160 @@ def explore_courses(session: Session = Depends(get_db)):
         ) for course in courses
     ]
 
-# --- Explore Courses: Detail ---
-@router.get("/explore-courses/{course_id}", response_model=CourseExploreDetail)
-def explore_course_detail(course_id: str, session: Session = Depends(get_db)):
-    course = session.exec(select(Course).where(Course.id == course_id)).first()
+# --- Course Search ---
+@router.get("/search", response_model=list[CourseSearchResult])
+def search_course_catalog(
+    q: str = Query(..., min_length=2, max_length=200, description='Web-style query: words, "quoted phrase", or, -word'),
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=500),
+    status: Optional[str] = None,
+    session: Session = Depends(get_read_db)
+):
+    """Courses matching `q` in title, description, outcomes or curriculum, best match first."""
+    return [
+        CourseSearchResult(
+            id=hit.id,
+            title=hit.title,
+            price=hit.price,
+            thumbnail_url=hit.thumbnail_url,
+            rank=hit.rank,
+            snippet=hit.snippet or "",
+        ) for hit in search_courses(session, q, status, limit, offset)
+    ]
+
+def _get_course_with_validators(session: Session, course_id: str, response: Response, variant: str = "") -> CourseRecord:
+    try:
+        course = catalog_cache.get_course(session, uuid.UUID(course_id))
+    except ValueError:
+        course = None
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
-    return CourseExploreDetail(
+    response.headers.update(course_validators(course.id, course.updated_at, variant))
+    return course
+
+def _parse_fields(fields: Optional[str], model) -> tuple | None:
+    """`?fields=a,b` as a tuple in the model's field order (`id` always included); None for all fields."""
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(model.model_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(name for name in model.model_fields if name in requested or name == "id")
+
+# --- Explore Courses: Detail ---
+@router.get("/explore-courses/{course_id}", response_model=CourseExploreDetail)
+def explore_course_detail(
+    course_id: str,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return, e.g. `title,price,curriculum,outcomes`"
+    ),
+    session: Session = Depends(get_read_db)
+):
+    selected = _parse_fields(fields, CourseExploreDetail)
+    variant = ",".join(selected) if selected else ""
+    cached = course_versions.not_modified(request, session, course_id, variant)
+    if cached is not None:
+        return cached
+    course = _get_course_with_validators(session, course_id, response, variant)
+    detail = CourseExploreDetail(
         id=course.id,
         title=course.title,
         price=course.price,
         thumbnail_url=course.thumbnail_url,
         description=course.description,
-        outcomes=course.outcomes or "",
-        prerequisites=course.prerequisites or "",
-        curriculum=course.curriculum or ""
+        outcomes=course.outcomes,
+        prerequisites=course.prerequisites,
+        curriculum=course.curriculum
+    )
+    if selected is None:
+        return detail
+    # A sparse fieldset bypasses `response_model`, which would fill in the omitted fields.
+    return JSONResponse(
+        detail.model_dump(mode="json", include=set(selected)),
+        headers=course_validators(course.id, course.updated_at, variant),
     )
 # --- Curriculum Text Endpoint ---
 @router.get("/courses/{course_id}/curriculum", response_model=CurriculumSchema)
-def get_course_curriculum(course_id: str, session: Session = Depends(get_db)):
-    course = session.exec(select(Course).where(Course.id == course_id)).first()
-    if not course:
-        raise HTTPException(status_code=404, detail="Course not found")
-    return CurriculumSchema(curriculum=course.curriculum or "")
+def get_course_curriculum(course_id: str, request: Request, response: Response, session: Session = Depends(get_read_db)):
+    cached = course_versions.not_modified(request, session, course_id)
+    if cached is not None:
+        return cached
+    course = _get_course_with_validators(session, course_id, response)
+    return CurriculumSchema(curriculum=course.curriculum)
 
 @router.get("/courses/{course_id}/outcomes", response_model=OutcomesSchema)
-def get_course_outcomes(course_id: str, session: Session = Depends(get_db)):
-    course = session.exec(select(Course).where(Course.id == course_id)).first()
-    if not course:
-        raise HTTPException(status_code=404, detail="Course not found")
-    return OutcomesSchema(outcomes=course.outcomes or "")
+def get_course_outcomes(course_id: str, request: Request, response: Response, session: Session = Depends(get_read_db)):
+    cached = course_versions.not_modified(request, session, course_id)
+    if cached is not None:
+        return cached
+    course = _get_course_with_validators(session, course_id, response)
+    return OutcomesSchema(outcomes=course.outcomes)
 
 @router.get("/courses/{course_id}/prerequisites", response_model=PrerequisitesSchema)
-def get_course_prerequisites(course_id: str, session: Session = Depends(get_db)):
-    course = session.exec(select(Course).where(Course.id == course_id)).first()
-    if not course:
-        raise HTTPException(status_code=404, detail="Course not found")
-    return PrerequisitesSchema(prerequisites=course.prerequisites or "")
+def get_course_prerequisites(course_id: str, request: Request, response: Response, session: Session = Depends(get_read_db)):
+    cached = course_versions.not_modified(request, session, course_id)
+    if cached is not None:
+        return cached
+    course = _get_course_with_validators(session, course_id, response)
+    return PrerequisitesSchema(prerequisites=course.prerequisites)
 
 # --- Description Text Endpoint ---
 @router.get("/courses/{course_id}/description", response_model=DescriptionSchema)
-def get_course_description(course_id: str, session: Session = Depends(get_db)):
-    course = session.exec(select(Course).where(Course.id == course_id)).first()
-    if not course:
-        raise HTTPException(status_code=404, detail="Course not found")
-    return DescriptionSchema(description=course.description or "")
+def get_course_description(course_id: str, request: Request, response: Response, session: Session = Depends(get_read_db)):
+    cached = course_versions.not_modified(request, session, course_id)
+    if cached is not None:
+        return cached
+    course = _get_course_with_validators(session, course_id, response)
+    return DescriptionSchema(description=course.description)
 
 
 @router.get("/my-courses/{course_id}/videos", response_model=list[VideoWithCheckpoint])
-def get_course_videos_with_checkpoint(
+async def get_course_videos_with_checkpoint(
     course_id: str,
     user=Depends(get_current_user),
-    session: Session = Depends(get_db)
+    session: AsyncSession = Depends(get_async_read_db)
 ):
     try:
-        # Convert course_id to UUID
         course_uuid = uuid.UUID(course_id)
-        
-        # Check enrollment and expiration
-        current_time = datetime.utcnow()
-        enrollment = session.exec(
-            select(Enrollment).where(
-                Enrollment.user_id == user.id,
-                Enrollment.course_id == course_uuid,
-                Enrollment.status == "approved",
-                Enrollment.is_accessible == True,
-                (Enrollment.expiration_date > current_time) | (Enrollment.expiration_date == None)
-            )
-        ).first()
-        
-        if not enrollment:
-            raise HTTPException(
-                status_code=403, 
-                detail="You do not have access to this course or your access has expired."
-            )
-
-        # Get course videos
-        course = session.exec(
-            select(Course)
-            .where(Course.id == course_uuid)
-            .options(selectinload(Course.videos))
-        ).first()
-        
-        if not course:
-            raise HTTPException(status_code=404, detail="Course not found")
-
-        # Get all video IDs
-        video_ids = [video.id for video in course.videos]
-        if not video_ids:
-            return []
-
-        # Get video progress
-        progresses = session.exec(
-            select(VideoProgress).where(
-                VideoProgress.user_id == user.id,
-                VideoProgress.video_id.in_(video_ids)
-            )
-        ).all()
-        
-        # Create progress map using UUIDs
-        progress_map = {str(p.video_id): p.completed for p in progresses}
-
-        # Build response
-        result = []
-        for video in course.videos:
-            result.append(VideoWithCheckpoint(
-                id=str(video.id),
-                youtube_url=video.youtube_url,
-                title=video.title,
-                description=video.description,
-                watched=progress_map.get(str(video.id), False)
-            ))
-        return result
-
     except ValueError:
         raise HTTPException(
             status_code=400,
             detail="Invalid course ID format"
         )
+
+    # Access check, videos and the user's progress in one statement
+    try:
+        rows = await course_videos_with_progress(session, user.id, course_uuid)
     except Exception as e:
+        logger.exception("Fetching videos of course %s failed", course_uuid)
         raise HTTPException(
             status_code=500,
             detail=f"An error occurred while fetching course videos: {str(e)}"
         )
-
+    if rows is None:
+        raise HTTPException(
+            status_code=403,
+            detail="You do not have access to this course or your access has expired."
+        )
+    return [
+        VideoWithCheckpoint(
+            id=str(row.id),
+            youtube_url=row.youtube_url,
+            title=row.title,
+            description=row.description,
+            watched=bool(row.watched)
+        ) for row in rows
+    ]
 
 
 @router.post("/videos/{video_id}/complete")
-def mark_video_completed(
+async def mark_video_completed(
     video_id: str,
     user=Depends(get_current_user),
-    session: Session = Depends(get_db)
+    session: AsyncSession = Depends(get_async_db)
 ): 
     try:
         # Validate video_id format
@@ -224,9 +287,9 @@ def mark_video_completed(
             )
 
         # Check if video exists
-        video = session.exec(
+        video = (await session.exec(
             select(Video).where(Video.id == video_uuid)
-        ).first()
+        )).first()
         
         if not video:
             raise HTTPException(
@@ -235,30 +298,19 @@ def mark_video_completed(
             )
 
         # Check enrollment and expiration
-        current_time = datetime.utcnow()
-        enrollment = session.exec(
-            select(Enrollment).where(
-                Enrollment.user_id == user.id,
-                Enrollment.course_id == video.course_id,
-                Enrollment.status == "approved",
-                Enrollment.is_accessible == True,
-                (Enrollment.expiration_date > current_time) | (Enrollment.expiration_date == None)
-            )
-        ).first()
-
-        if not enrollment:
+        if not await has_course_access_async(session, user.id, video.course_id):
             raise HTTPException(
                 status_code=403,
                 detail="You are not enrolled in this course or your access has expired"
             )
         
         # Get video progress
-        progress = session.exec(
+        progress = (await session.exec(
             select(VideoProgress).where(
                 VideoProgress.user_id == user.id,
                 VideoProgress.video_id == video_uuid
             )
-        ).first()
+        )).first()
 
         if progress:
             # Toggle the completed status
@@ -276,7 +328,7 @@ def mark_video_completed(
             session.add(progress)
             message = "Video marked as completed"
 
-        session.commit()
+        await session.commit()
         # Refresh the object to get the updated state if needed, though for just returning a message it's not strictly necessary
         # session.refresh(progress)
         return {"detail": message}
@@ -284,7 +336,7 @@ def mark_video_completed(
     except HTTPException:
         raise
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"An error occurred while processing video completion status: {str(e)}"
@@ -344,11 +396,12 @@ def get_certificate(
         if not certificate:
             # Generate new certificate if it doesn't exist
             try:
-                if not user.full_name:
+                full_name = session.exec(select(User.full_name).where(User.id == user.id)).first()
+                if not full_name:
                     raise HTTPException(status_code=400, detail="Full name is required to generate a certificate. Please complete your profile.")
                 certificate_generator = CertificateGenerator()
                 certificate_url = certificate_generator.generate(
-                    username=user.full_name,
+                    username=full_name,
                     course_title=course.title,
                     completion_date=course_progress.completed_at
                 )
@@ -4,12 +4,15 @@ from sqlmodel import Session, select
 from ..models.enrollment import Enrollment, get_pakistan_time
 from src.app.models.course import Course
 from ..schemas.payment_proof import ProofCreate
-from ..db.session import get_db
+from ..db.session import get_db, get_read_db
 from ..utils.dependencies import get_current_user
+from ..utils.catalog_cache import catalog_cache
 from ..models.payment_proof import PaymentProof
 from ..models.notification import Notification
+from ..models.user import User
 from datetime import datetime, timedelta
 import os
+import uuid
 from uuid import uuid4
 from ..schemas.enrollment import EnrollmentStatus
 from ..utils.file import save_upload_and_get_url
@@ -22,8 +25,11 @@ router = APIRouter(
 from ..models.bank_account import BankAccount
 
 @router.get("/courses/{course_id}/purchase-info")
-def get_purchase_info(course_id: str, session: Session = Depends(get_db)):
-    course = session.exec(select(Course).where(Course.id == course_id)).first()
+def get_purchase_info(course_id: str, session: Session = Depends(get_read_db)):
+    try:
+        course = catalog_cache.get_course(session, uuid.UUID(course_id))
+    except ValueError:
+        course = None
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
     bank_accounts = session.exec(select(BankAccount).where(BankAccount.is_active == True)).all()
@@ -64,12 +70,14 @@ def submit_payment_proof(
     session.add(payment_proof)
     session.commit()
     # Notify admin, include user details and picture URL in details
+    # The token only carries id/email/role; the display name lives on the row.
+    full_name = session.exec(select(User.full_name).where(User.id == user.id)).first()
     notif = Notification(
         user_id=user.id,
         event_type="payment_proof",
         details=(
             f"Payment proof submitted for course {course.title}.\n"
-            f"User: {user.full_name or user.email} (ID: {user.id})\n"
+            f"User: {full_name or user.email} (ID: {user.id})\n"
             f"Email: {user.email}\n"
             f"Proof image: {url}"
         ),
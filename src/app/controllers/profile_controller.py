@@ -4,6 +4,7 @@ from sqlmodel import Session, select
 import shutil, os
 from uuid import uuid4
 from ..models.profile import Profile
+from ..models.user import User
 from ..schemas.profile import ProfileRead, ProfileUpdate
 from ..db.session import get_db
 from ..utils.dependencies import get_current_user
@@ -31,7 +32,7 @@ def update_profile(
     profile = session.exec(select(Profile).where(Profile.user_id == user.id)).first()
     if not profile:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Profile not found")
-    user_obj = session.exec(select(type(user)).where(type(user).id == user.id)).first()
+    user_obj = session.get(User, user.id)
     full_name_updated = False
     avatar_updated = False
     for k, v in data.dict(exclude_unset=True).items():
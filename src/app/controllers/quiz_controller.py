@@ -1,13 +1,15 @@
 # File: application/src/app/controllers/quiz_controller.py
 
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.orm import selectinload
 from uuid import UUID
 from fastapi import HTTPException, status
 from datetime import datetime
 
-from ..models.quiz import Quiz, QuizSubmission, Answer, Option
+from ..models.quiz import Quiz, Question, QuizSubmission, Answer, Option
 from ..models.quiz_audit_log import QuizAuditLog
-from ..models.enrollment import Enrollment
+from ..db.enrollment_repository import has_course_access, has_course_access_async
 from ..schemas.quiz import (
     QuizCreate,
     QuizUpdate,
@@ -19,16 +21,16 @@ from ..schemas.quiz import (
 
 def _ensure_enrollment(db: Session, course_id: UUID, student_id: UUID):
     """403 if the student isn't approved+accessible for this course."""
-    stmt = (
-        select(Enrollment)
-        .where(
-            Enrollment.course_id     == course_id,
-            Enrollment.user_id       == student_id,
-            Enrollment.status        == "approved",
-            Enrollment.is_accessible == True,
+    if not has_course_access(db, student_id, course_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="🚫 You are not enrolled in this course."
         )
-    )
-    if not db.exec(stmt).first():
+
+
+async def _ensure_enrollment_async(db: AsyncSession, course_id: UUID, student_id: UUID):
+    """Async variant of `_ensure_enrollment`."""
+    if not await has_course_access_async(db, student_id, course_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="🚫 You are not enrolled in this course."
@@ -59,28 +61,36 @@ def get_quiz_detail(db: Session, course_id: UUID, quiz_id: UUID, student_id: UUI
     return quiz
 
 
-def submit_quiz(
-    db: Session,
+async def submit_quiz(
+    db: AsyncSession,
     course_id: UUID,
     quiz_id: UUID,
     student_id: UUID,
     payload: QuizSubmissionCreate
 ) -> QuizResult:
     # --- Only allow one submission per student per quiz ---
-    existing_submission = db.exec(
+    existing_submission = (await db.exec(
         select(QuizSubmission)
         .where(
             QuizSubmission.quiz_id == quiz_id,
             QuizSubmission.student_id == student_id
         )
-    ).first()
+    )).first()
     if existing_submission:
         raise HTTPException(
             status_code=403,
             detail="You have already submitted this quiz. Only one attempt is allowed."
         )
-    # 1️⃣ verify enrollment + quiz exists
-    quiz = get_quiz_detail(db, course_id, quiz_id, student_id)
+    # 1️⃣ verify enrollment + quiz exists (questions/options loaded up front,
+    # lazy loading is not available on an AsyncSession)
+    await _ensure_enrollment_async(db, course_id, student_id)
+    quiz = (await db.exec(
+        select(Quiz)
+        .where(Quiz.id == quiz_id, Quiz.course_id == course_id)
+        .options(selectinload(Quiz.questions).selectinload(Question.options))
+    )).first()
+    if not quiz:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Quiz not found")
 
     # 2️⃣ prepare validation maps
     valid_qids = {q.id for q in quiz.questions}
@@ -93,8 +103,8 @@ def submit_quiz(
         submitted_at=datetime.utcnow()
     )
     db.add(sub)
-    db.commit()
-    db.refresh(sub)
+    await db.commit()
+    await db.refresh(sub)
     # --- Audit log ---
     audit = QuizAuditLog(
         student_id=student_id,
@@ -103,7 +113,7 @@ def submit_quiz(
         details=f"Submission ID: {sub.id}"
     )
     db.add(audit)
-    db.commit()
+    await db.commit()
 
 
     # 4️⃣ map correct answers
@@ -146,7 +156,7 @@ def submit_quiz(
             selected_option_id=sel
         ))
 
-    db.commit()
+    await db.commit()
 
     return QuizResult(
         submission_id=sub.id,
@@ -0,0 +1,122 @@
+# File: app/db/course_repository.py
+"""
+Course catalog queries.
+
+`catalog_page` lists courses newest first with keyset pagination on
+`(created_at, id)`: each page continues strictly after the last row of the
+previous one, so the cost of a page does not grow with its depth the way
+OFFSET does. Only the listing columns are selected, never the large Text
+columns. The cursor handed to clients is an opaque, URL-safe encoding of
+the last row's `(created_at, id)`.
+
+`search_statement` is the Postgres full-text search: it matches the
+generated `search_vector` column (migration 0007, GIN-indexed), ranks the
+matches, and builds highlighted snippets for the returned page only (see
+`highlight`).
+"""
+import base64
+import binascii
+import html
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import func, literal_column, tuple_
+from sqlmodel import Session, select
+
+from ..models.course import Course
+
+CATALOG_COLUMNS = (Course.id, Course.title, Course.price, Course.thumbnail_url, Course.created_at)
+
+SEARCH_CONFIG = "english"   # Must match the config of `course.search_vector`.
+# ts_headline copies the course text verbatim, so matches are delimited with
+# control characters (stripped from the text beforehand) and `highlight`
+# escapes the snippet before turning them into <mark> tags.
+MARK_START, MARK_STOP = "\x02", "\x03"
+SNIPPET_OPTIONS = f'StartSel="{MARK_START}", StopSel="{MARK_STOP}", MaxWords=30, MinWords=12, MaxFragments=2'
+
+# Not mapped on the model: the column only exists on Postgres.
+_search_vector = literal_column("course.search_vector")
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class CatalogFilters:
+    min_price: float | None = None
+    max_price: float | None = None
+    difficulty_level: str | None = None
+    status: str | None = None
+
+
+def encode_cursor(created_at: datetime, course_id) -> str:
+    raw = f"{created_at.isoformat()}|{course_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, course_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(course_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+
+def catalog_statement(filters: CatalogFilters, after: tuple | None, limit: int | None):
+    stmt = select(*CATALOG_COLUMNS)
+    if filters.status is not None:
+        stmt = stmt.where(Course.status == filters.status)
+    if filters.difficulty_level is not None:
+        stmt = stmt.where(Course.difficulty_level == filters.difficulty_level)
+    if filters.min_price is not None:
+        stmt = stmt.where(Course.price >= filters.min_price)
+    if filters.max_price is not None:
+        stmt = stmt.where(Course.price <= filters.max_price)
+    if after is not None:
+        stmt = stmt.where(tuple_(Course.created_at, Course.id) < tuple_(*after))
+    return stmt.order_by(Course.created_at.desc(), Course.id.desc()).limit(limit)
+
+
+def catalog_page(session: Session, filters: CatalogFilters, cursor: str | None, limit: int | None):
+    """`(rows, next_cursor)`; `next_cursor` is None on the last page. A None `limit` returns every row."""
+    after = decode_cursor(cursor) if cursor else None
+    if limit is None:
+        return session.exec(catalog_statement(filters, after, None)).all(), None
+    rows = session.exec(catalog_statement(filters, after, limit + 1)).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+def highlight(snippet: str | None) -> str:
+    """HTML-escape a `search_statement` snippet and mark its matches with <mark>."""
+    return html.escape(snippet or "").replace(MARK_START, "<mark>").replace(MARK_STOP, "</mark>")
+
+
+def search_statement(query: str, status: str | None, limit: int, offset: int):
+    """Top matches for a web-style `query` (quotes, `or`, `-word`), best first."""
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+    rank = func.ts_rank_cd(_search_vector, tsquery)
+    matches = select(Course.id, rank.label("rank")).where(_search_vector.op("@@")(tsquery))
+    if status is not None:
+        matches = matches.where(Course.status == status)
+    top = matches.order_by(rank.desc(), Course.id).limit(limit).offset(offset).subquery()
+    document = func.translate(
+        func.concat_ws("\n", Course.description, Course.outcomes, Course.curriculum), MARK_START + MARK_STOP, ""
+    )
+    return (
+        select(
+            Course.id,
+            Course.title,
+            Course.price,
+            Course.thumbnail_url,
+            top.c.rank,
+            func.ts_headline(SEARCH_CONFIG, document, tsquery, SNIPPET_OPTIONS).label("snippet"),
+        )
+        .join(top, top.c.id == Course.id)
+        .order_by(top.c.rank.desc(), Course.id)
+    )
@@ -0,0 +1,43 @@
+# File: app/db/enrollment_repository.py
+"""
+Shared enrollment-access check.
+
+"Does this user hold an approved, accessible, unexpired enrollment for this
+course?" runs on nearly every student request. The statement is built with
+`lambda_stmt`: the lambda's code object is the cache key, so after the first
+call SQLAlchemy skips rebuilding the SELECT and reuses its compiled form;
+only the closure values (user, course, current time) are bound per call.
+"""
+from datetime import datetime
+
+from sqlalchemy import lambda_stmt, or_
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..models.enrollment import Enrollment
+
+
+def _course_access_stmt(user_id, course_id, now: datetime):
+    return lambda_stmt(
+        lambda: select(Enrollment.id)
+        .where(
+            Enrollment.user_id == user_id,
+            Enrollment.course_id == course_id,
+            Enrollment.status == "approved",
+            Enrollment.is_accessible == True,
+            or_(Enrollment.expiration_date > now, Enrollment.expiration_date == None),
+        )
+        .limit(1)
+    )
+
+
+def has_course_access(session: Session, user_id, course_id) -> bool:
+    """True if the user may access the course right now."""
+    stmt = _course_access_stmt(user_id, course_id, datetime.utcnow())
+    return session.exec(stmt).first() is not None
+
+
+async def has_course_access_async(session: AsyncSession, user_id, course_id) -> bool:
+    """Async variant of `has_course_access`."""
+    stmt = _course_access_stmt(user_id, course_id, datetime.utcnow())
+    return (await session.exec(stmt)).first() is not None
@@ -0,0 +1,50 @@
+# File: app/db/instrumentation.py
+"""
+Statement-level instrumentation hooks.
+
+`instrument(engine)` times every cursor execution on the engine and passes
+`(statement, elapsed_ms)` to each registered observer. Observers are plain
+callables added with `add_observer()`; they run synchronously on the
+executing thread, so they must be cheap and must not raise.
+"""
+import logging
+import time
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+_observers: list = []
+
+
+def add_observer(observer) -> None:
+    """Register `observer(statement: str, elapsed_ms: float)` for every executed statement."""
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+    for observer in _observers:
+        try:
+            observer(statement, elapsed_ms)
+        except Exception:
+            logger.exception("Query observer %r failed", observer)
+
+
+def _handle_error(context):
+    # The statement failed, so after_cursor_execute will not pop its start time.
+    starts = context.connection.info.get("query_start") if context.connection is not None else None
+    if starts:
+        starts.pop()
+
+
+def instrument(engine) -> None:
+    """Attach the timing hooks to a (sync) engine."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,126 @@
+# File: app/db/migrations/__init__.py
+"""
+Versioned schema migrations.
+
+Each `mNNNN_<name>.py` module in this package defines:
+- `VERSION`: zero-padded version string, applied in ascending order;
+- `DESCRIPTION`: one-line summary stored in `schema_migrations`;
+- `TRANSACTIONAL`: False for migrations that must run outside a transaction
+  (e.g. `CREATE INDEX CONCURRENTLY`), defaults to True;
+- `upgrade(conn)`: applies the change on the given connection.
+
+`run_migrations()` applies every version missing from `schema_migrations`.
+On Postgres it holds an advisory lock so concurrently starting workers do
+not race. Run it from the command line with `python -m src.app.db.migrations`
+(the deploy step); app startup only applies transactional migrations, and
+only in the worker that gets the lock.
+"""
+import importlib
+import logging
+import pkgutil
+import re
+import time
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, select, text
+
+logger = logging.getLogger(__name__)
+
+_MODULE_PATTERN = re.compile(r"^m\d{4}_\w+$")
+
+# Arbitrary application-wide key for the Postgres advisory lock.
+ADVISORY_LOCK_KEY = 827_340_115
+LOCK_POLL_SECONDS = 1.0
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", String(16), primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def discover() -> list:
+    """All migration modules of this package, sorted by VERSION."""
+    modules = [
+        importlib.import_module(f"{__name__}.{info.name}")
+        for info in pkgutil.iter_modules(__path__)
+        if _MODULE_PATTERN.match(info.name)
+    ]
+    return sorted(modules, key=lambda module: module.VERSION)
+
+
+def applied_versions(engine) -> set:
+    schema_migrations.create(engine, checkfirst=True)
+    with engine.connect() as conn:
+        return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def _apply(engine, migration) -> None:
+    record = schema_migrations.insert().values(
+        version=migration.VERSION,
+        description=migration.DESCRIPTION,
+        applied_at=datetime.utcnow(),
+    )
+    if getattr(migration, "TRANSACTIONAL", True):
+        with engine.begin() as conn:
+            migration.upgrade(conn)
+            conn.execute(record)
+    else:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            migration.upgrade(conn)
+            conn.execute(record)
+
+
+def _try_lock(conn) -> bool:
+    return conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY}).scalar()
+
+
+def run_migrations(engine=None, wait: bool = True, concurrent: bool = True) -> list:
+    """
+    Apply pending migrations and return the versions that were applied.
+
+    On Postgres only one process migrates at a time. The lock is taken with
+    `pg_try_advisory_lock`, never a blocking `pg_advisory_lock`: a process
+    waiting inside that statement holds a snapshot, which `CREATE INDEX
+    CONCURRENTLY` in the lock holder would wait for in turn. With `wait`,
+    the lock is polled between attempts; without it, a process that finds
+    the lock taken skips migrating. With `concurrent=False`, migrations stop
+    before the first non-transactional one (those build indexes
+    concurrently on Postgres and belong in the deploy step).
+    """
+    if engine is None:
+        from src.app.db.session import engine
+
+    postgres = engine.dialect.name == "postgresql"
+    lock_conn = None
+    if postgres:
+        lock_conn = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        while not _try_lock(lock_conn):
+            if not wait:
+                lock_conn.close()
+                logger.info("Another process is applying migrations; skipping")
+                return []
+            time.sleep(LOCK_POLL_SECONDS)
+    try:
+        done = applied_versions(engine)
+        applied = []
+        for migration in discover():
+            if migration.VERSION in done:
+                continue
+            if postgres and not concurrent and not getattr(migration, "TRANSACTIONAL", True):
+                logger.warning(
+                    "Migration %s builds indexes concurrently and was not applied; "
+                    "run `python -m src.app.db.migrations`",
+                    migration.VERSION,
+                )
+                break
+            logger.info("Applying migration %s: %s", migration.VERSION, migration.DESCRIPTION)
+            _apply(engine, migration)
+            applied.append(migration.VERSION)
+        return applied
+    finally:
+        if lock_conn is not None:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+            lock_conn.close()
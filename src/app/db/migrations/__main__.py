@@ -0,0 +1,33 @@
+# File: app/db/migrations/__main__.py
+"""
+Command line entry point:
+
+    python -m src.app.db.migrations           # apply pending migrations
+    python -m src.app.db.migrations --status  # list applied/pending versions
+"""
+import argparse
+import logging
+
+from src.app.db.migrations import applied_versions, discover, run_migrations
+from src.app.db.session import engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply versioned database migrations.")
+    parser.add_argument("--status", action="store_true", help="list migrations without applying them")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.status:
+        done = applied_versions(engine)
+        for migration in discover():
+            state = "applied" if migration.VERSION in done else "pending"
+            print(f"{migration.VERSION}  {state:8}  {migration.DESCRIPTION}")
+        return
+
+    applied = run_migrations(engine)
+    print(f"Applied {len(applied)} migration(s): {', '.join(applied) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
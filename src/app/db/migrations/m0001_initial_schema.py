@@ -0,0 +1,16 @@
+# File: app/db/migrations/m0001_initial_schema.py
+"""
+Baseline: create every table declared on the SQLModel metadata that does not
+exist yet. Databases created before the migration subsystem already have the
+tables; for them this only records the baseline version.
+"""
+from sqlmodel import SQLModel
+
+import src.app.models  # noqa: F401  (registers all tables on the metadata)
+
+VERSION = "0001"
+DESCRIPTION = "Initial schema (create missing tables)"
+
+
+def upgrade(conn):
+    SQLModel.metadata.create_all(conn, checkfirst=True)
@@ -0,0 +1,59 @@
+# File: app/db/migrations/m0002_hot_path_indexes.py
+"""
+Indexes and unique constraints for the hottest lookups: enrollment checks,
+progress/submission lookups and notification ordering.
+The unique constraints also back the "only one attempt/row" rules that the
+controllers check in application code. Duplicates that slipped past those
+checks are removed first; per table, `KEEP` decides which row survives:
+- progress rows: the completed one, then the furthest along;
+- submissions: the graded one, then the first attempt (the one the
+  "only one attempt" rule would have accepted). The answers of a deleted
+  quiz submission are deleted with it.
+Tables created by 0001 already carry the constraints from the models and
+are left as they are.
+"""
+import logging
+
+from .ops import add_unique_constraint, create_index, delete_duplicates, has_unique
+
+VERSION = "0002"
+DESCRIPTION = "Composite indexes and unique constraints for hot lookup paths"
+TRANSACTIONAL = False  # CREATE INDEX CONCURRENTLY
+
+INDEXES = [
+    ("ix_enrollment_user_course_status", "enrollment", ["user_id", "course_id", "status"]),
+    ("ix_notification_timestamp", "notification", ["timestamp"]),
+]
+
+UNIQUE_CONSTRAINTS = [
+    ("uq_videoprogress_user_video", "videoprogress", ["user_id", "video_id"]),
+    ("uq_quizsubmission_quiz_student", "quizsubmission", ["quiz_id", "student_id"]),
+    ("uq_assignmentsubmission_assignment_student", "assignmentsubmission", ["assignment_id", "student_id"]),
+    ("uq_courseprogress_user_course", "courseprogress", ["user_id", "course_id"]),
+]
+
+# table -> (ORDER BY terms ranking the survivor first, dependent (table, column) rows to delete)
+KEEP = {
+    "videoprogress": (["CASE WHEN completed THEN 0 ELSE 1 END"], []),
+    "quizsubmission": (["submitted_at"], [("answer", "submission_id")]),
+    "assignmentsubmission": (["CASE WHEN grade IS NULL THEN 1 ELSE 0 END", "submitted_at"], []),
+    "courseprogress": (
+        ["CASE WHEN completed THEN 0 ELSE 1 END", "COALESCE(progress_percentage, 0) DESC"],
+        [],
+    ),
+}
+
+logger = logging.getLogger(__name__)
+
+
+def upgrade(conn):
+    for name, table, columns in INDEXES:
+        create_index(conn, name, table, columns)
+    for name, table, columns in UNIQUE_CONSTRAINTS:
+        if has_unique(conn, table, columns):
+            continue
+        keep, dependents = KEEP[table]
+        deleted = delete_duplicates(conn, table, columns, keep, dependents)
+        if deleted:
+            logger.warning("Removed %d duplicate %s rows before adding %s", deleted, table, name)
+        add_unique_constraint(conn, name, table, columns)
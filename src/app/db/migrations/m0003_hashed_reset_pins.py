@@ -0,0 +1,40 @@
+# File: app/db/migrations/m0003_hashed_reset_pins.py
+"""
+Store password reset PINs as a keyed hash (`pin_hash`) instead of plain text,
+behind a covering index on (user_id, pin_hash) INCLUDE (used, expires_at).
+
+Existing plain PINs are hashed in place, so outstanding reset emails keep
+working. Every step is idempotent: the migration runs in autocommit mode and
+can be re-run after a partial failure.
+"""
+from sqlalchemy import text
+
+from src.app.utils.security import hash_reset_pin
+
+from .ops import add_column, create_index, drop_column, drop_index, has_column
+
+VERSION = "0003"
+DESCRIPTION = "Hash password reset PINs; covering index for PIN verification"
+TRANSACTIONAL = False  # CREATE/DROP INDEX CONCURRENTLY
+
+TABLE = "passwordreset"
+INDEX = ("ix_passwordreset_user_pin_hash", TABLE, ["user_id", "pin_hash"])
+
+
+def upgrade(conn):
+    add_column(conn, TABLE, "pin_hash", "VARCHAR(64)")
+
+    if has_column(conn, TABLE, "pin"):
+        rows = conn.execute(text("SELECT id, pin FROM passwordreset WHERE pin_hash IS NULL")).all()
+        if rows:
+            conn.execute(
+                text("UPDATE passwordreset SET pin_hash = :pin_hash WHERE id = :id"),
+                [{"id": row.id, "pin_hash": hash_reset_pin(row.pin)} for row in rows],
+            )
+        drop_index(conn, "ix_passwordreset_user_pin")
+        drop_column(conn, TABLE, "pin")
+        if conn.dialect.name == "postgresql":
+            conn.execute(text("ALTER TABLE passwordreset ALTER COLUMN pin_hash SET NOT NULL"))
+
+    name, table, columns = INDEX
+    create_index(conn, name, table, columns, include=["used", "expires_at"])
@@ -0,0 +1,18 @@
+# File: app/db/migrations/m0004_token_versions.py
+"""
+Per-user access token versions for revocation: `user.token_version` is
+embedded in every token as `ver`, `user.tokens_revoked_at` (indexed) lets
+each process poll only the users revoked since its last refresh.
+"""
+from .ops import add_column, create_index
+
+VERSION = "0004"
+DESCRIPTION = "User token_version / tokens_revoked_at for token revocation"
+TRANSACTIONAL = False  # CREATE INDEX CONCURRENTLY
+
+
+def upgrade(conn):
+    timestamp = "TIMESTAMP WITHOUT TIME ZONE" if conn.dialect.name == "postgresql" else "DATETIME"
+    add_column(conn, "user", "token_version", "INTEGER NOT NULL DEFAULT 0")
+    add_column(conn, "user", "tokens_revoked_at", timestamp)
+    create_index(conn, "ix_user_tokens_revoked_at", "user", ["tokens_revoked_at"])
@@ -0,0 +1,68 @@
+# File: app/db/migrations/m0005_oauth_upsert_keys.py
+"""
+Unique keys for the Google sign-in upserts: one provider account per
+(provider, provider_account_id) and one profile per user. Duplicates left by
+earlier concurrent first logins are removed first. Neither table records
+when a row was created, so `KEEP` ranks the rows by what they hold:
+- profiles: the one with the most fields filled in;
+- provider accounts: the one with a refresh token, then the latest expiry.
+Provider accounts linked to different users are not duplicates of one
+login but conflicting links: the migration refuses to pick one, logs them
+and stops, so they can be resolved by hand before it is re-run.
+"""
+import logging
+
+from sqlalchemy import text
+
+from .ops import MigrationError, add_unique_constraint, delete_duplicates, has_unique
+
+VERSION = "0005"
+DESCRIPTION = "Unique (provider, provider_account_id) and profile(user_id)"
+TRANSACTIONAL = False  # CREATE INDEX CONCURRENTLY
+
+UNIQUE_CONSTRAINTS = [
+    ("uq_oauthaccount_provider_account", "oauthaccount", ["provider", "provider_account_id"]),
+    ("uq_profile_user", "profile", ["user_id"]),
+]
+
+# table -> ORDER BY terms ranking the surviving row first
+KEEP = {
+    "oauthaccount": [
+        "CASE WHEN refresh_token IS NULL THEN 1 ELSE 0 END",
+        "CASE WHEN expires_at IS NULL THEN 1 ELSE 0 END",
+        "expires_at DESC",
+    ],
+    "profile": [
+        "(CASE WHEN full_name IS NULL THEN 0 ELSE 1 END"
+        " + CASE WHEN avatar_url IS NULL THEN 0 ELSE 1 END"
+        " + CASE WHEN bio IS NULL THEN 0 ELSE 1 END) DESC",
+    ],
+}
+
+logger = logging.getLogger(__name__)
+
+
+def _conflicting_links(conn) -> list:
+    return conn.execute(text(
+        "SELECT provider, provider_account_id FROM oauthaccount "
+        "GROUP BY provider, provider_account_id HAVING COUNT(DISTINCT user_id) > 1"
+    )).all()
+
+
+def upgrade(conn):
+    for name, table, columns in UNIQUE_CONSTRAINTS:
+        if has_unique(conn, table, columns):
+            continue
+        if table == "oauthaccount":
+            conflicts = _conflicting_links(conn)
+            if conflicts:
+                for provider, account_id in conflicts:
+                    logger.error("%s account %s is linked to more than one user", provider, account_id)
+                raise MigrationError(
+                    f"{len(conflicts)} provider accounts are linked to more than one user; "
+                    f"keep one oauthaccount row for each, then re-run the migrations."
+                )
+        deleted = delete_duplicates(conn, table, columns, KEEP[table])
+        if deleted:
+            logger.warning("Removed %d duplicate %s rows before adding %s", deleted, table, name)
+        add_unique_constraint(conn, name, table, columns)
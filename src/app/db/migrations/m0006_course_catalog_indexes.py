@@ -0,0 +1,24 @@
+# File: app/db/migrations/m0006_course_catalog_indexes.py
+"""
+Indexes for the keyset-paginated course catalog (newest first on
+`(created_at, id)`), unfiltered and filtered by status or difficulty. The
+status index carries the listing columns so Postgres can serve a page with
+an index-only scan; price ranges are applied as a filter on top.
+"""
+from .ops import create_index
+
+VERSION = "0006"
+DESCRIPTION = "Course catalog keyset indexes"
+TRANSACTIONAL = False  # CREATE INDEX CONCURRENTLY
+
+INDEXES = [
+    ("ix_course_status_created", "course", ["status", "created_at", "id"],
+     ["price", "difficulty_level", "title", "thumbnail_url"]),
+    ("ix_course_created_id", "course", ["created_at", "id"], None),
+    ("ix_course_difficulty_created", "course", ["difficulty_level", "created_at", "id"], None),
+]
+
+
+def upgrade(conn):
+    for name, table, columns, include in INDEXES:
+        create_index(conn, name, table, columns, include=include)
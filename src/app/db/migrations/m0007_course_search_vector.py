@@ -0,0 +1,30 @@
+# File: app/db/migrations/m0007_course_search_vector.py
+"""
+Full-text search over courses (Postgres only): a stored generated
+`search_vector` column weighting title (A), description (B), outcomes (C)
+and curriculum (D), and a GIN index on it. Adding a stored generated column
+rewrites the course table once under an exclusive lock; the table is
+small. The column is not part of the model, so SQLite databases are
+left unchanged (search falls back to an in-process index there).
+"""
+from .ops import add_column, create_index
+
+VERSION = "0007"
+DESCRIPTION = "Course full-text search vector"
+TRANSACTIONAL = False  # CREATE INDEX CONCURRENTLY
+
+SEARCH_VECTOR = (
+    "tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(outcomes, '')), 'C') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(curriculum, '')), 'D')"
+    ") STORED"
+)
+
+
+def upgrade(conn):
+    if conn.dialect.name != "postgresql":
+        return
+    add_column(conn, "course", "search_vector", SEARCH_VECTOR)
+    create_index(conn, "ix_course_search_vector", "course", ["search_vector"], using="gin")
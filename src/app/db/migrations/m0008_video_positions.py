@@ -0,0 +1,29 @@
+# File: app/db/migrations/m0008_video_positions.py
+"""
+Ordered course playlists: `video.position` plus an index on
+`(course_id, position)`, which also serves every lookup of a course's
+videos by `course_id`. Videos of courses that are not numbered yet (all
+positions 0) are numbered in their current physical order, which is what
+`course.videos` returned until now; re-running only touches such courses.
+"""
+from sqlalchemy import text
+
+from .ops import add_column, create_index
+
+VERSION = "0008"
+DESCRIPTION = "Video playlist positions"
+TRANSACTIONAL = False  # CREATE INDEX CONCURRENTLY
+
+
+def upgrade(conn):
+    add_column(conn, "video", "position", "INTEGER NOT NULL DEFAULT 0")
+    physical = "ctid" if conn.dialect.name == "postgresql" else "rowid"
+    conn.execute(text(
+        "UPDATE video SET position = numbered.position FROM ("
+        f"SELECT id, ROW_NUMBER() OVER (PARTITION BY course_id ORDER BY {physical}) - 1 AS position "
+        "FROM video WHERE course_id IN ("
+        "SELECT course_id FROM video GROUP BY course_id HAVING MAX(position) = 0 AND COUNT(*) > 1"
+        ")) AS numbered "
+        "WHERE video.id = numbered.id"
+    ))
+    create_index(conn, "ix_video_course_position", "video", ["course_id", "position"])
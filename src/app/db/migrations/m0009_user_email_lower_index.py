@@ -0,0 +1,16 @@
+# File: app/db/migrations/m0009_user_email_lower_index.py
+"""
+Expression index on `lower(user.email)` for the case-insensitive
+"already registered" check of the bulk student import.
+"""
+from sqlalchemy import text
+
+from .ops import create_index
+
+VERSION = "0009"
+DESCRIPTION = "Index on lower(user.email)"
+TRANSACTIONAL = False  # CREATE INDEX CONCURRENTLY
+
+
+def upgrade(conn):
+    create_index(conn, "ix_user_email_lower", "user", [text("lower(email)")])
@@ -0,0 +1,152 @@
+# File: app/db/migrations/ops.py
+"""
+Schema operations shared by the migration modules.
+
+On Postgres, indexes are built with `CREATE INDEX CONCURRENTLY`, which does
+not block writes on large tables but cannot run inside a transaction, so
+migrations using these helpers set `TRANSACTIONAL = False`. A failed
+concurrent build leaves an INVALID index behind; it is dropped before
+retrying and after a failure, so re-running the migration is always safe.
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.sql.elements import TextClause
+
+
+class MigrationError(RuntimeError):
+    pass
+
+
+def _quote(conn, name: str) -> str:
+    return conn.dialect.identifier_preparer.quote(name)
+
+
+def _index_state(conn, name: str):
+    """None if the index does not exist, otherwise whether it is valid (Postgres only)."""
+    return conn.execute(
+        text(
+            "SELECT i.indisvalid FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+            "WHERE c.relname = :name AND pg_catalog.pg_table_is_visible(c.oid)"
+        ),
+        {"name": name},
+    ).scalar()
+
+
+def _column_sql(conn, column) -> str:
+    # Names are quoted; a `text("lower(email)")` entry indexes that expression.
+    return column.text if isinstance(column, TextClause) else _quote(conn, column)
+
+
+def has_column(conn, table: str, column: str) -> bool:
+    return any(info["name"] == column for info in inspect(conn).get_columns(table))
+
+
+def add_column(conn, table: str, column: str, ddl_type: str) -> None:
+    """`ALTER TABLE ... ADD COLUMN` unless the column exists (e.g. created by 0001 from the models)."""
+    if not has_column(conn, table, column):
+        conn.execute(text(f"ALTER TABLE {_quote(conn, table)} ADD COLUMN {_quote(conn, column)} {ddl_type}"))
+
+
+def drop_column(conn, table: str, column: str) -> None:
+    if has_column(conn, table, column):
+        conn.execute(text(f"ALTER TABLE {_quote(conn, table)} DROP COLUMN {_quote(conn, column)}"))
+
+
+def drop_index(conn, name: str) -> None:
+    concurrently = " CONCURRENTLY" if conn.dialect.name == "postgresql" else ""
+    conn.execute(text(f"DROP INDEX{concurrently} IF EXISTS {_quote(conn, name)}"))
+
+
+def create_index(
+    conn,
+    name: str,
+    table: str,
+    columns: list,
+    unique: bool = False,
+    include: list | None = None,
+    using: str | None = None,
+) -> None:
+    """
+    Create index `name` on `table(columns)` unless it already exists;
+    `columns` may include `text()` expressions.
+    `include` adds non-key payload columns (covering index) and `using` picks
+    the index method (e.g. "gin") on Postgres; other dialects ignore both.
+    """
+    cols = ", ".join(_column_sql(conn, column) for column in columns)
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+
+    if conn.dialect.name != "postgresql":
+        conn.execute(text(f"CREATE {kind} IF NOT EXISTS {_quote(conn, name)} ON {_quote(conn, table)} ({cols})"))
+        return
+
+    if include:
+        cols += ") INCLUDE (" + ", ".join(_quote(conn, column) for column in include)
+    method = f" USING {using}" if using else ""
+
+    state = _index_state(conn, name)
+    if state is True:
+        return
+    if state is False:
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {_quote(conn, name)}"))
+    try:
+        conn.execute(text(
+            f"CREATE {kind} CONCURRENTLY {_quote(conn, name)} ON {_quote(conn, table)}{method} ({cols})"
+        ))
+    except Exception as exc:
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {_quote(conn, name)}"))
+        if unique:
+            raise MigrationError(
+                f"Could not build unique index {name} on {table}({', '.join(map(str, columns))}): "
+                f"the table contains duplicate rows. Remove them, then re-run the migrations."
+            ) from exc
+        raise
+
+
+def has_unique(conn, table: str, columns: list) -> bool:
+    """Whether `table` already has a unique constraint or unique index on exactly `columns`."""
+    inspector = inspect(conn)
+    keys = [constraint["column_names"] for constraint in inspector.get_unique_constraints(table)]
+    keys += [
+        index["column_names"]
+        for index in inspector.get_indexes(table)
+        # An interrupted concurrent build leaves an INVALID index that enforces nothing.
+        if index["unique"] and (conn.dialect.name != "postgresql" or _index_state(conn, index["name"]))
+    ]
+    return any(list(key) == list(columns) for key in keys)
+
+
+def delete_duplicates(conn, table: str, columns: list, keep: list = (), dependents: list = ()) -> int:
+    """
+    Keep one row per distinct `columns` value and delete the others, so a
+    unique constraint can be added. The survivor is the first row of its
+    group ordered by the `keep` SQL expressions, then by id, so the same row
+    survives on every dialect. `dependents` lists `(table, column)` foreign
+    keys whose rows pointing at a deleted row are deleted with it.
+    Returns the rows deleted from `table`.
+    """
+    t = _quote(conn, table)
+    partition = ", ".join(_quote(conn, column) for column in columns)
+    order = ", ".join([*keep, "id"])
+    doomed = (
+        f"SELECT id FROM (SELECT id, ROW_NUMBER() OVER (PARTITION BY {partition} ORDER BY {order}) AS rn "
+        f"FROM {t}) ranked WHERE rn > 1"
+    )
+    for dependent, column in dependents:
+        conn.execute(text(f"DELETE FROM {_quote(conn, dependent)} WHERE {_quote(conn, column)} IN ({doomed})"))
+    return conn.execute(text(f"DELETE FROM {t} WHERE id IN ({doomed})")).rowcount
+
+
+def add_unique_constraint(conn, name: str, table: str, columns: list) -> None:
+    """
+    Add UNIQUE(columns) as constraint `name`. On Postgres the backing index is
+    built concurrently first and then attached with `USING INDEX`, which only
+    takes a brief lock. Other dialects (SQLite) get a unique index. Nothing
+    is done if the columns are already unique, e.g. because 0001 created the
+    table with the model's constraint.
+    """
+    if has_unique(conn, table, columns):
+        return
+    create_index(conn, name, table, columns, unique=True)
+    if conn.dialect.name == "postgresql":
+        conn.execute(text(
+            f"ALTER TABLE {_quote(conn, table)} ADD CONSTRAINT {_quote(conn, name)} UNIQUE USING INDEX {_quote(conn, name)}"
+        ))
@@ -0,0 +1,75 @@
+# File: app/db/oauth_repository.py
+"""
+Account linking for OAuth sign-in.
+
+`link_oauth_account` resolves (or creates) the user, their profile and the
+provider account with three `INSERT ... ON CONFLICT` statements in one
+transaction. The unique keys (`user.email`, `profile.user_id`,
+`oauthaccount.(provider, provider_account_id)`) make concurrent first logins
+converge on the same rows instead of racing SELECT-then-INSERT.
+"""
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..models.oauth import OAuthAccount
+from ..models.profile import Profile
+from ..models.user import User
+from .upsert import insert_for
+
+
+async def link_oauth_account(
+    session: AsyncSession,
+    provider: str,
+    provider_account_id: str,
+    email: str,
+    full_name: str | None,
+    avatar_url: str | None,
+    access_token: str,
+    expires_in: int,
+):
+    """
+    Upsert user (by email), profile (by user) and provider account, then
+    commit. Existing users keep their data; only a missing name/avatar is
+    filled from the provider. Returns the user row (id, email, role,
+    is_active, token_version, full_name, avatar_url). The caller must check
+    `is_active`; the links are committed either way.
+    """
+    table = User.__table__
+    user_stmt = insert_for(session, User).values(
+        id=uuid.uuid4(), email=email, full_name=full_name, avatar_url=avatar_url, is_active=True,
+    )
+    user = (await session.exec(
+        user_stmt.on_conflict_do_update(
+            index_elements=[table.c.email],
+            set_={
+                "full_name": func.coalesce(table.c.full_name, user_stmt.excluded.full_name),
+                "avatar_url": func.coalesce(table.c.avatar_url, user_stmt.excluded.avatar_url),
+            },
+        ).returning(
+            table.c.id, table.c.email, table.c.role, table.c.is_active,
+            table.c.token_version, table.c.full_name, table.c.avatar_url,
+        )
+    )).one()
+
+    await session.exec(
+        insert_for(session, Profile).values(
+            id=uuid.uuid4(), user_id=user.id, full_name=full_name, avatar_url=avatar_url,
+        ).on_conflict_do_nothing(index_elements=[Profile.__table__.c.user_id])
+    )
+
+    expires_at = datetime.utcnow() + timedelta(seconds=expires_in)
+    account_stmt = insert_for(session, OAuthAccount).values(
+        id=uuid.uuid4(), user_id=user.id, provider=provider, provider_account_id=provider_account_id,
+        access_token=access_token, expires_at=expires_at,
+    )
+    await session.exec(
+        account_stmt.on_conflict_do_update(
+            index_elements=[OAuthAccount.__table__.c.provider, OAuthAccount.__table__.c.provider_account_id],
+            set_={"access_token": account_stmt.excluded.access_token, "expires_at": account_stmt.excluded.expires_at},
+        )
+    )
+    await session.commit()
+    return user
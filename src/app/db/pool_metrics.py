@@ -0,0 +1,135 @@
+# File: app/db/pool_metrics.py
+"""
+Connection pool instrumentation.
+
+Every engine built in `db/session.py` gets a `PoolMetrics` instance that
+records how long requests wait for a connection, how many connections are
+opened/invalidated and how often `pool_pre_ping` finds a dead connection.
+`pool_status()` renders a snapshot of all registered pools for the admin
+`/system/db-pool` endpoint.
+"""
+import threading
+import time
+
+from sqlalchemy import event, exc
+
+# Upper bounds (milliseconds) of the checkout wait-time histogram buckets.
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+_registry: dict = {}
+
+
+class _TimedPoolMixin:
+    """Times every connection checkout (`_do_get`) of the wrapped pool class."""
+
+    metrics: "PoolMetrics" = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        finally:
+            self.metrics.observe_wait((time.perf_counter() - start) * 1000)
+
+
+class PoolMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self.engine = None
+        self._lock = threading.Lock()
+        self._buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self._wait_count = 0
+        self._wait_total_ms = 0.0
+        self._wait_max_ms = 0.0
+        self.connections_opened = 0
+        self.invalidations = 0
+        self.pre_ping_failures = 0
+        self.checkout_timeouts = 0
+
+    def pool_class(self, base):
+        """Return a subclass of `base` that reports checkout waits to this object.
+
+        A class attribute (rather than an instance attribute) is used so the
+        metrics survive `Pool.recreate()`, which SQLAlchemy calls on dispose.
+        """
+        return type(f"Timed{base.__name__}", (_TimedPoolMixin, base), {"metrics": self})
+
+    def attach(self, engine):
+        """Register pool/engine event listeners and expose the engine in `pool_status()`."""
+        self.engine = engine
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        event.listen(engine, "handle_error", self._on_error)
+        _registry[self.name] = self
+
+    def observe_wait(self, elapsed_ms: float):
+        index = len(WAIT_BUCKETS_MS)
+        for i, bound in enumerate(WAIT_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                index = i
+                break
+        with self._lock:
+            self._buckets[index] += 1
+            self._wait_count += 1
+            self._wait_total_ms += elapsed_ms
+            self._wait_max_ms = max(self._wait_max_ms, elapsed_ms)
+
+    def record_timeout(self):
+        with self._lock:
+            self.checkout_timeouts += 1
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connections_opened += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def _on_error(self, context):
+        if context.is_pre_ping:
+            with self._lock:
+                self.pre_ping_failures += 1
+
+    def snapshot(self) -> dict:
+        pool = self.engine.pool
+        # NullPool/StaticPool (serverless, SQLite) do not implement the sizing API.
+        size = pool.size() if hasattr(pool, "size") else None
+        overflow = pool.overflow() if hasattr(pool, "overflow") else None
+        with self._lock:
+            histogram = {f"le_{bound}ms": count for bound, count in zip(WAIT_BUCKETS_MS, self._buckets)}
+            histogram["gt_%dms" % WAIT_BUCKETS_MS[-1]] = self._buckets[-1]
+            wait = {
+                "count": self._wait_count,
+                "avg_ms": round(self._wait_total_ms / self._wait_count, 3) if self._wait_count else 0.0,
+                "max_ms": round(self._wait_max_ms, 3),
+                "histogram": histogram,
+            }
+            counters = {
+                "connections_opened": self.connections_opened,
+                "invalidations": self.invalidations,
+                "pre_ping_failures": self.pre_ping_failures,
+                "checkout_timeouts": self.checkout_timeouts,
+            }
+        return {
+            "pool_class": type(pool).__name__,
+            "pool_size": size,
+            "max_overflow": getattr(pool, "_max_overflow", None),
+            "timeout": getattr(pool, "_timeout", None),
+            "recycle": pool._recycle,
+            "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+            "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else None,
+            # QueuePool reports overflow as a negative number until the pool is full.
+            "overflow": max(overflow, 0) if overflow is not None else None,
+            "status": pool.status(),
+            "checkout_wait": wait,
+            **counters,
+        }
+
+
+def pool_status() -> dict:
+    """Snapshot of every registered engine pool, keyed by engine name."""
+    return {name: metrics.snapshot() for name, metrics in _registry.items()}
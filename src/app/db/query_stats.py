@@ -0,0 +1,111 @@
+# File: app/db/query_stats.py
+"""
+Per-request SQL statistics.
+
+`QueryStatsMiddleware` opens a `RequestQueryStats` for every HTTP request and
+reports the number of statements and the time spent in the database as
+`Server-Timing` entries:
+
+    Server-Timing: db;dur=12.4;desc="7 queries"
+
+In development (APP_ENV=development) statements are also grouped by their
+SQL text. Because bind values are not part of the text, the same shape
+executed N_PLUS_ONE_THRESHOLD or more times in one request is almost always a
+query issued in a loop; it is logged as a suspected N+1 and counted in a
+`n-plus-one` Server-Timing entry.
+"""
+import logging
+import os
+import threading
+from collections import Counter
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+DEV_MODE = os.getenv("APP_ENV", "production").lower() == "development"
+N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", 5))
+
+
+class RequestQueryStats:
+    def __init__(self, scope: dict | None = None, track_shapes: bool = False):
+        self.scope = scope
+        self.count = 0
+        self.total_ms = 0.0
+        self.shapes = Counter() if track_shapes else None
+        # Sync dependencies and endpoints run in the threadpool, so a request
+        # may record from more than one thread.
+        self._lock = threading.Lock()
+
+    @property
+    def route(self) -> str | None:
+        """`METHOD /path/template` once routing has matched, else the raw path."""
+        if self.scope is None:
+            return None
+        route = self.scope.get("route")
+        path = getattr(route, "path", None) or self.scope.get("path")
+        return f"{self.scope.get('method')} {path}"
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_ms += elapsed_ms
+            if self.shapes is not None:
+                self.shapes[statement] += 1
+
+    def repeated_statements(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> list:
+        """(statement, count) pairs executed at least `threshold` times, most frequent first."""
+        if self.shapes is None:
+            return []
+        return [(statement, n) for statement, n in self.shapes.most_common() if n >= threshold]
+
+
+_current: ContextVar = ContextVar("request_query_stats", default=None)
+
+
+def current_stats() -> RequestQueryStats | None:
+    return _current.get()
+
+
+def record_request_query(statement: str, elapsed_ms: float) -> None:
+    """Instrumentation observer: add the statement to the current request's stats."""
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+
+
+class QueryStatsMiddleware:
+    """Pure ASGI middleware adding per-request DB timing to `Server-Timing`."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats(scope, track_shapes=DEV_MODE)
+        token = _current.set(stats)
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((
+                    b"server-timing",
+                    b'db;dur=%.1f;desc="%d queries"' % (stats.total_ms, stats.count),
+                ))
+                repeated = stats.repeated_statements()
+                if repeated:
+                    headers.append((b"server-timing", b'n-plus-one;desc="%d repeated statements"' % len(repeated)))
+                    for statement, n in repeated:
+                        logger.warning(
+                            "Suspected N+1 on %s %s: statement executed %d times: %s",
+                            scope["method"], scope["path"], n, " ".join(statement.split())[:500],
+                        )
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _current.reset(token)
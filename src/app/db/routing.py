@@ -0,0 +1,177 @@
+# File: app/db/routing.py
+"""
+Primary/replica routing for read-only endpoints.
+
+`RoutingSession` sends SELECTs to the read replica and everything else
+(flushes, INSERT/UPDATE/DELETE) to the primary. Reads fall back to the
+primary when no replica is configured, when the replica recently failed,
+or when the calling client committed a write within the read-your-writes
+window, so a student never reads data older than their own last change.
+
+Recent writes are tracked two ways: per user id in this process, and in a
+signed `last_write` cookie that `ReadYourWritesMiddleware` sets on every
+response whose request committed. The cookie travels with the client, so
+the guarantee also holds when the next read lands on another worker or
+another serverless instance.
+"""
+import hashlib
+import hmac
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import Delete, Insert, Update, event
+from sqlmodel import Session
+
+
+WRITE_COOKIE = "last_write"
+
+
+class ReadYourWrites:
+    """Remembers which users committed recently (bounded, per process) and signs/checks the write cookie."""
+
+    def __init__(self, window_seconds: float, secret: str, max_entries: int = 10_000):
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._secret = secret.encode()
+        self._lock = threading.Lock()
+        self._last_write: "OrderedDict[str, float]" = OrderedDict()
+
+    def record(self, user_id) -> None:
+        key = str(user_id)
+        with self._lock:
+            self._last_write[key] = time.monotonic()
+            self._last_write.move_to_end(key)
+            while len(self._last_write) > self.max_entries:
+                self._last_write.popitem(last=False)
+
+    def is_recent(self, user_id) -> bool:
+        if user_id is None:
+            return False
+        with self._lock:
+            written_at = self._last_write.get(str(user_id))
+        return written_at is not None and time.monotonic() - written_at < self.window_seconds
+
+    def _sign(self, timestamp: str) -> str:
+        return hmac.new(self._secret, timestamp.encode(), hashlib.sha256).hexdigest()[:32]
+
+    def cookie_value(self, written_at: float) -> str:
+        timestamp = f"{written_at:.3f}"
+        return f"{timestamp}.{self._sign(timestamp)}"
+
+    def cookie_is_recent(self, value: str | None) -> bool:
+        if not value:
+            return False
+        timestamp, _, signature = value.rpartition(".")
+        if not hmac.compare_digest(signature, self._sign(timestamp)):
+            return False
+        try:
+            return time.time() - float(timestamp) < self.window_seconds
+        except ValueError:
+            return False
+
+    def is_recent_request(self, session) -> bool:
+        """Whether the request owning `session` comes from a client that wrote within the window."""
+        request = session.info.get("request")
+        if request is None:
+            return False
+        return self.is_recent(getattr(request.state, "user_id", None)) or self.cookie_is_recent(
+            request.cookies.get(WRITE_COOKIE)
+        )
+
+
+class ReplicaHealth:
+    """Takes the replica out of rotation for a cooldown after a connection failure."""
+
+    def __init__(self, cooldown_seconds: float):
+        self.cooldown_seconds = cooldown_seconds
+        self._down_until = 0.0
+
+    def mark_down(self) -> None:
+        self._down_until = time.monotonic() + self.cooldown_seconds
+
+    def is_up(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def watch(self, engine) -> None:
+        """Mark the replica down whenever `engine` cannot connect or loses a connection."""
+        @event.listens_for(engine, "handle_error")
+        def _on_error(context):
+            if context.is_disconnect or context.connection is None:
+                self.mark_down()
+
+
+def request_user_id(session) -> str | None:
+    """User id of the request that owns `session`, as set by `get_current_user`."""
+    request = session.info.get("request")
+    if request is None:
+        return None
+    return getattr(request.state, "user_id", None)
+
+
+class RoutingSession(Session):
+    """
+    Session whose bind is chosen per statement. Configure it with
+    `sessionmaker(class_=RoutingSession, primary=..., replica=..., ...)`.
+    """
+
+    def __init__(self, *args, primary=None, replica=None, replica_health=None, read_your_writes=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._primary = primary
+        self._replica = replica
+        self._replica_health = replica_health
+        self._read_your_writes = read_your_writes
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            self._replica is None
+            or self._flushing
+            or isinstance(clause, (Insert, Update, Delete))
+            or not self._replica_health.is_up()
+            or self._read_your_writes.is_recent_request(self)
+        ):
+            return self._primary
+        return self._replica
+
+
+def track_writes(read_your_writes: ReadYourWrites) -> None:
+    """Record the requesting user and the commit time on the request after every commit on any Session."""
+    @event.listens_for(Session, "after_commit")
+    def _after_commit(session):
+        request = session.info.get("request")
+        if request is None:
+            return
+        request.state.last_write_at = time.time()
+        user_id = request_user_id(session)
+        if user_id is not None:
+            read_your_writes.record(user_id)
+
+
+class ReadYourWritesMiddleware:
+    """Pure ASGI middleware setting the signed `last_write` cookie on responses to requests that committed."""
+
+    def __init__(self, app, read_your_writes: ReadYourWrites, secure: bool = True):
+        self.app = app
+        self.read_your_writes = read_your_writes
+        self.secure = secure
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start":
+                written_at = scope.get("state", {}).get("last_write_at")
+                if written_at is not None:
+                    cookie = (
+                        f"{WRITE_COOKIE}={self.read_your_writes.cookie_value(written_at)}; "
+                        f"Max-Age={math.ceil(self.read_your_writes.window_seconds)}; Path=/; HttpOnly; SameSite=Lax"
+                    )
+                    if self.secure:
+                        cookie += "; Secure"
+                    message["headers"] = [*message.get("headers", []), (b"set-cookie", cookie.encode())]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -1,7 +1,20 @@
 import os
+import sqlite3
+import uuid
 from dotenv import load_dotenv
-from sqlmodel import create_engine, Session, SQLModel
+from sqlmodel import create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool, NullPool
+from fastapi import Request
+from .instrumentation import add_observer, instrument
+from .pool_metrics import PoolMetrics
+from .query_stats import record_request_query
+from .routing import ReadYourWrites, ReplicaHealth, RoutingSession, track_writes
+from .statement_stats import statement_stats
+from ..utils.security import SECRET_KEY
 
 # Load .env file from the project root to ensure consistency.
 load_dotenv()
@@ -10,13 +23,110 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable is not set in .env file")
 
+# Serverless mode (Vercel sets VERCEL=1): every instance is short-lived and a
+# burst can start hundreds of them, so instances must not each keep a pool of
+# idle connections. NullPool opens a connection per checkout and closes it on
+# release; put PgBouncer (or another external pooler) in front of Postgres.
+SERVERLESS = os.getenv("DB_SERVERLESS", "true" if os.getenv("VERCEL") else "false").lower() == "true"
+
+# Set DB_POOLER=pgbouncer when DATABASE_URL points at PgBouncer in
+# transaction-pooling mode. Server-side prepared statements do not survive
+# across transactions there, so asyncpg's statement caches are disabled and
+# statement names are made unique.
+PGBOUNCER = os.getenv("DB_POOLER", "").lower() == "pgbouncer"
+
+# Connection pool sizing. Each worker process holds up to
+# DB_POOL_SIZE + DB_MAX_OVERFLOW connections per engine (sync and async), so
+# size these against the Postgres `max_connections` limit.
+POOL_SETTINGS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", 5)),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 10)),
+    "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", 30)),  # Seconds to wait for a free connection.
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),  # Seconds before a connection is replaced.
+    "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",  # Test connections before use.
+}
+
+# SSL mode for Postgres connections. Set DB_SSLMODE=disable for a local
+# Postgres without TLS (development, benchmarks/).
+DB_SSLMODE = os.getenv("DB_SSLMODE", "require")
+
+ASYNC_CONNECT_ARGS = {"ssl": DB_SSLMODE}
+if PGBOUNCER:
+    ASYNC_CONNECT_ARGS.update(
+        statement_cache_size=0,
+        prepared_statement_cache_size=0,
+        prepared_statement_name_func=lambda: f"__asyncpg_{uuid.uuid4()}__",
+    )
+
+# Statement observers fed by `instrument()`: per-request totals for the
+# Server-Timing header, and per-fingerprint latency stats / slow-query log.
+add_observer(record_request_query)
+add_observer(statement_stats.observe)
+
+
+def _pool_kwargs(metrics: PoolMetrics, pool_class) -> dict:
+    if SERVERLESS:
+        return {"poolclass": metrics.pool_class(NullPool)}
+    return {"poolclass": metrics.pool_class(pool_class), **POOL_SETTINGS}
+
+
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _async_url(url: str):
+    """
+    Translate the sync DATABASE_URL into its asyncpg (or aiosqlite) equivalent.
+    asyncpg does not understand libpq's `sslmode` query parameter, so it is
+    stripped here and SSL is enforced through connect_args instead.
+    """
+    sync_url = make_url(url)
+    if _is_sqlite(url):
+        return sync_url.set(drivername="sqlite+aiosqlite")
+    return sync_url.set(drivername="postgresql+asyncpg").difference_update_query(["sslmode"])
+
+
+def _connect_args(url: str) -> dict:
+    if _is_sqlite(url):
+        # Sync routes run in the threadpool, so connections cross threads.
+        return {"check_same_thread": False}
+    return {"sslmode": DB_SSLMODE}  # Enforce SSL connection unless disabled.
+
+
+def _make_engine(name: str, url: str):
+    metrics = PoolMetrics(name)
+    sync_engine = create_engine(
+        url,
+        connect_args=_connect_args(url),
+        echo=False,  # Set to True to log SQL statements for debugging.
+        **_pool_kwargs(metrics, QueuePool)
+    )
+    metrics.attach(sync_engine)
+    instrument(sync_engine)
+    return sync_engine
+
+
+def _make_async_engine(name: str, url: str):
+    metrics = PoolMetrics(name)
+    new_engine = create_async_engine(
+        _async_url(url),
+        connect_args={} if _is_sqlite(url) else ASYNC_CONNECT_ARGS,
+        echo=False,
+        **_pool_kwargs(metrics, AsyncAdaptedQueuePool)
+    )
+    metrics.attach(new_engine.sync_engine)
+    instrument(new_engine.sync_engine)
+    return new_engine
+
+
+# SQLite (local runs and benchmarks/ only) cannot bind uuid.UUID values to the
+# columns declared as plain strings (e.g. Enrollment.user_id); store them as
+# hex, the same form sqlmodel's GUID type uses on SQLite.
+if _is_sqlite(DATABASE_URL):
+    sqlite3.register_adapter(uuid.UUID, lambda value: value.hex)
+
 # Create a single, reusable engine instance for the entire application.
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,  # Test connections before they are used from the pool.
-    connect_args={"sslmode": "require"},  # Enforce SSL connection.
-    echo=False  # Set to True to log SQL statements for debugging.
-)
+engine = _make_engine("primary", DATABASE_URL)
 
 # Create a configured "Session" class, which will serve as a factory for new Session objects.
 SessionLocal = sessionmaker(
@@ -26,19 +136,95 @@ SessionLocal = sessionmaker(
     class_=Session
 )
 
+# Async engine used by the high-traffic student endpoints. It shares the same
+# database as `engine` but lets a single worker keep many requests in flight
+# without tying up a threadpool slot per request.
+async_engine = _make_async_engine("primary_async", DATABASE_URL)
+
+# expire_on_commit=False: attribute access after commit must not trigger
+# implicit (blocking) refresh IO on an AsyncSession.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Optional read replica. Read-only endpoints use `get_read_db` /
+# `get_async_read_db`, which route SELECTs here and fall back to the primary
+# when the replica is missing, unhealthy, or the user has just written.
+# "Just written" is known per process and, across processes and serverless
+# instances, from the signed `last_write` cookie (see ReadYourWritesMiddleware).
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+READ_YOUR_WRITES_SECONDS = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", 10))
+REPLICA_RETRY_SECONDS = float(os.getenv("DB_REPLICA_RETRY_SECONDS", 30))
+
+replica_health = ReplicaHealth(REPLICA_RETRY_SECONDS)
+read_your_writes = ReadYourWrites(READ_YOUR_WRITES_SECONDS, secret=SECRET_KEY)
+track_writes(read_your_writes)
+
+read_engine = None
+async_read_engine = None
+if DATABASE_REPLICA_URL:
+    read_engine = _make_engine("replica", DATABASE_REPLICA_URL)
+    replica_health.watch(read_engine)
+    async_read_engine = _make_async_engine("replica_async", DATABASE_REPLICA_URL)
+    replica_health.watch(async_read_engine.sync_engine)
+
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    class_=RoutingSession,
+    primary=engine,
+    replica=read_engine,
+    replica_health=replica_health,
+    read_your_writes=read_your_writes
+)
+
+AsyncReadSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+    primary=async_engine.sync_engine,
+    replica=async_read_engine.sync_engine if async_read_engine else None,
+    replica_health=replica_health,
+    read_your_writes=read_your_writes
+)
+
 # FastAPI dependency to get a DB session per request.
-def get_db():
+def get_db(request: Request):
     """
     This dependency creates a new SQLAlchemy Session for each request,
     and ensures it's closed once the request is completed.
     """
-    db = SessionLocal()
+    db = SessionLocal(info={"request": request})
     try:
         yield db
     finally:
         db.close()
 
-# A function to create all tables. This is useful for initial setup.
-def create_db_and_tables():
-    SQLModel.metadata.create_all(engine)
+async def get_async_db(request: Request):
+    """
+    Async counterpart of `get_db` for `async def` routes. The session is
+    closed once the request is completed.
+    """
+    async with AsyncSessionLocal(info={"request": request}) as db:
+        yield db
+
+def get_read_db(request: Request):
+    """
+    Session for read-only routes: queries go to the read replica when one is
+    configured and healthy, otherwise (or right after the user's own commit)
+    to the primary.
+    """
+    db = ReadSessionLocal(info={"request": request})
+    try:
+        yield db
+    finally:
+        db.close()
 
+async def get_async_read_db(request: Request):
+    """Async counterpart of `get_read_db`."""
+    async with AsyncReadSessionLocal(info={"request": request}) as db:
+        yield db
@@ -0,0 +1,125 @@
+# File: app/db/statement_stats.py
+"""
+Per-fingerprint statement statistics and the slow-query log.
+
+Statements are normalized to fingerprints (literals, bind placeholders and
+IN-lists collapsed) so the same query issued with different values is
+aggregated. For each fingerprint the registry keeps call count, total/max
+time and a rolling window of recent latencies for p50/p95/p99. Both the
+number of fingerprints and the window are bounded; the least recently
+executed fingerprint is evicted first.
+
+Statements slower than SLOW_QUERY_MS are written to the
+`src.app.db.slow_query` logger together with the route that issued them.
+"""
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict, deque
+from functools import lru_cache
+
+from .query_stats import current_stats
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 200))
+MAX_FINGERPRINTS = int(os.getenv("DB_STATEMENT_STATS_MAX", 500))
+LATENCY_WINDOW = int(os.getenv("DB_STATEMENT_STATS_WINDOW", 1000))
+
+slow_query_logger = logging.getLogger("src.app.db.slow_query")
+
+_NORMALIZERS = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),                       # string literals
+    (re.compile(r"\$\d+|%\(\w+\)s|%s|(?<![:\w]):\w+"), "?"),    # asyncpg / psycopg2 / named binds
+    (re.compile(r"__\[POSTCOMPILE_\w+\]"), "?"),                # expanding IN parameters
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),                    # numeric literals
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)"), "(?+)"),        # IN (?, ?, ...) of any length
+    (re.compile(r"\s+"), " "),
+]
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """Normalize SQL text so executions that differ only in values share a key."""
+    normalized = statement
+    for pattern, replacement in _NORMALIZERS:
+        normalized = pattern.sub(replacement, normalized)
+    return normalized.strip()
+
+
+def _percentile(sorted_samples: list, q: float) -> float:
+    index = min(len(sorted_samples) - 1, int(round(q * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+class _Entry:
+    __slots__ = ("calls", "total_ms", "max_ms", "samples")
+
+    def __init__(self, window: int):
+        self.calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples = deque(maxlen=window)
+
+
+class StatementStats:
+    def __init__(self, max_fingerprints: int = MAX_FINGERPRINTS, window: int = LATENCY_WINDOW):
+        self.max_fingerprints = max_fingerprints
+        self.window = window
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self.evicted = 0
+
+    def observe(self, statement: str, elapsed_ms: float) -> None:
+        key = fingerprint(statement)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(self.window)
+                if len(self._entries) > self.max_fingerprints:
+                    self._entries.popitem(last=False)
+                    self.evicted += 1
+            else:
+                self._entries.move_to_end(key)
+            entry.calls += 1
+            entry.total_ms += elapsed_ms
+            entry.max_ms = max(entry.max_ms, elapsed_ms)
+            entry.samples.append(elapsed_ms)
+
+        if elapsed_ms >= SLOW_QUERY_MS:
+            stats = current_stats()
+            route = stats.route if stats is not None else None
+            slow_query_logger.warning(
+                "Slow query (%.1f ms) on %s: %s", elapsed_ms, route or "-", key,
+                extra={"duration_ms": round(elapsed_ms, 1), "route": route, "fingerprint": key},
+            )
+
+    def top(self, limit: int = 20, order_by: str = "total_ms") -> list:
+        """The `limit` fingerprints with the highest `order_by` value."""
+        with self._lock:
+            rows = [
+                (key, entry.calls, entry.total_ms, entry.max_ms, sorted(entry.samples))
+                for key, entry in self._entries.items()
+            ]
+        result = [
+            {
+                "fingerprint": key,
+                "calls": calls,
+                "total_ms": round(total_ms, 3),
+                "mean_ms": round(total_ms / calls, 3),
+                "max_ms": round(max_ms, 3),
+                "p50_ms": round(_percentile(samples, 0.50), 3),
+                "p95_ms": round(_percentile(samples, 0.95), 3),
+                "p99_ms": round(_percentile(samples, 0.99), 3),
+            }
+            for key, calls, total_ms, max_ms, samples in rows
+        ]
+        result.sort(key=lambda row: row[order_by], reverse=True)
+        return result[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.evicted = 0
+
+
+statement_stats = StatementStats()
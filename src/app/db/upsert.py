@@ -0,0 +1,15 @@
+# File: app/db/upsert.py
+"""
+Dialect-specific INSERT for `ON CONFLICT` upserts.
+
+`insert_for(session, target)` returns the Postgres or SQLite `insert()`
+construct (both support `on_conflict_do_nothing` / `on_conflict_do_update`
+and `RETURNING`) for whichever database the session is bound to.
+"""
+from sqlalchemy.dialects import postgresql, sqlite
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def insert_for(session, target):
+    return _INSERTS[session.get_bind().dialect.name](target)
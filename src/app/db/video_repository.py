@@ -0,0 +1,174 @@
+# File: app/db/video_repository.py
+"""
+Student video list.
+
+`course_videos_with_progress` answers the course video page in one round
+trip: a one-row derived table that exists only if the caller may access the
+course (same rule as `has_course_access`) drives the statement, LEFT JOINed
+to the course's videos and to the caller's `VideoProgress` for each of
+them. No row at all means no access; a single row without a video means
+access to a course that has no videos yet.
+Like the access check, the statement is a `lambda_stmt`, so its compiled
+form is cached and only the user, course and current time are bound.
+
+`sync_playlist` replaces a course's playlist with the submitted list: it
+diffs it against the stored videos and applies only the difference (one
+multi-row INSERT, one executemany UPDATE, one DELETE per referencing
+table) in a single transaction, with the course row locked so concurrent
+syncs of the same course run one after the other.
+"""
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import and_, bindparam, delete, func, lambda_stmt, literal_column, or_, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..models.course import Course
+from ..models.course_progress import CourseProgress
+from ..models.enrollment import Enrollment
+from ..models.video import Video
+from ..models.video_progress import VideoProgress
+
+_CONTENT_FIELDS = ("youtube_url", "title", "description")
+
+
+class PlaylistSyncError(ValueError):
+    pass
+
+
+@dataclass
+class PlaylistChanges:
+    inserted: int = 0
+    updated: int = 0
+    moved: int = 0
+    deleted: int = 0
+
+
+def _videos_with_progress_stmt(user_id, course_id, now: datetime):
+    # SELECT videos + progress FROM (SELECT 1 WHERE EXISTS <access>) LEFT JOIN video LEFT JOIN videoprogress
+    return lambda_stmt(
+        lambda: select(
+            Video.id,
+            Video.youtube_url,
+            Video.title,
+            Video.description,
+            func.coalesce(VideoProgress.completed, False).label("watched"),
+        )
+        .select_from(
+            select(literal_column("1").label("granted"))
+            .where(
+                select(Enrollment.id)
+                .where(
+                    Enrollment.user_id == user_id,
+                    Enrollment.course_id == course_id,
+                    Enrollment.status == "approved",
+                    Enrollment.is_accessible == True,
+                    or_(Enrollment.expiration_date > now, Enrollment.expiration_date == None),
+                )
+                .exists()
+            )
+            .subquery("access")
+        )
+        .outerjoin(Video, Video.course_id == course_id)
+        .outerjoin(VideoProgress, and_(VideoProgress.video_id == Video.id, VideoProgress.user_id == user_id))
+        .order_by(Video.position, Video.id)
+    )
+
+
+async def course_videos_with_progress(session: AsyncSession, user_id, course_id) -> list | None:
+    """Rows of `(id, youtube_url, title, description, watched)`; None without access."""
+    stmt = _videos_with_progress_stmt(user_id, course_id, datetime.utcnow())
+    rows = (await session.exec(stmt)).all()
+    if not rows:
+        return None
+    return [row for row in rows if row.id is not None]
+
+
+async def course_playlist(session: AsyncSession, course_id) -> list:
+    return (await session.exec(
+        select(Video).where(Video.course_id == course_id).order_by(Video.position, Video.id)
+    )).all()
+
+
+def _diff_playlist(course_id, current: dict, items: list, changes: PlaylistChanges):
+    """`(inserts, updates, deleted_ids)` turning `current` (id -> row) into `items`."""
+    inserts, updates, seen = [], [], set()
+    for position, item in enumerate(items):
+        fields = item.model_dump(exclude_unset=True, exclude={"id"})
+        if "youtube_url" in fields and not fields["youtube_url"]:
+            raise PlaylistSyncError(f"Video {position}: youtube_url cannot be empty")
+        if item.id is None:
+            if not fields.get("youtube_url"):
+                raise PlaylistSyncError(f"Video {position}: youtube_url is required for a new video")
+            inserts.append({
+                "id": uuid.uuid4(), "course_id": course_id, "position": position,
+                **{name: fields.get(name) for name in _CONTENT_FIELDS},
+            })
+            continue
+        if item.id in seen:
+            raise PlaylistSyncError(f"Video {item.id} is listed more than once")
+        seen.add(item.id)
+        row = current.get(item.id)
+        if row is None:
+            raise PlaylistSyncError(f"Video {item.id} does not belong to this course")
+        target = {name: fields.get(name, getattr(row, name)) for name in _CONTENT_FIELDS}
+        changed = any(target[name] != getattr(row, name) for name in _CONTENT_FIELDS)
+        moved = row.position != position
+        if changed:
+            changes.updated += 1
+        if moved:
+            changes.moved += 1
+        if changed or moved:
+            updates.append({"b_id": row.id, "b_position": position, **{f"b_{k}": v for k, v in target.items()}})
+    return inserts, updates, [video_id for video_id in current if video_id not in seen]
+
+
+async def sync_playlist(session: AsyncSession, course_id, items: list) -> PlaylistChanges | None:
+    """Make `items` (in order) the course's playlist; None if the course does not exist."""
+    if (await session.exec(select(Course.id).where(Course.id == course_id).with_for_update())).first() is None:
+        return None
+    current = {
+        row.id: row
+        for row in (await session.exec(
+            select(Video.id, Video.youtube_url, Video.title, Video.description, Video.position)
+            .where(Video.course_id == course_id)
+        )).all()
+    }
+    changes = PlaylistChanges()
+    try:
+        inserts, updates, deleted = _diff_playlist(course_id, current, items, changes)
+    except PlaylistSyncError:
+        await session.rollback()
+        raise
+
+    if deleted:
+        await session.exec(
+            update(Course).where(Course.preview_video_id.in_(deleted)).values(preview_video_id=None)
+        )
+        await session.exec(
+            update(CourseProgress)
+            .where(CourseProgress.last_accessed_video_id.in_(deleted))
+            .values(last_accessed_video_id=None)
+        )
+        await session.exec(delete(VideoProgress).where(VideoProgress.video_id.in_(deleted)))
+        await session.exec(delete(Video).where(Video.id.in_(deleted)))
+    if updates:
+        table = Video.__table__
+        await session.exec(
+            table.update()
+            .where(table.c.id == bindparam("b_id"))
+            .values(
+                position=bindparam("b_position"),
+                **{name: bindparam(f"b_{name}") for name in _CONTENT_FIELDS},
+            ),
+            params=updates,
+        )
+    if inserts:
+        await session.exec(Video.__table__.insert(), params=inserts)
+    await session.commit()
+
+    changes.inserted = len(inserts)
+    changes.deleted = len(deleted)
+    return changes
@@ -1,5 +1,11 @@
 # File: app/main.py
 # File location: src/app/main.py
+# Imported first so cold-start timing covers the rest of the application import.
+from src.app.utils.runtime_metrics import cold_start, ColdStartMiddleware
+from src.app.config.logging_config import setup_logging
+
+setup_logging()
+
 import os
 import logging
 from fastapi import FastAPI
@@ -22,7 +28,11 @@ from src.app.controllers import enrollment_controller
 from src.app.utils.dependencies import get_current_admin_user
 
 # Import database setup
-from src.app.db.session import create_db_and_tables
+from src.app.db.session import SERVERLESS, read_engine, read_your_writes
+from src.app.db.migrations import run_migrations
+from src.app.db.query_stats import QueryStatsMiddleware
+from src.app.db.routing import ReadYourWritesMiddleware
+from src.app.utils.oauth import close_http_client
 
 # Import Cloudinary configuration
 import cloudinary
@@ -55,19 +65,35 @@ app = FastAPI(
     max_age=3600  # Cache preflight requests for 1 hour
 )
 
-# Create database tables on startup
+app.add_middleware(QueryStatsMiddleware)
+# Read-your-writes has to follow the client across workers and serverless
+# instances, so it is carried in a signed cookie rather than process memory.
+if read_engine is not None:
+    app.add_middleware(ReadYourWritesMiddleware, read_your_writes=read_your_writes)
+app.add_middleware(ColdStartMiddleware)
+
+# Apply pending schema migrations on startup. Serverless instances skip this:
+# checking the schema on every cold start costs extra round trips, so run
+# `python -m src.app.db.migrations` at deploy time instead.
 @app.on_event("startup")
 def on_startup():
-    create_db_and_tables()
+    if not SERVERLESS:
+        # Never wait for the migration lock, and leave concurrent index
+        # builds to the deploy step (see src.app.db.migrations).
+        run_migrations(wait=False, concurrent=False)
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await close_http_client()
 
 # Log SQLAlchemy mapper relationships for Course and Video on startup
 @app.on_event("startup")
 async def startup_event():
-    logging.basicConfig(level=logging.INFO)
     insp_course = inspect(Course)
     insp_video = inspect(Video)
     logging.info("Course relationships: %s", insp_course.relationships)
     logging.info("Video relationships: %s", insp_video.relationships)
+    logging.info("Startup finished %.1f ms after import (serverless=%s)", cold_start.mark_ready(), SERVERLESS)
 
 # Include routers
 app.include_router(auth_router.router, prefix="/api/auth", tags=["Authentication"])
@@ -1,5 +1,6 @@
 # assignment.py
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import UniqueConstraint
 import uuid
 from datetime import datetime
 from typing import List, Optional, TYPE_CHECKING
@@ -20,7 +21,10 @@ class Assignment(SQLModel, table=True):
     course: "src.app.models.course.Course" = Relationship(back_populates="assignments")
 
 class AssignmentSubmission(SQLModel, table=True):
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        UniqueConstraint("assignment_id", "student_id", name="uq_assignmentsubmission_assignment_student"),
+        {"extend_existing": True},
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     assignment_id: uuid.UUID = Field(foreign_key="assignment.id")
     student_id: uuid.UUID = Field(foreign_key="user.id")
@@ -1,7 +1,9 @@
 from sqlmodel import SQLModel, Field, Relationship
 import uuid
 from typing import List, Optional, TYPE_CHECKING
-from sqlalchemy import Column, Text, ForeignKey
+from sqlalchemy import Column, Text, ForeignKey, Index
+from sqlalchemy.orm import deferred
+from sqlmodel.sql.sqltypes import AutoString
 import json
 from datetime import datetime
 from src.app.models.enrollment import Enrollment
@@ -12,12 +14,41 @@ from src.app.models.quiz import Quiz
 if TYPE_CHECKING:
     from src.app.models.video import Video
 
+# Long text sections. They are deferred: `select(Course)` leaves them out and
+# they load on first access, or up front with `.options(undefer_group("text"))`.
+_description_column = Column("description", AutoString, nullable=False)
+_outcomes_column = Column("outcomes", Text)
+_prerequisites_column = Column("prerequisites", Text)
+_curriculum_column = Column("curriculum", Text)
+
+
 class Course(SQLModel, table=True):
     __tablename__ = 'course'
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        # Catalog listing (keyset on created_at, id); INCLUDE lets Postgres
+        # answer a status-filtered page from the index alone.
+        Index(
+            "ix_course_status_created",
+            "status",
+            "created_at",
+            "id",
+            postgresql_include=["price", "difficulty_level", "title", "thumbnail_url"],
+        ),
+        Index("ix_course_created_id", "created_at", "id"),
+        Index("ix_course_difficulty_created", "difficulty_level", "created_at", "id"),
+        {"extend_existing": True},
+    )
+    __mapper_args__ = {
+        "properties": {
+            "description": deferred(_description_column, group="text"),
+            "outcomes": deferred(_outcomes_column, group="text"),
+            "prerequisites": deferred(_prerequisites_column, group="text"),
+            "curriculum": deferred(_curriculum_column, group="text"),
+        }
+    }
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     title: str
-    description: str
+    description: str = Field(sa_column=_description_column)
     price: float = Field(default=0.0)
     thumbnail_url: Optional[str] = None
     preview_video_id: Optional[uuid.UUID] = Field(
@@ -35,7 +66,8 @@ class Course(SQLModel, table=True):
         back_populates="course", 
         sa_relationship_kwargs={
             "foreign_keys": "[Video.course_id]", 
-            "cascade": "all, delete-orphan"
+            "cascade": "all, delete-orphan",
+            "order_by": "Video.position",
         }
     )
     enrollments: List["src.app.models.enrollment.Enrollment"] = Relationship(back_populates="course", sa_relationship_kwargs={"cascade": "all, delete-orphan"})
@@ -47,7 +79,7 @@ class Course(SQLModel, table=True):
     updated_by: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
-    outcomes: str = Field(default="", sa_column=Column(Text))
-    prerequisites: str = Field(default="", sa_column=Column(Text))
-    curriculum: str = Field(default="", sa_column=Column(Text))
+    outcomes: str = Field(default="", sa_column=_outcomes_column)
+    prerequisites: str = Field(default="", sa_column=_prerequisites_column)
+    curriculum: str = Field(default="", sa_column=_curriculum_column)
     status: str = Field(default="active")
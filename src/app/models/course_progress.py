@@ -1,7 +1,7 @@
 from sqlmodel import SQLModel, Field, Relationship
 from typing import Optional, TYPE_CHECKING
 import uuid
-from sqlalchemy import Column, Boolean, Float
+from sqlalchemy import Column, Boolean, Float, UniqueConstraint
 
 if TYPE_CHECKING:
     from src.app.models.course import Course
@@ -9,7 +9,10 @@ if TYPE_CHECKING:
     from src.app.models.video import Video
 
 class CourseProgress(SQLModel, table=True):
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        UniqueConstraint("user_id", "course_id", name="uq_courseprogress_user_course"),
+        {"extend_existing": True},
+    )
     id: Optional[uuid.UUID] = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID = Field(foreign_key="user.id", nullable=False)
     course_id: uuid.UUID = Field(foreign_key="course.id", nullable=False)
@@ -1,5 +1,6 @@
 # File: app/models/enrollment.py
 from sqlmodel import SQLModel, Field, Relationship, JSON
+from sqlalchemy import Index
 import uuid
 from datetime import datetime, timedelta
 from typing import Optional, TYPE_CHECKING, List
@@ -14,7 +15,10 @@ if TYPE_CHECKING:
 import uuid
 
 class Enrollment(SQLModel, table=True):
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index("ix_enrollment_user_course_status", "user_id", "course_id", "status"),
+        {"extend_existing": True},
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: str = Field(foreign_key="user.id")
     course_id: str = Field(foreign_key="course.id")
@@ -1,5 +1,6 @@
 # File: app/models/oauth.py
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import UniqueConstraint
 import uuid
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
@@ -8,7 +9,10 @@ if TYPE_CHECKING:
     from src.app.models.user import User
 
 class OAuthAccount(SQLModel, table=True):
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        UniqueConstraint("provider", "provider_account_id", name="uq_oauthaccount_provider_account"),
+        {"extend_existing": True},
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID = Field(foreign_key="user.id", nullable=False, index=True)
     provider: str = Field(nullable=False, description="e.g. 'google'")
@@ -1,13 +1,23 @@
 # File: application/src/app/models/password_reset.py
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
 import uuid
 from datetime import datetime, timedelta
 
 class PasswordReset(SQLModel, table=True):
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        # Covering index: verification reads used/expires_at without touching the heap.
+        Index(
+            "ix_passwordreset_user_pin_hash",
+            "user_id",
+            "pin_hash",
+            postgresql_include=["used", "expires_at"],
+        ),
+        {"extend_existing": True},
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID = Field(foreign_key="user.id", nullable=False, index=True)
-    pin: str = Field(nullable=False, description="6-digit reset PIN")
+    pin_hash: str = Field(nullable=False, max_length=64, description="HMAC-SHA256 of the 6-digit reset PIN")
     created_at: datetime = Field(default_factory=datetime.utcnow)
     expires_at: datetime = Field(
         default_factory=lambda: datetime.utcnow() + timedelta(minutes=15)
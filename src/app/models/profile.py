@@ -1,5 +1,6 @@
 # File: app/models/profile.py
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import UniqueConstraint
 import uuid
 from typing import Optional, TYPE_CHECKING
 
@@ -7,7 +8,10 @@ if TYPE_CHECKING:
     from .user import User
 
 class Profile(SQLModel, table=True):
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        UniqueConstraint("user_id", name="uq_profile_user"),
+        {"extend_existing": True},
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID = Field(foreign_key="user.id")
     full_name: Optional[str] = None
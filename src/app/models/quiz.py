@@ -1,5 +1,6 @@
 # quiz.py
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import UniqueConstraint
 import uuid
 from typing import List, Optional, TYPE_CHECKING
 from datetime import datetime
@@ -40,7 +41,10 @@ class Option(SQLModel, table=True):
     question: Question = Relationship(back_populates="options")
 
 class QuizSubmission(SQLModel, table=True):
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        UniqueConstraint("quiz_id", "student_id", name="uq_quizsubmission_quiz_student"),
+        {"extend_existing": True},
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     quiz_id: uuid.UUID = Field(foreign_key="quiz.id")
     student_id: uuid.UUID = Field(foreign_key="user.id")
@@ -1,6 +1,8 @@
 # File: app/models/user.py
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index, text
 import uuid
+from datetime import datetime
 from typing import Optional, List, TYPE_CHECKING
 import uuid
 
@@ -12,7 +14,11 @@ if TYPE_CHECKING:
     from src.app.models.video_progress import VideoProgress
 
 class User(SQLModel, table=True):
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        # Case-insensitive email lookups (bulk student import).
+        Index("ix_user_email_lower", text("lower(email)")),
+        {"extend_existing": True},
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     email: str = Field(index=True, unique=True, nullable=False)
     hashed_password: Optional[str] = None  # Optional for OAuth users
@@ -20,6 +26,10 @@ class User(SQLModel, table=True):
     is_active: bool = Field(default=True)
     suspended_at: Optional[str] = None
     suspend_reason: Optional[str] = None
+    # Access tokens carry the version they were issued for; bumping it
+    # (suspension, password reset, logout everywhere) revokes older tokens.
+    token_version: int = Field(default=0, nullable=False, sa_column_kwargs={"server_default": "0"})
+    tokens_revoked_at: Optional[datetime] = Field(default=None, index=True)
     full_name: Optional[str] = None
     avatar_url: Optional[str] = None
 
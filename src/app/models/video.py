@@ -1,5 +1,6 @@
 # File: app/models/video.py
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index
 import uuid
 from typing import Optional, TYPE_CHECKING, List
 
@@ -9,12 +10,17 @@ if TYPE_CHECKING:
 
 class Video(SQLModel, table=True):
     __tablename__ = 'video'
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index("ix_video_course_position", "course_id", "position"),
+        {"extend_existing": True},
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     course_id: uuid.UUID = Field(foreign_key="course.id", nullable=False)
     youtube_url: str
     title: Optional[str] = None
     description: Optional[str] = None
+    # Order within the course playlist (0-based).
+    position: int = Field(default=0, nullable=False, sa_column_kwargs={"server_default": "0"})
 
     course: "src.app.models.course.Course" = Relationship(back_populates="videos", sa_relationship_kwargs={"foreign_keys": "[Video.course_id]"})
     progress: List["src.app.models.video_progress.VideoProgress"] = Relationship(back_populates="video", sa_relationship_kwargs={"cascade": "all, delete-orphan"})
@@ -1,14 +1,17 @@
 from sqlmodel import SQLModel, Field, Relationship
 from typing import Optional, TYPE_CHECKING
 import uuid
-from sqlalchemy import Column, String, Boolean, UUID
+from sqlalchemy import Column, String, Boolean, UUID, UniqueConstraint
 
 if TYPE_CHECKING:
     from src.app.models.video import Video
     from src.app.models.user import User
 
 class VideoProgress(SQLModel, table=True):
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        UniqueConstraint("user_id", "video_id", name="uq_videoprogress_user_video"),
+        {"extend_existing": True},
+    )
     id: Optional[uuid.UUID] = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID = Field(foreign_key="user.id", nullable=False)
     video_id: uuid.UUID = Field(foreign_key="video.id", nullable=False)
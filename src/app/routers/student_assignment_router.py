@@ -6,7 +6,7 @@ from uuid import UUID
 from typing import List
 from ..utils.file import save_upload_and_get_url
 
-from ..db.session import get_db
+from ..db.session import get_db, get_read_db
 from ..utils.dependencies import get_current_user
 from ..controllers.assignment_controller import (
     list_assignments,
@@ -31,7 +31,7 @@ router = APIRouter(
 def student_list(
     course_id: UUID,
     user=Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     return list_assignments(db, course_id, user.id)
 
@@ -40,7 +40,7 @@ def student_detail(
     course_id: UUID,
     assignment_id: UUID,
     user=Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     return get_assignment(db, course_id, assignment_id, user.id)
 
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from uuid import UUID
 
-from ..db.session import get_db
+from ..db.session import get_db, get_async_db
+from ..db.enrollment_repository import has_course_access, has_course_access_async
 from ..utils.dependencies import get_current_user
 from ..models.video import Video
 from ..models.assignment import Assignment, AssignmentSubmission
@@ -18,63 +20,52 @@ router = APIRouter(
     tags=["student_analytics"],
 )
 
-from ..models.enrollment import Enrollment
 from src.app.models.course import Course
 from datetime import datetime
 
 @router.get("")
-def student_course_analytics(
+async def student_course_analytics(
     course_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user=Depends(get_current_user),
 ):
     # --- Enrollment check ---
-    current_time = datetime.utcnow()
-    enrollment = db.exec(
-        select(Enrollment).where(
-            Enrollment.user_id == user.id,
-            Enrollment.course_id == course_id,
-            Enrollment.status == "approved",
-            Enrollment.is_accessible == True,
-            ((Enrollment.expiration_date > current_time) | (Enrollment.expiration_date == None))
-        )
-    ).first()
-    if not enrollment:
+    if not await has_course_access_async(db, user.id, course_id):
         return {"detail": "You are not enrolled in this course."}
 
     # --- Course info ---
-    course = db.exec(select(Course).where(Course.id == course_id)).first()
+    course = (await db.exec(select(Course.title, Course.description).where(Course.id == course_id))).first()
     course_info = {"title": course.title, "description": course.description} if course else {}
 
     # Videos
-    total_videos = db.exec(select(Video).where(Video.course_id == course_id)).all()
-    videos_watched = db.exec(
+    total_videos = (await db.exec(select(Video).where(Video.course_id == course_id))).all()
+    videos_watched = (await db.exec(
         select(VideoProgress).where(
             VideoProgress.video_id.in_(select(Video.id).where(Video.course_id == course_id)),
             VideoProgress.user_id == user.id,
             VideoProgress.completed == True
         )
-    ).all()
+    )).all()
     # Assignments
-    total_assignments = db.exec(select(Assignment).where(Assignment.course_id == course_id)).all()
-    assignments_submitted = db.exec(
+    total_assignments = (await db.exec(select(Assignment).where(Assignment.course_id == course_id))).all()
+    assignments_submitted = (await db.exec(
         select(AssignmentSubmission).where(
             AssignmentSubmission.assignment_id.in_(
                 select(Assignment.id).where(Assignment.course_id == course_id)
             ),
             AssignmentSubmission.student_id == user.id
         )
-    ).all()
+    )).all()
     # Quizzes
-    total_quizzes = db.exec(select(Quiz).where(Quiz.course_id == course_id)).all()
-    quizzes_attempted = db.exec(
+    total_quizzes = (await db.exec(select(Quiz).where(Quiz.course_id == course_id))).all()
+    quizzes_attempted = (await db.exec(
         select(QuizSubmission).where(
             QuizSubmission.quiz_id.in_(
                 select(Quiz.id).where(Quiz.course_id == course_id)
             ),
             QuizSubmission.student_id == user.id
         )
-    ).all()
+    )).all()
 
     # Calculate progress percentage
     completed = 0
@@ -92,12 +83,12 @@ def student_course_analytics(
     progress = int((completed / total) * 100) if total > 0 else 0
 
     # --- Update CourseProgress if 100% ---
-    course_progress = db.exec(
+    course_progress = (await db.exec(
         select(CourseProgress).where(
             CourseProgress.user_id == user.id,
             CourseProgress.course_id == course_id
         )
-    ).first()
+    )).first()
     now = datetime.utcnow().isoformat()
     if progress == 100:
         if course_progress:
@@ -106,7 +97,7 @@ def student_course_analytics(
                 course_progress.completed_at = now
                 course_progress.progress_percentage = 100.0
                 db.add(course_progress)
-                db.commit()
+                await db.commit()
         else:
             # Create new CourseProgress if not exists
             course_progress = CourseProgress(
@@ -117,13 +108,13 @@ def student_course_analytics(
                 progress_percentage=100.0
             )
             db.add(course_progress)
-            db.commit()
+            await db.commit()
     elif course_progress:
         # Optionally update progress_percentage if not complete
         if course_progress.progress_percentage != progress:
             course_progress.progress_percentage = float(progress)
             db.add(course_progress)
-            db.commit()
+            await db.commit()
 
     return {
         "course": course_info,
@@ -142,19 +133,7 @@ def submit_course_feedback(
     user=Depends(get_current_user),
 ):
     # Ensure user is enrolled and access is valid
-    from ..models.enrollment import Enrollment
-    from datetime import datetime
-    current_time = datetime.utcnow()
-    enrollment = db.exec(
-        select(Enrollment).where(
-            Enrollment.user_id == user.id,
-            Enrollment.course_id == course_id,
-            Enrollment.status == "approved",
-            Enrollment.is_accessible == True,
-            ((Enrollment.expiration_date > current_time) | (Enrollment.expiration_date == None))
-        )
-    ).first()
-    if not enrollment:
+    if not has_course_access(db, user.id, course_id):
         raise HTTPException(status_code=403, detail="You must be enrolled in the course to submit feedback.")
     # Ensure course is completed by the user
     course_progress = db.exec(
@@ -2,10 +2,11 @@
 
 from fastapi import APIRouter, Depends, status
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from uuid import UUID
 from typing import List
 
-from ..db.session import get_db
+from ..db.session import get_read_db, get_async_db
 from ..utils.dependencies import get_current_user
 from ..controllers.quiz_controller import (
     list_quizzes,
@@ -29,7 +30,7 @@ router = APIRouter(
 @router.get("", response_model=List[QuizListRead])
 def student_list_quizzes(
     course_id: UUID,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user),
 ):
     return list_quizzes(db, course_id, user.id)
@@ -39,7 +40,7 @@ def student_list_quizzes(
 def student_get_quiz(
     course_id: UUID,
     quiz_id: UUID,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user),
 ):
     return get_quiz_detail(db, course_id, quiz_id, user.id)
@@ -50,14 +51,14 @@ def student_get_quiz(
     response_model=QuizResult,
     status_code=status.HTTP_201_CREATED
 )
-def student_submit_quiz(
+async def student_submit_quiz(
     course_id: UUID,
     quiz_id: UUID,
     payload: QuizSubmissionCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user=Depends(get_current_user),
 ):
-    return submit_quiz(db, course_id, quiz_id, user.id, payload)
+    return await submit_quiz(db, course_id, quiz_id, user.id, payload)
 
 
 @router.get(
@@ -68,7 +69,7 @@ def student_get_quiz_result(
     course_id: UUID,
     quiz_id: UUID,
     submission_id: UUID,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user=Depends(get_current_user),
 ):
     return get_quiz_result(db, course_id, quiz_id, submission_id, user.id)
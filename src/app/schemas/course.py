@@ -84,6 +84,14 @@ class CourseExploreList(BaseModel):
     price: float
     thumbnail_url: Optional[str] = None
 
+class CourseSearchResult(BaseModel):
+    id: uuid.UUID
+    title: str
+    price: float
+    thumbnail_url: Optional[str] = None
+    rank: float = Field(..., description="Relevance; higher is better")
+    snippet: str = Field(..., description="Matching text with the matched words in <mark> tags")
+
 class CourseExploreDetail(CourseBase):
     id: uuid.UUID
 
@@ -0,0 +1,18 @@
+# File: app/schemas/student_import.py
+from pydantic import BaseModel
+from typing import List, Optional
+
+class StudentImportError(BaseModel):
+    row: int                    # 1-based data row (CSV header / blank lines not counted)
+    email: Optional[str] = None
+    error: str
+
+class StudentImportReport(BaseModel):
+    total_rows: int
+    created: int
+    enrollments_created: int
+    reset_pins_sent: int
+    failed: int
+    dry_run: bool
+    duration_ms: float
+    errors: List[StudentImportError]
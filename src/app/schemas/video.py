@@ -1,6 +1,5 @@
-# File: app/schemas/video.py
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 import uuid
 
 class VideoBase(BaseModel):
@@ -17,6 +16,18 @@ class VideoUpdate(VideoBase):
 class VideoRead(VideoBase):
     id: uuid.UUID
     course_id: uuid.UUID
+    position: int = 0
 
     class Config:
         from_attributes = True
+
+class PlaylistVideo(VideoUpdate):
+    """One entry of a playlist sync: an existing video by `id` (only the fields sent are changed) or, without `id`, a new one."""
+    id: Optional[uuid.UUID] = None
+
+class PlaylistSyncResult(BaseModel):
+    inserted: int = Field(..., description="New videos")
+    updated: int = Field(..., description="Existing videos whose URL, title or description changed")
+    moved: int = Field(..., description="Existing videos whose position changed")
+    deleted: int = Field(..., description="Videos missing from the submitted list")
+    videos: List[VideoRead] = Field(..., description="The course playlist after the sync, in order")
@@ -0,0 +1,137 @@
+# File location: src/app/utils/catalog_cache.py
+"""
+Per-process cache of the public course catalog.
+
+Courses only change through the admin endpoints (`create_course`,
+`update_course`, `delete_course`), so catalog reads (`explore_courses`,
+`explore_course_detail`, the course text endpoints and
+`get_purchase_info`) are served from memory:
+- `get_course` holds one immutable `CourseRecord` per course;
+- `get_page` holds listing pages, keyed by filters, cursor and limit, as
+  tuples of `CourseSummary`.
+
+Both maps are bounded LRUs whose entries also expire after
+CATALOG_CACHE_TTL_SECONDS. The admin endpoints call `bump()` after their
+commit: it advances the catalog `version` and evicts everything, so this
+worker serves the change immediately. Other workers keep serving their
+entries for up to the TTL.
+"""
+import os
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy.orm import undefer_group
+from sqlmodel import Session
+
+from src.app.db.course_repository import CatalogFilters, catalog_page
+from src.app.models.course import Course
+from src.app.utils.cache import TTLCache
+
+CATALOG_CACHE_TTL_SECONDS = float(os.getenv("CATALOG_CACHE_TTL_SECONDS", 60))
+CATALOG_CACHE_MAX_COURSES = int(os.getenv("CATALOG_CACHE_MAX_COURSES", 2_000))
+CATALOG_CACHE_MAX_PAGES = int(os.getenv("CATALOG_CACHE_MAX_PAGES", 500))
+
+
+@dataclass(frozen=True, slots=True)
+class CourseSummary:
+    id: uuid.UUID
+    title: str
+    price: float
+    thumbnail_url: str | None
+    created_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class CourseRecord:
+    id: uuid.UUID
+    title: str
+    description: str
+    price: float
+    thumbnail_url: str | None
+    difficulty_level: str | None
+    status: str
+    outcomes: str
+    prerequisites: str
+    curriculum: str
+    updated_at: datetime
+
+    @classmethod
+    def from_course(cls, course: Course) -> "CourseRecord":
+        return cls(
+            id=course.id,
+            title=course.title,
+            description=course.description,
+            price=course.price,
+            thumbnail_url=course.thumbnail_url,
+            difficulty_level=course.difficulty_level,
+            status=course.status,
+            outcomes=course.outcomes or "",
+            prerequisites=course.prerequisites or "",
+            curriculum=course.curriculum or "",
+            updated_at=course.updated_at,
+        )
+
+
+class CatalogCache:
+    def __init__(self, max_courses: int, max_pages: int, ttl: float):
+        self.version = 0
+        self._courses = TTLCache(max_courses, ttl)
+        self._pages = TTLCache(max_pages, ttl)
+        self._lock = threading.Lock()
+
+    def get_course(self, session: Session, course_id: uuid.UUID) -> CourseRecord | None:
+        """The course as a `CourseRecord`; None if it does not exist."""
+        record = self._courses.get(course_id)
+        if record is not None:
+            return record
+        generation = self._courses.generation
+        course = session.get(Course, course_id, options=[undefer_group("text")])
+        if course is None:
+            return None
+        record = CourseRecord.from_course(course)
+        self._courses.set(course_id, record, generation=generation)
+        return record
+
+    def get_page(self, session: Session, filters: CatalogFilters, cursor: str | None, limit: int | None):
+        """Cached `catalog_page`: `(summaries, next_cursor)`."""
+        key = (filters, cursor, limit)
+        page = self._pages.get(key)
+        if page is not None:
+            return page
+        generation = self._pages.generation
+        rows, next_cursor = catalog_page(session, filters, cursor, limit)
+        page = (
+            tuple(
+                CourseSummary(
+                    id=row.id,
+                    title=row.title,
+                    price=row.price,
+                    thumbnail_url=row.thumbnail_url,
+                    created_at=row.created_at,
+                )
+                for row in rows
+            ),
+            next_cursor,
+        )
+        self._pages.set(key, page, generation=generation)
+        return page
+
+    def bump(self) -> int:
+        """Advance the catalog version and evict every cached course and page."""
+        with self._lock:
+            self.version += 1
+            self._courses.clear()
+            self._pages.clear()
+            return self.version
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "courses": self._courses.stats(),
+            "pages": self._pages.stats(),
+        }
+
+
+catalog_cache = CatalogCache(CATALOG_CACHE_MAX_COURSES, CATALOG_CACHE_MAX_PAGES, CATALOG_CACHE_TTL_SECONDS)
@@ -13,8 +13,6 @@ from ..utils.file import save_upload_and_get_url
 from fastapi import UploadFile
 import traceback
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 class CertificateGenerator:
@@ -0,0 +1,184 @@
+# File location: src/app/utils/course_search.py
+"""
+Course search for `/api/courses/search`.
+
+On Postgres the search runs in the database (`search_statement`: generated
+`search_vector`, GIN index, `ts_rank_cd`, `ts_headline`). Other backends
+(the SQLite benchmark database) use `CourseSearchIndex`, an in-process
+inverted index over the same fields with the same weights as the vector
+(title 1.0, description 0.4, outcomes 0.2, curriculum 0.1). It is rebuilt
+when the catalog version changes or after CATALOG_CACHE_TTL_SECONDS.
+
+The fallback matches whole words case-insensitively, requires every word of
+the query, folds a plural "s" and skips common stop words; it does not
+stem like Postgres and ignores the quote / `or` / `-` query syntax.
+"""
+import html
+import math
+import re
+import threading
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+
+from sqlmodel import Session, select
+
+from src.app.db.course_repository import highlight, search_statement
+from src.app.models.course import Course
+from src.app.utils.catalog_cache import CATALOG_CACHE_TTL_SECONDS, catalog_cache
+
+FIELD_WEIGHTS = (("title", 1.0), ("description", 0.4), ("outcomes", 0.2), ("curriculum", 0.1))
+SNIPPET_WORDS = 30
+
+_WORD = re.compile(r"\w+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from how in into is it of on or that the this to was what with".split()
+)
+
+
+def _normalize(word: str) -> str:
+    word = word.lower()
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+    return word
+
+
+def search_terms(text: str | None) -> list:
+    return [_normalize(word) for word in _WORD.findall(text or "") if word.lower() not in _STOPWORDS]
+
+
+@dataclass(frozen=True, slots=True)
+class SearchHit:
+    id: uuid.UUID
+    title: str
+    price: float
+    thumbnail_url: str | None
+    rank: float
+    snippet: str
+
+
+@dataclass(frozen=True, slots=True)
+class _Document:
+    title: str
+    price: float
+    thumbnail_url: str | None
+    status: str
+    body: str
+
+
+def _snippet(body: str, terms: set) -> str:
+    """About SNIPPET_WORDS words around the first match, HTML-escaped, matches wrapped in <mark>."""
+    words = body.split()
+    first = next((i for i, word in enumerate(words) if terms.intersection(search_terms(word))), None)
+    start = 0 if first is None else max(0, first - 5)
+    return " ".join(
+        f"<mark>{html.escape(word)}</mark>" if terms.intersection(search_terms(word)) else html.escape(word)
+        for word in words[start:start + SNIPPET_WORDS]
+    )
+
+
+class CourseSearchIndex:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.builds = 0
+        self.last_build_ms = None
+        self._postings: dict[str, dict[uuid.UUID, float]] = {}
+        self._documents: dict[uuid.UUID, _Document] = {}
+        self._version = None
+        self._built_at = float("-inf")
+        self._lock = threading.Lock()
+
+    @property
+    def stale(self) -> bool:
+        return self._version != catalog_cache.version or time.monotonic() - self._built_at >= self.ttl
+
+    def _build(self, session: Session) -> None:
+        started = time.perf_counter()
+        version = catalog_cache.version
+        rows = session.exec(
+            select(
+                Course.id, Course.title, Course.price, Course.thumbnail_url, Course.status,
+                Course.description, Course.outcomes, Course.curriculum,
+            )
+        ).all()
+        postings = defaultdict(dict)
+        documents = {}
+        for row in rows:
+            for name, weight in FIELD_WEIGHTS:
+                for term in search_terms(getattr(row, name)):
+                    scores = postings[term]
+                    scores[row.id] = scores.get(row.id, 0.0) + weight
+            documents[row.id] = _Document(
+                title=row.title,
+                price=row.price,
+                thumbnail_url=row.thumbnail_url,
+                status=row.status,
+                body="\n".join(text for text in (row.description, row.outcomes, row.curriculum) if text),
+            )
+        self._postings, self._documents = dict(postings), documents
+        self._version = version
+        self._built_at = time.monotonic()
+        self.builds += 1
+        self.last_build_ms = (time.perf_counter() - started) * 1000
+
+    def search(self, session: Session, query: str, status: str | None, limit: int, offset: int) -> list:
+        if self.stale:
+            with self._lock:
+                if self.stale:
+                    self._build(session)
+        postings, documents = self._postings, self._documents
+        terms = list(dict.fromkeys(search_terms(query)))
+        lists = [postings.get(term) for term in terms]
+        if not lists or any(scores is None for scores in lists):
+            return []
+        idf = [math.log(1 + len(documents) / len(scores)) for scores in lists]
+        ranked = sorted(
+            (
+                (sum(scores[course_id] * weight for scores, weight in zip(lists, idf)), course_id)
+                for course_id in min(lists, key=len)
+                if all(course_id in scores for scores in lists)
+                and (status is None or documents[course_id].status == status)
+            ),
+            key=lambda hit: (-hit[0], str(hit[1])),
+        )
+        matched = set(terms)
+        return [
+            SearchHit(
+                id=course_id,
+                title=documents[course_id].title,
+                price=documents[course_id].price,
+                thumbnail_url=documents[course_id].thumbnail_url,
+                rank=round(score, 6),
+                snippet=_snippet(documents[course_id].body, matched),
+            )
+            for score, course_id in ranked[offset:offset + limit]
+        ]
+
+    def stats(self) -> dict:
+        return {
+            "terms": len(self._postings),
+            "courses": len(self._documents),
+            "builds": self.builds,
+            "last_build_ms": round(self.last_build_ms, 2) if self.last_build_ms is not None else None,
+        }
+
+
+course_search_index = CourseSearchIndex(CATALOG_CACHE_TTL_SECONDS)
+
+
+def search_courses(session: Session, query: str, status: str | None = None, limit: int = 20, offset: int = 0):
+    """Ranked matches with `id, title, price, thumbnail_url, rank, snippet`."""
+    if session.get_bind().dialect.name == "postgresql":
+        return [
+            SearchHit(
+                id=row.id,
+                title=row.title,
+                price=row.price,
+                thumbnail_url=row.thumbnail_url,
+                rank=row.rank,
+                snippet=highlight(row.snippet),
+            )
+            for row in session.exec(search_statement(query, status, limit, offset)).all()
+        ]
+    return course_search_index.search(session, query, status, limit, offset)
@@ -0,0 +1,165 @@
+# File location: src/app/utils/course_versions.py
+"""
+Conditional GETs for course content.
+
+A course's validators are derived from `(id, updated_at)`: a strong ETag
+and a Last-Modified date (second precision). `course_versions` keeps the
+`updated_at` of every course in memory, loaded with one narrow
+`SELECT id, updated_at FROM course`, so a revalidation (`If-None-Match` /
+`If-Modified-Since`) is answered with 304 before the course row is fetched
+or serialized.
+
+The map is reloaded when it is older than COURSE_VERSION_TTL_SECONDS, and
+right away after a commit in this process touched a course. Edits made by
+other workers therefore show up within the TTL; until then a client may
+keep its cached copy.
+"""
+import hashlib
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from src.app.models.course import Course
+
+COURSE_VERSION_TTL_SECONDS = float(os.getenv("COURSE_VERSION_TTL_SECONDS", 30))
+
+_PENDING_KEY = "course_versions_changed"
+
+
+def _utc(value: datetime) -> datetime:
+    # `updated_at` is stored without a zone and written as UTC.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def course_etag(course_id, updated_at: datetime, variant: str = "") -> str:
+    """`variant` tells apart representations of one version, e.g. a `?fields=` selection."""
+    digest = hashlib.sha256(f"{course_id}:{_utc(updated_at).isoformat()}:{variant}".encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def course_validators(course_id, updated_at: datetime, variant: str = "") -> dict:
+    return {
+        "ETag": course_etag(course_id, updated_at, variant),
+        "Last-Modified": format_datetime(_utc(updated_at).replace(microsecond=0), usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+
+
+def is_not_modified(request: Request, etag: str, updated_at: datetime) -> bool:
+    """RFC 9110 evaluation: If-None-Match wins; If-Modified-Since only without it."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return _utc(updated_at).replace(microsecond=0) <= since
+    return False
+
+
+class CourseVersions:
+    """course id -> `updated_at` of every course, reloaded as a whole."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.last_load_ms = None
+        self._versions: dict[uuid.UUID, datetime] = {}
+        self._loaded_at = float("-inf")
+        self._lock = threading.Lock()
+
+    @property
+    def stale(self) -> bool:
+        return time.monotonic() - self._loaded_at >= self.ttl
+
+    def get(self, session, course_id: uuid.UUID) -> datetime | None:
+        if self.stale:
+            with self._lock:
+                if self.stale:
+                    self._load(session)
+        updated_at = self._versions.get(course_id)
+        if updated_at is None:
+            self.misses += 1
+        return updated_at
+
+    def _load(self, session) -> None:
+        started = time.perf_counter()
+        self._versions = dict(session.exec(select(Course.id, Course.updated_at)).all())
+        self._loaded_at = time.monotonic()
+        self.loads += 1
+        self.last_load_ms = (time.perf_counter() - started) * 1000
+
+    def invalidate(self) -> None:
+        self._loaded_at = float("-inf")
+
+    def not_modified(self, request: Request, session, course_id: str, variant: str = "") -> Response | None:
+        """A 304 response if the client's copy of `course_id` is current, else None."""
+        if "if-none-match" not in request.headers and "if-modified-since" not in request.headers:
+            return None
+        try:
+            course_uuid = uuid.UUID(course_id)
+        except ValueError:
+            return None
+        updated_at = self.get(session, course_uuid)
+        if updated_at is None:
+            return None
+        headers = course_validators(course_uuid, updated_at, variant)
+        if not is_not_modified(request, headers["ETag"], updated_at):
+            return None
+        self.hits += 1
+        return Response(status_code=304, headers=headers)
+
+    def stats(self) -> dict:
+        return {
+            "courses": len(self._versions),
+            "ttl_seconds": self.ttl,
+            "not_modified": self.hits,
+            "misses": self.misses,
+            "loads": self.loads,
+            "last_load_ms": round(self.last_load_ms, 2) if self.last_load_ms is not None else None,
+        }
+
+
+course_versions = CourseVersions(COURSE_VERSION_TTL_SECONDS)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_course_changes(session, flush_context):
+    if any(isinstance(obj, Course) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info[_PENDING_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_course_changes(orm_execute_state):
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and (
+        orm_execute_state.bind_mapper is not None and orm_execute_state.bind_mapper.class_ is Course
+    ):
+        orm_execute_state.session.info[_PENDING_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _reload_after_commit(session):
+    if session.info.pop(_PENDING_KEY, False):
+        course_versions.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -1,57 +1,86 @@
 # File location: src/app/utils/dependencies.py
+import uuid
+
 from fastapi import Request, Depends, HTTPException, status
-from sqlmodel import Session
-from src.app.db.session import get_db
-from src.app.models.user import User
+from sqlmodel.ext.asyncio.session import AsyncSession
+from src.app.db.session import get_async_db
+from src.app.utils.user_cache import CurrentUser, load_current_user
 from src.app.utils.security import decode_access_token
+from src.app.utils.token_revocation import token_revocations
 
-async def get_current_user(
-    request: Request,
-    session: Session = Depends(get_db)
-) -> User:
+
+def _token_payload(request: Request) -> dict:
     token = request.cookies.get("access_token")
-    print(f"[LOG] Access token: {token}")
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated",
         )
-    payload = decode_access_token(token)
+    return decode_access_token(token)
+
+
+async def _resolve_user(session: AsyncSession, payload: dict, user_id: str) -> CurrentUser | None:
+    """
+    Authorize from the token claims when it carries `ver`: the only check is
+    the in-memory revocation registry, so no database access is needed.
+    Tokens issued before `ver` existed fall back to the cached user row.
+    None means the user does not exist, is inactive or the token is revoked.
+    """
+    try:
+        uid = uuid.UUID(user_id)
+    except ValueError:
+        return None
+    await token_revocations.refresh_if_stale(session)
+    version = payload.get("ver")
+    if token_revocations.is_revoked(str(uid), version or 0):
+        return None
+    if version is None:
+        user = await load_current_user(session, uid)
+        return user if user is not None and user.is_active else None
+    return CurrentUser(
+        id=uid,
+        email=payload.get("email"),
+        role=payload.get("role"),
+        is_active=True,
+        token_version=version,
+    )
+
+
+async def get_current_user(
+    request: Request,
+    session: AsyncSession = Depends(get_async_db)
+) -> CurrentUser:
+    payload = _token_payload(request)
     user_id: str = payload.get("user_id")
     if not user_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
         )
-    user = session.get(User, user_id)
-    if not user or not user.is_active:
+    user = await _resolve_user(session, payload, user_id)
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Inactive or invalid user",
         )
+    # Lets the DB layer attribute commits/reads to this user (read-your-writes routing).
+    request.state.user_id = user.id
     return user
 
 # Dependency to check for admin user
 async def get_current_admin_user(
     request: Request,
-    session: Session = Depends(get_db)
-) -> User:
-    token = request.cookies.get("access_token")
-    print(f"[LOG] Access token (admin): {token}")
-    if not token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated",
-        )
-    payload = decode_access_token(token)
+    session: AsyncSession = Depends(get_async_db)
+) -> CurrentUser:
+    payload = _token_payload(request)
     user_id: str = payload.get("sub")
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token payload")
-    user = session.get(User, user_id)
+    user = await _resolve_user(session, payload, user_id)
     if not user or user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized as admin",
         )
+    request.state.user_id = user.id
     return user
- 
\ No newline at end of file
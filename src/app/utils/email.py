@@ -6,8 +6,6 @@ import logging
 from email.mime.text import MIMEText
 from dotenv import load_dotenv
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Load .env at module import
@@ -1,42 +1,174 @@
 # File location: src/app/utils/oauth.py
+"""
+Google OAuth helpers.
+
+All calls to Google share one application-lifetime `httpx.AsyncClient`
+(HTTP/2, keep-alive), so a sign-in reuses warm connections instead of a new
+TCP+TLS handshake per call. The callback only needs the code exchange: the
+returned `id_token` is verified locally against Google's JWKS (cached for
+the max-age Google sends) and its claims replace the userinfo round trip.
+
+The endpoint URLs can be overridden (GOOGLE_TOKEN_URL, GOOGLE_JWKS_URL,
+GOOGLE_USERINFO_URL) to point at the stand-in server in
+`benchmarks/fake_google.py`.
+"""
+import asyncio
+import logging
 import os
+import re
+import time
+
 import httpx
 from dotenv import load_dotenv
+from jose import JWTError, jwk, jwt
 from ..schemas.oauth import GoogleToken, GoogleUserInfo
-from ..utils.security import create_access_token
 
 load_dotenv()
 
 # Google OAuth Configuration
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
-GOOGLE_REDIRECT_URI = os.getenv("GOOGLE_REDIRECT_URI") 
+GOOGLE_REDIRECT_URI = os.getenv("GOOGLE_REDIRECT_URI")
+
+GOOGLE_TOKEN_URL = os.getenv("GOOGLE_TOKEN_URL", "https://oauth2.googleapis.com/token")
+GOOGLE_JWKS_URL = os.getenv("GOOGLE_JWKS_URL", "https://www.googleapis.com/oauth2/v3/certs")
+GOOGLE_USERINFO_URL = os.getenv("GOOGLE_USERINFO_URL", "https://www.googleapis.com/oauth2/v3/userinfo")
+GOOGLE_ISSUERS = ("https://accounts.google.com", "accounts.google.com")
+
+OAUTH_HTTP_TIMEOUT_SECONDS = float(os.getenv("OAUTH_HTTP_TIMEOUT_SECONDS", 10))
+OAUTH_HTTP_MAX_CONNECTIONS = int(os.getenv("OAUTH_HTTP_MAX_CONNECTIONS", 20))
+
+# Used when the JWKS response has no max-age; also the minimum interval
+# between refreshes triggered by an unknown key id.
+_JWKS_DEFAULT_TTL_SECONDS = 3600
+_JWKS_MIN_REFRESH_SECONDS = 60
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+logger = logging.getLogger(__name__)
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """The shared client, created on first use (also on serverless instances)."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=OAUTH_HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=OAUTH_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=OAUTH_HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=90,
+            ),
+        )
+    return _http_client
+
+
+def use_http_client(client: httpx.AsyncClient | None) -> None:
+    """Replace the shared client, e.g. with one bound to the fake Google app."""
+    global _http_client
+    _http_client = client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+class GoogleIdTokenError(Exception):
+    pass
+
+
+class JWKSCache:
+    """Google's signing keys by `kid`, refreshed when expired or on an unknown `kid`."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.fetches = 0
+        self._keys: dict = {}   # kid -> constructed public key
+        self._expires_at = 0.0
+        self._fetched_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    async def get_key(self, kid: str):
+        key = self._keys.get(kid)
+        if key is not None and time.monotonic() < self._expires_at:
+            return key
+        async with self._lock:
+            key = self._keys.get(kid)
+            expired = time.monotonic() >= self._expires_at
+            if expired or (key is None and time.monotonic() - self._fetched_at >= _JWKS_MIN_REFRESH_SECONDS):
+                await self._fetch()
+                key = self._keys.get(kid)
+        if key is None:
+            raise GoogleIdTokenError(f"Unknown signing key {kid!r}")
+        return key
+
+    async def _fetch(self) -> None:
+        response = await get_http_client().get(self.url)
+        response.raise_for_status()
+        match = _MAX_AGE.search(response.headers.get("cache-control", ""))
+        ttl = int(match.group(1)) if match else _JWKS_DEFAULT_TTL_SECONDS
+        self._keys = {
+            key["kid"]: jwk.construct(key, key.get("alg", "RS256")) for key in response.json()["keys"]
+        }
+        self._fetched_at = time.monotonic()
+        self._expires_at = self._fetched_at + ttl
+        self.fetches += 1
+        logger.info("Fetched %d Google signing keys (ttl %ss)", len(self._keys), ttl)
+
+
+google_jwks = JWKSCache(GOOGLE_JWKS_URL)
+
 
 async def get_google_token(code: str) -> GoogleToken:
     """Exchange authorization code for Google tokens."""
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "https://oauth2.googleapis.com/token",
-            data={
-                "code": code,
-                "client_id": GOOGLE_CLIENT_ID,
-                "client_secret": GOOGLE_CLIENT_SECRET,
-                "redirect_uri": GOOGLE_REDIRECT_URI,
-                "grant_type": "authorization_code",
-            },
+    response = await get_http_client().post(
+        GOOGLE_TOKEN_URL,
+        data={
+            "code": code,
+            "client_id": GOOGLE_CLIENT_ID,
+            "client_secret": GOOGLE_CLIENT_SECRET,
+            "redirect_uri": GOOGLE_REDIRECT_URI,
+            "grant_type": "authorization_code",
+        },
+    )
+    response.raise_for_status()
+    return GoogleToken(**response.json())
+
+async def verify_google_id_token(id_token: str, access_token: str | None = None) -> GoogleUserInfo:
+    """
+    Verify signature, audience, issuer and expiry of a Google `id_token`
+    (and its `at_hash` when `access_token` is given); return its profile claims.
+    """
+    try:
+        header = jwt.get_unverified_header(id_token)
+        key = await google_jwks.get_key(header.get("kid"))
+        claims = jwt.decode(
+            id_token,
+            key,
+            algorithms=["RS256"],
+            audience=GOOGLE_CLIENT_ID,
+            issuer=GOOGLE_ISSUERS,
+            access_token=access_token,
         )
-        response.raise_for_status()
-        return GoogleToken(**response.json())
+    except JWTError as e:
+        raise GoogleIdTokenError(f"Invalid id_token: {e}") from e
+    if not claims.get("email") or not claims.get("email_verified"):
+        raise GoogleIdTokenError("Google account email is not verified")
+    return GoogleUserInfo(**claims)
 
 async def get_google_user_info(access_token: str) -> GoogleUserInfo:
     """Get user info from Google using access token."""
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            "https://www.googleapis.com/oauth2/v3/userinfo",
-            headers={"Authorization": f"Bearer {access_token}"},
-        )
-        response.raise_for_status()
-        return GoogleUserInfo(**response.json())
+    response = await get_http_client().get(
+        GOOGLE_USERINFO_URL,
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    response.raise_for_status()
+    return GoogleUserInfo(**response.json())
 
 def create_oauth_response(user, access_token: str):
     """Create standardized OAuth response."""
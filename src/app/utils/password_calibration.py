@@ -0,0 +1,73 @@
+# File location: src/app/utils/password_calibration.py
+"""
+bcrypt cost calibration.
+
+Measures how long one bcrypt hash takes on this host for a range of cost
+factors and recommends the highest cost whose median stays within the
+target per-login latency:
+
+    python -m src.app.utils.password_calibration --target-ms 250
+
+Run it on production hardware, then set BCRYPT_ROUNDS. Existing hashes are
+migrated to the new cost on each user's next successful login.
+"""
+import argparse
+import statistics
+import time
+
+import bcrypt
+
+from src.app.utils.password_hashing import PASSWORD_HASH_WORKERS
+from src.app.utils.security import BCRYPT_ROUNDS
+
+
+def measure(rounds: int, samples: int) -> list:
+    """Wall time (ms) of `samples` bcrypt hashes at the given cost."""
+    password = b"calibration-password"
+    timings = []
+    for _ in range(samples):
+        salt = bcrypt.gensalt(rounds)
+        start = time.perf_counter()
+        bcrypt.hashpw(password, salt)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def calibrate(target_ms: float, min_rounds: int, max_rounds: int, samples: int) -> tuple[list, int | None]:
+    rows = []
+    recommended = None
+    for rounds in range(min_rounds, max_rounds + 1):
+        median_ms = statistics.median(measure(rounds, samples))
+        rows.append({
+            "rounds": rounds,
+            "median_ms": round(median_ms, 1),
+            "logins_per_second": round(PASSWORD_HASH_WORKERS * 1000 / median_ms, 1),
+        })
+        if median_ms <= target_ms:
+            recommended = rounds
+        elif median_ms > target_ms * 4:
+            break  # Every further step doubles the cost.
+    return rows, recommended
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bcrypt cost factors on this host.")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="acceptable hashing time per login")
+    parser.add_argument("--min-rounds", type=int, default=10)
+    parser.add_argument("--max-rounds", type=int, default=16)
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+
+    rows, recommended = calibrate(args.target_ms, args.min_rounds, args.max_rounds, args.samples)
+    print(f"{'rounds':>6}  {'median ms':>10}  {'logins/s':>9}  (with {PASSWORD_HASH_WORKERS} hashing workers)")
+    for row in rows:
+        marker = "  <- current" if row["rounds"] == BCRYPT_ROUNDS else ""
+        print(f"{row['rounds']:>6}  {row['median_ms']:>10}  {row['logins_per_second']:>9}{marker}")
+    if recommended is None:
+        print(f"\nNo cost factor >= {args.min_rounds} hashes within {args.target_ms:.0f} ms on this host.")
+    else:
+        print(f"\nRecommended: BCRYPT_ROUNDS={recommended} (target {args.target_ms:.0f} ms per login)")
+
+
+if __name__ == "__main__":
+    main()
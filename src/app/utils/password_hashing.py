@@ -0,0 +1,124 @@
+# File location: src/app/utils/password_hashing.py
+"""
+Dedicated worker pool for bcrypt.
+
+Hashing and verification run on a private thread pool instead of inline in
+a route (or on the shared AnyIO threadpool that serves every sync route).
+The bcrypt extension releases the GIL while it works, so the pool scales
+with cores without the pickling overhead of a process pool.
+
+At most PASSWORD_HASH_MAX_PENDING calls may be queued or running; beyond
+that requests fail fast with 503 instead of piling up behind a login storm.
+`password_hasher.stats()` feeds the admin `/system/runtime` endpoint.
+
+Bulk student imports hash on `bulk_password_hasher`, a separate pool sized by
+PASSWORD_IMPORT_HASH_WORKERS, so a cohort import queues behind itself and
+not in front of interactive logins.
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+
+from src.app.utils.security import hash_password, verify_and_update
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 2))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", PASSWORD_HASH_WORKERS * 8))
+PASSWORD_IMPORT_HASH_WORKERS = int(os.getenv("PASSWORD_IMPORT_HASH_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.max_pending_seen = 0
+        self.completed = 0
+        self.rejected = 0
+        self._queue_wait_ms = 0.0
+        self._work_ms = 0.0
+        self._work_max_ms = 0.0
+
+    def _reserve(self) -> None:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many sign-in requests right now. Please try again in a moment.",
+                    headers={"Retry-After": "1"},
+                )
+            self.pending += 1
+            self.max_pending_seen = max(self.max_pending_seen, self.pending)
+
+    def _timed(self, submitted: float, fn, *args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self._queue_wait_ms += (started - submitted) * 1000
+                self._work_ms += (finished - started) * 1000
+                self._work_max_ms = max(self._work_max_ms, (finished - started) * 1000)
+
+    async def _run(self, fn, *args):
+        self._reserve()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._timed, time.perf_counter(), fn, *args)
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def hash_many(self, passwords: list) -> list:
+        """Hash a batch concurrently, ignoring `max_pending` (the caller bounds the batch)."""
+        loop = asyncio.get_running_loop()
+        submitted = time.perf_counter()
+        with self._lock:
+            self.pending += len(passwords)
+            self.max_pending_seen = max(self.max_pending_seen, self.pending)
+        try:
+            return await asyncio.gather(*(
+                loop.run_in_executor(self._executor, self._timed, submitted, hash_password, password)
+                for password in passwords
+            ))
+        finally:
+            with self._lock:
+                self.pending -= len(passwords)
+                self.completed += len(passwords)
+
+    async def verify_and_update(self, password: str, hashed_password: str | None) -> tuple[bool, str | None]:
+        """`(valid, new_hash)`; `new_hash` is set when the stored hash should be replaced."""
+        if not hashed_password:
+            # OAuth-only accounts have no password.
+            return False, None
+        return await self._run(verify_and_update, password, hashed_password)
+
+    def stats(self) -> dict:
+        with self._lock:
+            done = self.completed or 1
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "max_pending_seen": self.max_pending_seen,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_queue_wait_ms": round(self._queue_wait_ms / done, 2),
+                "avg_hash_ms": round(self._work_ms / done, 2),
+                "max_hash_ms": round(self._work_max_ms, 2),
+            }
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
+bulk_password_hasher = PasswordHasher(PASSWORD_IMPORT_HASH_WORKERS, max_pending=0)
@@ -0,0 +1,62 @@
+# File location: src/app/utils/rate_limit.py
+"""
+In-memory, per-key sliding-window rate limiting.
+
+State lives in the process: every worker enforces its own window, so with N
+workers a key can make up to N * `max_attempts` attempts. That is enough to
+make online guessing of a 6-digit reset PIN impractical without a shared
+store. The number of tracked keys is bounded; the least recently used key is
+dropped first.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+
+from fastapi import HTTPException, status
+
+
+class SlidingWindowLimiter:
+    def __init__(self, max_attempts: int, window_seconds: float, max_keys: int = 10_000):
+        self.max_attempts = max_attempts
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._attempts: "OrderedDict[str, deque]" = OrderedDict()
+
+    def hit(self, key: str, detail: str = "Too many attempts. Please try again later.") -> None:
+        """Record an attempt for `key`; raise 429 if the window is already full."""
+        now = time.monotonic()
+        with self._lock:
+            attempts = self._attempts.get(key)
+            if attempts is None:
+                attempts = self._attempts[key] = deque()
+                while len(self._attempts) > self.max_keys:
+                    self._attempts.popitem(last=False)
+            else:
+                self._attempts.move_to_end(key)
+            while attempts and attempts[0] <= now - self.window_seconds:
+                attempts.popleft()
+            if len(attempts) >= self.max_attempts:
+                self.rejected += 1
+                retry_after = attempts[0] + self.window_seconds - now
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail=detail,
+                    headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+                )
+            attempts.append(now)
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._attempts.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_attempts": self.max_attempts,
+                "window_seconds": self.window_seconds,
+                "tracked_keys": len(self._attempts),
+                "rejected": self.rejected,
+            }
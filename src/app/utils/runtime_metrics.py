@@ -0,0 +1,66 @@
+# File location: src/app/utils/runtime_metrics.py
+"""
+Process lifetime metrics, mainly cold-start time for serverless instances.
+
+`main.py` imports this module before anything else, so `PROCESS_STARTED`
+marks the beginning of the application import. Cold start is reported as:
+- `import_ms`: module import until the startup handlers finished;
+- `first_request_ms`: module import until the first request was answered
+  (what a user hitting a cold Vercel instance actually waits for).
+"""
+import logging
+import time
+
+PROCESS_STARTED = time.perf_counter()
+STARTED_AT = time.time()
+
+logger = logging.getLogger(__name__)
+
+
+class ColdStart:
+    def __init__(self):
+        self.import_ms = None
+        self.first_request_ms = None
+
+    def mark_ready(self) -> float:
+        self.import_ms = (time.perf_counter() - PROCESS_STARTED) * 1000
+        return self.import_ms
+
+    def snapshot(self) -> dict:
+        return {
+            "import_ms": round(self.import_ms, 1) if self.import_ms is not None else None,
+            "first_request_ms": round(self.first_request_ms, 1) if self.first_request_ms is not None else None,
+            "uptime_seconds": round(time.time() - STARTED_AT, 1),
+        }
+
+
+cold_start = ColdStart()
+
+
+class ColdStartMiddleware:
+    """
+    Pure ASGI middleware that adds `Server-Timing: cold-start;dur=<ms>` to the
+    first HTTP response of the process and logs the measurement once. Every
+    later request passes straight through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._pending = True
+
+    async def __call__(self, scope, receive, send):
+        if not self._pending or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        self._pending = False
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                cold_start.first_request_ms = (time.perf_counter() - PROCESS_STARTED) * 1000
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", b"cold-start;dur=%.1f" % cold_start.first_request_ms))
+                message["headers"] = headers
+                logger.info("Cold start: first response after %.1f ms", cold_start.first_request_ms)
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
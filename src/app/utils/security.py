@@ -1,14 +1,32 @@
 # File location: src/app/utils/security.py
+import hashlib
+import hmac
+import logging
+import os
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 
+logger = logging.getLogger(__name__)
+
 SECRET_KEY = "your_secret_key_here"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 1440
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt cost factor (2^rounds iterations). Pick it with
+# `python -m src.app.utils.password_calibration` on production hardware.
+# min/max pin the policy to exactly this cost, so `needs_update` flags every
+# hash made with another cost and logins migrate it (see verify_and_update).
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -16,6 +34,29 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify the password; on success also return a new hash if the stored one uses an outdated cost."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+# Reset PINs are stored as a keyed hash. It is deterministic (no per-row salt)
+# so verification can look the PIN up through an index; the key keeps the
+# 10^6 PIN space from being brute-forced offline from a database dump.
+# Production refuses to start without a dedicated key; elsewhere it falls back
+# to SECRET_KEY with a warning.
+def _reset_pin_key() -> str:
+    key = os.getenv("PASSWORD_RESET_PIN_KEY")
+    if key:
+        return key
+    if os.getenv("APP_ENV", "production").lower() == "production":
+        raise RuntimeError("PASSWORD_RESET_PIN_KEY must be set when APP_ENV=production")
+    logger.warning("PASSWORD_RESET_PIN_KEY is not set; reset PINs are keyed with SECRET_KEY")
+    return SECRET_KEY
+
+PASSWORD_RESET_PIN_KEY = _reset_pin_key()
+
+def hash_reset_pin(pin: str) -> str:
+    return hmac.new(PASSWORD_RESET_PIN_KEY.encode(), pin.encode(), hashlib.sha256).hexdigest()
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
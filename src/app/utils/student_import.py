@@ -0,0 +1,335 @@
+# File location: src/app/utils/student_import.py
+"""
+Bulk student import (admin CSV / NDJSON upload).
+
+The upload is parsed as a stream in a worker thread (reading and validating
+rows is blocking work) and only finished batches of STUDENT_IMPORT_BATCH_SIZE
+rows reach the event loop. Emails are stored lower-cased and matched
+case-insensitively. Per batch:
+- one SELECT (on `lower(email)`, indexed) finds emails that are already
+  registered in any letter case (their passwords are not hashed at all);
+- passwords are hashed concurrently on `bulk_password_hasher`;
+- users are written with one multi-row `INSERT ... ON CONFLICT (email) DO
+  NOTHING RETURNING email`, so a concurrent signup turns into a row error
+  instead of failing the batch; profiles, enrollments and reset PINs follow
+  as plain multi-row INSERTs;
+- the batch commits. A database error rolls back that batch only: its
+  rows are reported in `errors` and the import continues with the next one.
+
+Columns / keys: `email` (required), `password`, `full_name`, `course_id`,
+`enrollment_status` (pending | approved). Rows without a password get no
+password; with `send_reset_pins` they are issued a reset PIN instead, which
+is far cheaper than bcrypt for large cohorts.
+"""
+import csv
+import io
+import json
+import logging
+import os
+import secrets
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from pydantic import EmailStr, TypeAdapter, ValidationError
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import iterate_in_threadpool
+
+from src.app.db.upsert import insert_for
+from src.app.models.course import Course
+from src.app.models.enrollment import Enrollment
+from src.app.models.password_reset import PasswordReset
+from src.app.models.profile import Profile
+from src.app.models.user import User
+from src.app.utils.password_hashing import bulk_password_hasher
+from src.app.utils.security import hash_reset_pin
+from src.app.utils.time import get_pakistan_time
+
+logger = logging.getLogger(__name__)
+
+STUDENT_IMPORT_BATCH_SIZE = int(os.getenv("STUDENT_IMPORT_BATCH_SIZE", 500))
+STUDENT_IMPORT_PIN_TTL_HOURS = float(os.getenv("STUDENT_IMPORT_PIN_TTL_HOURS", 72))
+
+ENROLLMENT_STATUSES = ("pending", "approved")
+FORMATS = ("csv", "ndjson")
+
+_email_adapter = TypeAdapter(EmailStr)
+
+
+class RowError(Exception):
+    pass
+
+
+@dataclass
+class StudentRow:
+    row: int
+    email: str
+    password: str | None
+    full_name: str | None
+    course_id: uuid.UUID | None
+    enrollment_status: str
+
+
+@dataclass
+class ImportOptions:
+    course_id: uuid.UUID | None = None
+    enrollment_status: str = "approved"
+    duration_months: int | None = None
+    send_reset_pins: bool = False
+    dry_run: bool = False
+
+
+@dataclass
+class ImportResult:
+    total_rows: int = 0
+    created: int = 0
+    enrollments_created: int = 0
+    reset_pins_sent: int = 0
+    dry_run: bool = False
+    errors: list = field(default_factory=list)
+    pins: list = field(default_factory=list)   # (email, pin) to send after the response
+    _started: float = field(default_factory=time.perf_counter)
+
+    def fail(self, row: int, email: str | None, error: str) -> None:
+        self.errors.append({"row": row, "email": email, "error": error})
+
+    def report(self) -> dict:
+        return {
+            "total_rows": self.total_rows,
+            "created": self.created,
+            "enrollments_created": self.enrollments_created,
+            "reset_pins_sent": self.reset_pins_sent,
+            "failed": len(self.errors),
+            "dry_run": self.dry_run,
+            "duration_ms": round((time.perf_counter() - self._started) * 1000, 1),
+            "errors": self.errors,
+        }
+
+
+def iter_records(fileobj, fmt: str):
+    """Yield `(row_number, record)`; `record` is a RowError for unparsable NDJSON lines."""
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(text)
+            reader.fieldnames = [name.strip().lower() for name in reader.fieldnames or []]
+            for number, record in enumerate(reader, 1):
+                yield number, record
+            return
+        number = 0
+        for line in text:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield number, RowError(f"Invalid JSON: {e.msg}")
+                continue
+            yield number, record if isinstance(record, dict) else RowError("Expected a JSON object")
+    finally:
+        text.detach()   # Leave the upload's file open for its owner.
+
+
+def _clean(value) -> str | None:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def parse_row(number: int, record: dict, options: ImportOptions, seen: set) -> StudentRow:
+    raw_email = _clean(record.get("email"))
+    if not raw_email:
+        raise RowError("Missing email")
+    try:
+        email = _email_adapter.validate_python(raw_email).lower()
+    except ValidationError:
+        raise RowError("Invalid email address")
+    if email in seen:
+        raise RowError("Duplicate email in file")
+    seen.add(email)
+
+    course_id = options.course_id
+    if _clean(record.get("course_id")):
+        try:
+            course_id = uuid.UUID(_clean(record["course_id"]))
+        except ValueError:
+            raise RowError("Invalid course_id")
+    status = (_clean(record.get("enrollment_status")) or options.enrollment_status).lower()
+    if status not in ENROLLMENT_STATUSES:
+        raise RowError(f"enrollment_status must be one of {', '.join(ENROLLMENT_STATUSES)}")
+
+    return StudentRow(
+        row=number,
+        email=email,
+        password=_clean(record.get("password")),
+        full_name=_clean(record.get("full_name")),
+        course_id=course_id,
+        enrollment_status=status,
+    )
+
+
+async def _known_courses(session: AsyncSession, rows: list, cache: dict) -> None:
+    unknown = {row.course_id for row in rows if row.course_id is not None and row.course_id not in cache}
+    if unknown:
+        found = set((await session.exec(select(Course.id).where(Course.id.in_(unknown)))).all())
+        cache.update({course_id: course_id in found for course_id in unknown})
+
+
+def _enrollment_values(row: StudentRow, user_id, options: ImportOptions) -> dict:
+    now = get_pakistan_time()
+    approved = row.enrollment_status == "approved"
+    expiration = None
+    if approved and options.duration_months:
+        expiration = now + timedelta(days=30 * options.duration_months)
+    return {
+        "id": uuid.uuid4(),
+        "user_id": user_id,
+        "course_id": row.course_id,
+        "status": row.enrollment_status,
+        "enroll_date": now,
+        "expiration_date": expiration,
+        "is_accessible": approved,
+        "days_remaining": (expiration - now).days if expiration else None,
+        "audit_log": [],
+        "last_access_date": None,
+    }
+
+
+async def _import_batch(
+    session: AsyncSession, rows: list, options: ImportOptions, result: ImportResult, courses: dict
+) -> None:
+    await _known_courses(session, rows, courses)
+    valid = []
+    for row in rows:
+        if row.course_id is not None and not courses[row.course_id]:
+            result.fail(row.row, row.email, "Unknown course_id")
+        else:
+            valid.append(row)
+
+    existing = set((await session.exec(
+        select(func.lower(User.email)).where(func.lower(User.email).in_([row.email for row in valid]))
+    )).all()) if valid else set()
+    rows = []
+    for row in valid:
+        if row.email in existing:
+            result.fail(row.row, row.email, "Email already registered")
+        else:
+            rows.append(row)
+    if not rows:
+        return
+    if options.dry_run:
+        result.created += len(rows)
+        result.enrollments_created += sum(1 for row in rows if row.course_id is not None)
+        return
+
+    with_password = [row for row in rows if row.password]
+    hashes = dict(zip(
+        (row.email for row in with_password),
+        await bulk_password_hasher.hash_many([row.password for row in with_password]),
+    ))
+    ids = {row.email: uuid.uuid4() for row in rows}
+    table = User.__table__
+    inserted = set((await session.exec(
+        insert_for(session, table)
+        .on_conflict_do_nothing(index_elements=[table.c.email])
+        .returning(table.c.email),
+        params=[
+            {
+                "id": ids[row.email], "email": row.email, "hashed_password": hashes.get(row.email),
+                "full_name": row.full_name, "avatar_url": None, "role": "student", "is_active": True,
+                "token_version": 0,
+            }
+            for row in rows
+        ],
+    )).scalars().all())
+
+    created = []
+    for row in rows:
+        if row.email in inserted:
+            created.append(row)
+        else:
+            result.fail(row.row, row.email, "Email already registered")
+    if not created:
+        await session.rollback()
+        return
+
+    await session.exec(
+        Profile.__table__.insert(),
+        params=[
+            {"id": uuid.uuid4(), "user_id": ids[row.email], "full_name": row.full_name, "avatar_url": None, "bio": None}
+            for row in created
+        ],
+    )
+    enrollments = [
+        _enrollment_values(row, ids[row.email], options) for row in created if row.course_id is not None
+    ]
+    if enrollments:
+        await session.exec(Enrollment.__table__.insert(), params=enrollments)
+
+    pins = []
+    if options.send_reset_pins:
+        now = datetime.utcnow()
+        for row in created:
+            if not row.password:
+                pins.append((row, f"{secrets.randbelow(900000) + 100000}"))
+        if pins:
+            await session.exec(
+                PasswordReset.__table__.insert(),
+                params=[
+                    {
+                        "id": uuid.uuid4(), "user_id": ids[row.email], "pin_hash": hash_reset_pin(pin),
+                        "created_at": now, "expires_at": now + timedelta(hours=STUDENT_IMPORT_PIN_TTL_HOURS),
+                        "used": False,
+                    }
+                    for row, pin in pins
+                ],
+            )
+    await session.commit()
+
+    result.created += len(created)
+    result.enrollments_created += len(enrollments)
+    result.reset_pins_sent += len(pins)
+    result.pins.extend((row.email, pin) for row, pin in pins)
+
+
+def parse_batches(fileobj, fmt: str, options: ImportOptions, result: ImportResult):
+    """Yield lists of valid `StudentRow`s, recording unparsable rows on `result`. Blocking."""
+    seen, batch = set(), []
+    for number, record in iter_records(fileobj, fmt):
+        result.total_rows += 1
+        if isinstance(record, RowError):
+            result.fail(number, None, str(record))
+            continue
+        try:
+            batch.append(parse_row(number, record, options, seen))
+        except RowError as e:
+            result.fail(number, _clean(record.get("email")), str(e))
+        if len(batch) >= STUDENT_IMPORT_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def import_students(session: AsyncSession, fileobj, fmt: str, options: ImportOptions) -> ImportResult:
+    result = ImportResult(dry_run=options.dry_run)
+    courses = {}
+    async for batch in iterate_in_threadpool(parse_batches(fileobj, fmt, options, result)):
+        reported = len(result.errors)
+        try:
+            await _import_batch(session, batch, options, result, courses)
+        except SQLAlchemyError:
+            logger.exception("Student import batch of rows %d-%d failed", batch[0].row, batch[-1].row)
+            await session.rollback()
+            failed = {error["row"] for error in result.errors[reported:]}
+            for row in batch:
+                if row.row not in failed:
+                    result.fail(row.row, row.email, "Database error; row not imported")
+    result.errors.sort(key=lambda error: error["row"])
+    return result
@@ -0,0 +1,148 @@
+# File location: src/app/utils/token_revocation.py
+"""
+Access token revocation by per-user token version.
+
+Every access token carries the user's `token_version` as `ver`. Revoking a
+user's tokens (suspension, password reset, logout everywhere) bumps
+`user.token_version` and stamps `user.tokens_revoked_at`; tokens with an
+older `ver` are then rejected. Tokens also carry the role and are trusted
+while active, so any flushed change of `role` or `is_active` revokes them
+too (bulk UPDATEs bypass this and must call `revoke_user_tokens`).
+
+Each process keeps the current version of recently revoked users in
+memory, so authorizing a request normally needs no database access:
+- commits in this process apply immediately (session events below);
+- revocations made by other workers are picked up by `refresh_if_stale`,
+  at most once every TOKEN_REVOCATION_REFRESH_SECONDS, with one indexed
+  query on `tokens_revoked_at`.
+Only revocations younger than the token lifetime matter (older tokens have
+expired anyway), so the registry stays small.
+"""
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, inspect
+from sqlmodel import Session, select
+
+from src.app.models.user import User
+from src.app.utils.security import ACCESS_TOKEN_EXPIRE_MINUTES
+
+TOKEN_REVOCATION_REFRESH_SECONDS = float(os.getenv("TOKEN_REVOCATION_REFRESH_SECONDS", 5))
+
+# Re-read revocations stamped slightly before the previous refresh: a
+# transaction may commit a while after it set `tokens_revoked_at`.
+_REFRESH_OVERLAP = timedelta(seconds=60)
+_PENDING_KEY = "token_revocations"
+
+
+def revoke_user_tokens(user: User) -> None:
+    """Invalidate every token issued to `user` so far; takes effect on commit."""
+    user.token_version = (user.token_version or 0) + 1
+    user.tokens_revoked_at = datetime.utcnow()
+
+
+class TokenRevocations:
+    def __init__(self, refresh_seconds: float, horizon: timedelta):
+        self.refresh_seconds = refresh_seconds
+        self.horizon = horizon
+        self.refreshes = 0
+        self.last_refresh_ms = None
+        self._versions: dict[str, tuple[int, datetime]] = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = asyncio.Lock()
+        self._since: datetime | None = None
+        self._refreshed_at = float("-inf")
+
+    def is_revoked(self, user_id: str, version: int) -> bool:
+        entry = self._versions.get(user_id)
+        return entry is not None and version < entry[0]
+
+    def revoke(self, user_id: str, version: int, revoked_at: datetime | None = None) -> None:
+        with self._lock:
+            current = self._versions.get(user_id)
+            if current is None or version > current[0]:
+                self._versions[user_id] = (version, revoked_at or datetime.utcnow())
+
+    @property
+    def stale(self) -> bool:
+        return time.monotonic() - self._refreshed_at >= self.refresh_seconds
+
+    async def refresh_if_stale(self, session) -> None:
+        if not self.stale:
+            return
+        if self._refresh_lock.locked() and self._since is not None:
+            return  # Another request is refreshing; keep serving the current view.
+        async with self._refresh_lock:
+            if self.stale:
+                await self._refresh(session)
+
+    async def _refresh(self, session) -> None:
+        started = time.perf_counter()
+        now = datetime.utcnow()
+        horizon = now - self.horizon
+        since = horizon if self._since is None else max(horizon, self._since - _REFRESH_OVERLAP)
+        rows = (await session.exec(
+            select(User.id, User.token_version, User.tokens_revoked_at)
+            .where(User.tokens_revoked_at >= since)
+        )).all()
+        for user_id, version, revoked_at in rows:
+            self.revoke(str(user_id), version, revoked_at)
+        with self._lock:
+            for user_id, (_, revoked_at) in list(self._versions.items()):
+                if revoked_at < horizon:
+                    del self._versions[user_id]
+        self._since = now
+        self._refreshed_at = time.monotonic()
+        self.refreshes += 1
+        self.last_refresh_ms = (time.perf_counter() - started) * 1000
+
+    def stats(self) -> dict:
+        return {
+            "revoked_users": len(self._versions),
+            "refresh_seconds": self.refresh_seconds,
+            "refreshes": self.refreshes,
+            "last_refresh_ms": round(self.last_refresh_ms, 2) if self.last_refresh_ms is not None else None,
+        }
+
+
+token_revocations = TokenRevocations(
+    TOKEN_REVOCATION_REFRESH_SECONDS, timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+)
+
+
+_ACCESS_ATTRIBUTES = ("role", "is_active")
+
+
+@event.listens_for(Session, "before_flush")
+def _revoke_on_access_change(session, flush_context, instances):
+    # before_flush, not after_flush: attributes set after the flush would be
+    # marked as persisted without being written.
+    for obj in session.dirty:
+        if not isinstance(obj, User):
+            continue
+        attrs = inspect(obj).attrs
+        if attrs.token_version.history.has_changes():
+            continue  # Already revoked in this flush.
+        if any(getattr(attrs, name).history.has_changes() for name in _ACCESS_ATTRIBUTES):
+            revoke_user_tokens(obj)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_revocations(session, flush_context):
+    for obj in session.dirty:
+        if isinstance(obj, User) and inspect(obj).attrs.token_version.history.has_changes():
+            session.info.setdefault(_PENDING_KEY, {})[str(obj.id)] = (obj.token_version, obj.tokens_revoked_at)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed(session):
+    for user_id, (version, revoked_at) in session.info.pop(_PENDING_KEY, {}).items():
+        token_revocations.revoke(user_id, version, revoked_at)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,111 @@
+# File location: src/app/utils/user_cache.py
+"""
+Per-process cache of authenticated users.
+
+`CurrentUser` is what `get_current_user` / `get_current_admin_user` hand to
+endpoints. For tokens carrying a `ver` claim it is built from the claims
+alone (see `dependencies`); `load_current_user` serves the full snapshot
+(id, role, is_active, display fields) from a bounded TTL cache and only
+queries the database on a miss.
+
+Entries are invalidated after commit whenever a session flushed a change to
+that `User` (suspension, role change, ...) or to their `Profile`; bulk
+UPDATE/DELETE statements on `User` clear the whole cache. Invalidation is
+local to the process, so other workers may serve a stale entry for up to
+USER_CACHE_TTL_SECONDS.
+"""
+import os
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlmodel import Session
+
+from src.app.models.profile import Profile
+from src.app.models.user import User
+from src.app.utils.cache import TTLCache
+
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", 30))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", 10_000))
+
+_PENDING_KEY = "user_cache_invalidate"
+_ALL = "*"
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Read-only view of the authenticated user, safe to share between requests."""
+    id: uuid.UUID
+    email: str
+    role: str
+    is_active: bool
+    full_name: str | None = None
+    avatar_url: str | None = None
+    token_version: int = 0
+
+    @classmethod
+    def from_user(cls, user: User) -> "CurrentUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            is_active=user.is_active,
+            full_name=user.full_name,
+            avatar_url=user.avatar_url,
+            token_version=user.token_version,
+        )
+
+
+user_cache = TTLCache(USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS)
+
+
+async def load_current_user(session, user_id) -> CurrentUser | None:
+    """Cached `session.get(User, user_id)`; None if the user does not exist."""
+    key = str(user_id)
+    current = user_cache.get(key)
+    if current is not None:
+        return current
+    generation = user_cache.generation
+    user = await session.get(User, user_id)
+    if user is None:
+        return None
+    current = CurrentUser.from_user(user)
+    user_cache.set(key, current, generation=generation)
+    return current
+
+
+def _pending(session) -> set:
+    return session.info.setdefault(_PENDING_KEY, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            _pending(session).add(str(obj.id))
+        elif isinstance(obj, Profile):
+            _pending(session).add(str(obj.user_id))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_user_changes(orm_execute_state):
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and (
+        orm_execute_state.bind_mapper is not None and orm_execute_state.bind_mapper.class_ is User
+    ):
+        _pending(orm_execute_state.session).add(_ALL)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    keys = session.info.pop(_PENDING_KEY, None)
+    if not keys:
+        return
+    if _ALL in keys:
+        user_cache.clear()
+    else:
+        user_cache.invalidate(*keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
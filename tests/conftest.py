@@ -0,0 +1,65 @@
+"""
+Shared test setup. The DB layer reads its settings when `src.app` is first
+imported, so they are set here, before any test module imports the app: it
+runs against a throwaway SQLite database, with Google's endpoints served
+in-process by `benchmarks.fake_google`.
+"""
+import asyncio
+import os
+import tempfile
+
+_tmpdir = tempfile.TemporaryDirectory(prefix="app-tests-")
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir.name, 'app.db')}"
+os.environ["DATABASE_REPLICA_URL"] = ""
+os.environ["DB_SERVERLESS"] = "false"
+os.environ["DB_SSLMODE"] = "disable"
+os.environ["APP_ENV"] = "test"
+os.environ["PASSWORD_RESET_PIN_KEY"] = "test-reset-pin-key"
+os.environ["GOOGLE_CLIENT_ID"] = "test-client"
+for _name, _path in (("TOKEN", "token"), ("JWKS", "certs"), ("USERINFO", "userinfo")):
+    os.environ[f"GOOGLE_{_name}_URL"] = f"http://fake-google/{_path}"
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def app():
+    from src.app.db.migrations import run_migrations
+    from src.app.db.session import async_engine, engine
+    from src.app.main import app
+
+    run_migrations(engine)
+    yield app
+    # Pooled aiosqlite connections keep a worker thread alive, blocking exit.
+    asyncio.run(async_engine.dispose())
+    engine.dispose()
+
+
+@pytest.fixture
+async def client(app):
+    import httpx
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+async def fake_google(monkeypatch):
+    """`benchmarks.fake_google` behind the shared OAuth client, with an empty JWKS cache."""
+    import httpx
+
+    from benchmarks import fake_google
+    from src.app.utils import oauth
+
+    fake_google.calls.clear()
+    monkeypatch.setattr(oauth, "google_jwks", oauth.JWKSCache(oauth.GOOGLE_JWKS_URL))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_google.app)) as http_client:
+        oauth.use_http_client(http_client)
+        yield fake_google
+    oauth.use_http_client(None)
@@ -0,0 +1,77 @@
+import asyncio
+import inspect
+import uuid
+
+import pytest
+from sqlmodel import Session
+
+from src.app.controllers import course_controller
+from src.app.models.course import Course
+from src.app.models.enrollment import Enrollment
+from src.app.models.user import User
+from src.app.models.video import Video
+from src.app.utils.security import create_access_token
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def db(app):
+    from src.app.db.session import engine
+
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def enrolled(db):
+    """A student enrolled in a course with one video; `(headers, course, video)`."""
+    student = User(email=f"{uuid.uuid4().hex}@example.com", role="student")
+    course = Course(title=f"Async {uuid.uuid4().hex[:8]}", description="")
+    db.add_all([student, course])
+    db.flush()
+    video = Video(course_id=course.id, youtube_url="https://youtu.be/x", title="Intro")
+    db.add_all([video, Enrollment(user_id=student.id, course_id=course.id, status="approved", is_accessible=True)])
+    db.commit()
+    token = create_access_token({"user_id": str(student.id), "role": "student", "email": student.email, "ver": 0})
+    return {"Cookie": f"access_token={token}"}, course, video
+
+
+def test_hot_student_endpoints_run_on_the_event_loop():
+    for endpoint in (
+        course_controller.get_my_courses,
+        course_controller.get_course_videos_with_checkpoint,
+        course_controller.mark_video_completed,
+    ):
+        assert inspect.iscoroutinefunction(endpoint), endpoint.__name__
+
+
+async def test_my_courses_lists_the_enrollment(client, enrolled):
+    headers, course, _ = enrolled
+
+    response = await client.get("/api/courses/my-courses", headers=headers)
+
+    assert response.status_code == 200
+    assert [c["id"] for c in response.json()] == [str(course.id)]
+
+
+async def test_completion_toggle_commits_through_the_async_session(client, enrolled):
+    headers, course, video = enrolled
+    videos_url = f"/api/courses/my-courses/{course.id}/videos"
+
+    marked = await client.post(f"/api/courses/videos/{video.id}/complete", headers=headers)
+    assert marked.status_code == 200
+    assert [v["watched"] for v in (await client.get(videos_url, headers=headers)).json()] == [True]
+
+    await client.post(f"/api/courses/videos/{video.id}/complete", headers=headers)
+    assert [v["watched"] for v in (await client.get(videos_url, headers=headers)).json()] == [False]
+
+
+async def test_concurrent_requests_share_one_event_loop(client, enrolled):
+    headers, course, _ = enrolled
+
+    responses = await asyncio.gather(
+        *(client.get(f"/api/courses/my-courses/{course.id}/videos", headers=headers) for _ in range(20))
+    )
+
+    assert {response.status_code for response in responses} == {200}
@@ -0,0 +1,95 @@
+import uuid
+
+import pytest
+from sqlmodel import Session
+
+from src.app.models.course import Course
+from src.app.models.user import User
+from src.app.utils.catalog_cache import catalog_cache
+from src.app.utils.security import create_access_token
+
+pytestmark = pytest.mark.anyio
+
+LIST = "/api/courses/explore-courses"
+
+
+@pytest.fixture
+def db(app):
+    from src.app.db.session import engine
+
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def admin_headers(db):
+    admin = User(email=f"{uuid.uuid4().hex}@example.com", role="admin")
+    db.add(admin)
+    db.commit()
+    db.refresh(admin)
+    token = create_access_token({"sub": str(admin.id), "role": "admin", "email": admin.email, "ver": 0})
+    return {"Cookie": f"access_token={token}"}
+
+
+@pytest.fixture
+def level():
+    """A difficulty level of its own, so the listing only shows this test's courses."""
+    return uuid.uuid4().hex
+
+
+async def _titles(client, level):
+    response = await client.get(LIST, params={"difficulty_level": level})
+    assert response.status_code == 200
+    return [course["title"] for course in response.json()]
+
+
+async def _create(client, admin_headers, level, title):
+    response = await client.post(
+        "/api/admin/courses",
+        json={"title": title, "description": "A course about caching", "price": 5, "difficulty_level": level},
+        headers=admin_headers,
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+async def test_admin_writes_are_visible_immediately(client, admin_headers, level):
+    assert await _titles(client, level) == []   # Caches the empty page.
+
+    course_id = await _create(client, admin_headers, level, f"Original {level}")
+    assert await _titles(client, level) == [f"Original {level}"]
+    assert (await client.get(f"{LIST}/{course_id}")).json()["title"] == f"Original {level}"
+
+    await client.put(f"/api/admin/courses/{course_id}", json={"title": f"Renamed {level}"}, headers=admin_headers)
+    assert await _titles(client, level) == [f"Renamed {level}"]
+    assert (await client.get(f"{LIST}/{course_id}")).json()["title"] == f"Renamed {level}"
+
+    assert (await client.delete(f"/api/admin/courses/{course_id}", headers=admin_headers)).status_code == 200
+    assert await _titles(client, level) == []
+    assert (await client.get(f"{LIST}/{course_id}")).status_code == 404
+
+
+async def test_each_admin_write_advances_the_version(client, admin_headers, level):
+    version = catalog_cache.version
+
+    course_id = await _create(client, admin_headers, level, f"Versioned {level}")
+    await client.put(f"/api/admin/courses/{course_id}", json={"price": 7}, headers=admin_headers)
+    await client.delete(f"/api/admin/courses/{course_id}", headers=admin_headers)
+
+    assert catalog_cache.version == version + 3
+
+
+async def test_out_of_band_edit_is_served_from_cache_until_flushed(client, db, admin_headers, level):
+    course = Course(title=f"Cached {level}", description="", difficulty_level=level)
+    db.add(course)
+    db.commit()
+    catalog_cache.bump()
+    assert await _titles(client, level) == [f"Cached {level}"]
+
+    course.title = f"Edited in SQL {level}"
+    db.commit()
+    assert await _titles(client, level) == [f"Cached {level}"]
+
+    flushed = await client.delete("/api/admin/system/catalog-cache", headers=admin_headers)
+    assert flushed.status_code == 200
+    assert await _titles(client, level) == [f"Edited in SQL {level}"]
@@ -0,0 +1,66 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session
+
+from src.app.models.course import Course
+from src.app.utils.catalog_cache import catalog_cache
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def db(app):
+    from src.app.db.session import engine
+
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def courses(db):
+    """Seven courses in their own difficulty level; five share one created_at."""
+    level = uuid.uuid4().hex
+    tied = datetime(2024, 1, 1, 12, 0, 0)
+    created = [tied + timedelta(minutes=1), *([tied] * 5), tied - timedelta(minutes=1)]
+    rows = [Course(title=f"Course {i}", description="", difficulty_level=level, created_at=at) for i, at in enumerate(created)]
+    db.add_all(rows)
+    db.commit()
+    catalog_cache.bump()
+    expected = [str(c.id) for c in sorted(rows, key=lambda c: (c.created_at, c.id), reverse=True)]
+    return level, expected
+
+
+async def test_without_limit_or_cursor_returns_every_course(client, courses):
+    level, expected = courses
+
+    response = await client.get("/api/courses/explore-courses", params={"difficulty_level": level})
+
+    assert response.status_code == 200
+    assert [c["id"] for c in response.json()] == expected
+    assert "x-next-cursor" not in response.headers
+
+
+async def test_cursor_walks_every_course_once_across_tied_created_at(client, courses):
+    level, expected = courses
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"difficulty_level": level, "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/api/courses/explore-courses", params=params)
+        assert response.status_code == 200
+        seen += [c["id"] for c in response.json()]
+        pages += 1
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+
+    assert seen == expected
+    assert pages == 4
+
+
+async def test_invalid_cursor_is_rejected(client):
+    response = await client.get("/api/courses/explore-courses", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
@@ -0,0 +1,83 @@
+import uuid
+
+import pytest
+from sqlmodel import Session
+
+from src.app.models.course import Course
+from src.app.models.user import User
+from src.app.utils.security import create_access_token
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def db(app):
+    from src.app.db.session import engine
+
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def course(db):
+    course = Course(title=f"Caching {uuid.uuid4().hex[:8]}", description="HTTP caching in depth", price=10)
+    db.add(course)
+    db.commit()
+    db.refresh(course)
+    return course
+
+
+@pytest.fixture
+def admin_headers(db):
+    admin = User(email=f"{uuid.uuid4().hex}@example.com", role="admin")
+    db.add(admin)
+    db.commit()
+    db.refresh(admin)
+    token = create_access_token({"sub": str(admin.id), "role": admin.role, "email": admin.email, "ver": 0})
+    return {"Cookie": f"access_token={token}"}
+
+
+def _validators(response):
+    return response.headers["etag"], response.headers["last-modified"]
+
+
+@pytest.mark.parametrize("params", [{}, {"fields": "title,price"}], ids=["full", "fields"])
+async def test_matching_etag_gets_304_with_the_same_validators(client, course, params):
+    url = f"/api/courses/explore-courses/{course.id}"
+    first = await client.get(url, params=params)
+    assert first.status_code == 200
+
+    revalidated = await client.get(url, params=params, headers={"If-None-Match": first.headers["etag"]})
+
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert _validators(revalidated) == _validators(first)
+
+
+async def test_full_and_fields_variants_have_different_etags(client, course):
+    url = f"/api/courses/explore-courses/{course.id}"
+    full = await client.get(url)
+    sparse = await client.get(url, params={"fields": "title,price"})
+
+    assert sparse.json() == {"id": str(course.id), "title": course.title, "price": 10.0}
+    assert full.headers["etag"] != sparse.headers["etag"]
+    # A representation's ETag does not validate the other one.
+    crossed = await client.get(url, params={"fields": "title,price"}, headers={"If-None-Match": full.headers["etag"]})
+    assert crossed.status_code == 200
+
+
+@pytest.mark.parametrize("params", [{}, {"fields": "title,price"}], ids=["full", "fields"])
+async def test_admin_edit_changes_the_etag(client, course, admin_headers, params):
+    url = f"/api/courses/explore-courses/{course.id}"
+    before = await client.get(url, params=params)
+
+    edited = await client.put(
+        f"/api/admin/courses/{course.id}", json={"price": 25}, headers=admin_headers
+    )
+    assert edited.status_code == 200
+
+    after = await client.get(url, params=params, headers={"If-None-Match": before.headers["etag"]})
+    assert after.status_code == 200
+    assert after.headers["etag"] != before.headers["etag"]
+    assert after.json()["price"] == 25
+    assert (await client.get(url, params=params, headers={"If-None-Match": after.headers["etag"]})).status_code == 304
@@ -0,0 +1,41 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlmodel import Session, SQLModel
+
+from src.app.db.course_repository import MARK_START, MARK_STOP, highlight
+from src.app.models.course import Course
+from src.app.utils.catalog_cache import catalog_cache
+from src.app.utils.course_search import search_courses
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def test_fallback_snippet_escapes_course_text(session):
+    session.add(Course(
+        title="Web security",
+        description='Stop <script>alert("xss")</script> attacks & learn security headers',
+    ))
+    session.commit()
+    catalog_cache.bump()   # Rebuilds the search index.
+
+    [hit] = search_courses(session, "security")
+
+    assert "<script>" not in hit.snippet
+    assert "&lt;script&gt;alert(&quot;xss&quot;)&lt;/script&gt;" in hit.snippet
+    assert "&amp; learn <mark>security</mark> headers" in hit.snippet
+
+
+def test_postgres_snippet_is_escaped_around_the_match_markers():
+    snippet = f'<b onclick="x()">{MARK_START}Python{MARK_STOP}</b> & {MARK_START}SQL{MARK_STOP}'
+
+    assert highlight(snippet) == (
+        "&lt;b onclick=&quot;x()&quot;&gt;<mark>Python</mark>&lt;/b&gt; &amp; <mark>SQL</mark>"
+    )
+    assert highlight(None) == ""
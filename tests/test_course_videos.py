@@ -0,0 +1,129 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session
+
+from src.app.db.video_repository import course_videos_with_progress
+from src.app.models.course import Course
+from src.app.models.enrollment import Enrollment
+from src.app.models.user import User
+from src.app.models.video import Video
+from src.app.models.video_progress import VideoProgress
+from src.app.utils.security import create_access_token
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def db(app):
+    from src.app.db.session import engine
+
+    with Session(engine) as session:
+        yield session
+
+
+def _student(db):
+    user = User(email=f"{uuid.uuid4().hex}@example.com", role="student")
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def _course(db, videos=2):
+    course = Course(title=f"Videos {uuid.uuid4().hex[:8]}", description="")
+    db.add(course)
+    db.flush()
+    db.add_all(
+        Video(course_id=course.id, youtube_url=f"https://youtu.be/{i}", title=f"Part {i}", position=i)
+        for i in range(videos)
+    )
+    db.commit()
+    db.refresh(course)
+    return course
+
+
+def _enroll(db, user, course, **fields):
+    values = {"status": "approved", "is_accessible": True, **fields}
+    db.add(Enrollment(user_id=user.id, course_id=course.id, **values))
+    db.commit()
+
+
+def _watched(db, user, video):
+    db.add(VideoProgress(user_id=user.id, video_id=video.id, completed=True))
+    db.commit()
+
+
+def _headers(user):
+    token = create_access_token({"user_id": str(user.id), "role": user.role, "email": user.email, "ver": 0})
+    return {"Cookie": f"access_token={token}"}
+
+
+def _videos(course):
+    return sorted(course.videos, key=lambda video: video.position)
+
+
+async def _rows(user, course):
+    from src.app.db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        return await course_videos_with_progress(session, user.id, course.id)
+
+
+@pytest.mark.parametrize(
+    "enrollment",
+    [
+        None,
+        {"status": "pending", "is_accessible": False},
+        {"expiration_date": datetime.utcnow() - timedelta(days=1)},
+        {"is_accessible": False},
+    ],
+    ids=["unenrolled", "pending", "expired", "inaccessible"],
+)
+async def test_students_without_access_get_403(client, db, enrollment):
+    student, course = _student(db), _course(db)
+    if enrollment is not None:
+        _enroll(db, student, course, **enrollment)
+
+    response = await client.get(f"/api/courses/my-courses/{course.id}/videos", headers=_headers(student))
+
+    assert response.status_code == 403
+    assert await _rows(student, course) is None
+
+
+async def test_enrolled_student_with_no_videos_gets_an_empty_list(db):
+    student, course = _student(db), _course(db, videos=0)
+    _enroll(db, student, course)
+
+    assert await _rows(student, course) == []
+
+
+async def test_completed_flags_belong_to_the_requesting_user(client, db):
+    ada, bob, course = _student(db), _student(db), _course(db)
+    first, second = _videos(course)
+    for student in (ada, bob):
+        _enroll(db, student, course)
+    _watched(db, ada, first)
+    _watched(db, bob, second)
+
+    for student, expected in ((ada, [True, False]), (bob, [False, True])):
+        response = await client.get(f"/api/courses/my-courses/{course.id}/videos", headers=_headers(student))
+        assert response.status_code == 200
+        assert [video["id"] for video in response.json()] == [str(first.id), str(second.id)]
+        assert [video["watched"] for video in response.json()] == expected
+
+
+async def test_cached_statement_is_rebound_for_each_user_and_course(db):
+    ada, bob = _student(db), _student(db)
+    course_a, course_b = _course(db, videos=1), _course(db, videos=3)
+    _enroll(db, ada, course_a)
+    _enroll(db, bob, course_b)
+    _watched(db, ada, _videos(course_a)[0])
+
+    # Alternate users and courses so every call reuses the cached lambda statement.
+    for _ in range(2):
+        assert [row.watched for row in await _rows(ada, course_a)] == [True]
+        assert [row.watched for row in await _rows(bob, course_b)] == [False, False, False]
+        assert await _rows(ada, course_b) is None
+        assert await _rows(bob, course_a) is None
@@ -0,0 +1,66 @@
+import time
+
+import pytest
+from jose import jwt
+
+from src.app.utils import oauth
+from src.app.utils.oauth import GoogleIdTokenError, verify_google_id_token
+
+pytestmark = pytest.mark.anyio
+
+
+def _id_token(fake_google, kid=None, **claims):
+    now = int(time.time())
+    claims = {
+        "sub": "1234", "email": "ada@example.com", "email_verified": True, "name": "Ada",
+        "iss": fake_google.ISSUER, "aud": oauth.GOOGLE_CLIENT_ID, "iat": now, "exp": now + 600,
+        **claims,
+    }
+    return jwt.encode(claims, fake_google._signing_key, algorithm="RS256", headers={"kid": kid or fake_google.KEY_ID})
+
+
+async def test_callback_signs_in_with_the_verified_id_token(client, fake_google):
+    response = await client.get("/api/auth/api/auth/google/callback", params={"code": "ada.oauth@example.com"})
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["email"] == "ada.oauth@example.com"
+    assert body["access_token"] == response.cookies["access_token"]
+    assert fake_google.calls == {"token": 1, "certs": 1}   # No userinfo round trip.
+
+
+@pytest.mark.parametrize("claims", [{"aud": "someone-else"}, {"iss": "https://evil.example.com"}])
+async def test_id_token_for_another_audience_or_issuer_is_rejected(fake_google, claims):
+    with pytest.raises(GoogleIdTokenError, match="Invalid id_token"):
+        await verify_google_id_token(_id_token(fake_google, **claims))
+
+
+async def test_unverified_email_is_rejected(fake_google):
+    with pytest.raises(GoogleIdTokenError, match="not verified"):
+        await verify_google_id_token(_id_token(fake_google, email_verified=False))
+
+
+async def test_unknown_kid_refetches_the_keys_once(fake_google):
+    await verify_google_id_token(_id_token(fake_google))
+    oauth.google_jwks._fetched_at -= oauth._JWKS_MIN_REFRESH_SECONDS   # Past the refresh throttle.
+
+    for _ in range(3):
+        with pytest.raises(GoogleIdTokenError, match="Unknown signing key"):
+            await verify_google_id_token(_id_token(fake_google, kid="rotated-key"))
+
+    assert fake_google.calls["certs"] == 2
+    await verify_google_id_token(_id_token(fake_google))
+    assert fake_google.calls["certs"] == 2
+
+
+async def test_keys_are_cached_for_the_max_age(fake_google):
+    for _ in range(3):
+        await verify_google_id_token(_id_token(fake_google))
+
+    jwks = oauth.google_jwks
+    assert fake_google.calls["certs"] == 1
+    assert jwks._expires_at - jwks._fetched_at == pytest.approx(3600)   # Cache-Control: max-age=3600 from /certs.
+
+    jwks._expires_at = time.monotonic() - 1
+    await verify_google_id_token(_id_token(fake_google))
+    assert fake_google.calls["certs"] == 2
@@ -0,0 +1,81 @@
+import json
+import logging
+import queue
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from src.app.config.logging_config import JsonFormatter, _parse_levels, _QueueHandler
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _record(msg="Slow query (%.1f ms)", args=(250.0,), exc_info=None, **extra):
+    record = logging.LogRecord("src.app.db.slow_query", logging.WARNING, __file__, 1, msg, args, exc_info)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_record_shape_includes_extra_fields():
+    entry = json.loads(JsonFormatter().format(_record(route="GET /api/courses", duration_ms=250.0)))
+
+    assert set(entry) == {"ts", "level", "logger", "message", "route", "duration_ms"}
+    assert entry["ts"].endswith("+00:00")
+    assert (entry["level"], entry["logger"]) == ("WARNING", "src.app.db.slow_query")
+    assert entry["message"] == "Slow query (250.0 ms)"
+    assert (entry["route"], entry["duration_ms"]) == ("GET /api/courses", 250.0)
+
+
+def test_unserializable_extra_values_are_stringified():
+    entry = json.loads(JsonFormatter().format(_record(path=Path("/tmp/x"))))
+
+    assert entry["path"] == "/tmp/x"
+
+
+def test_queued_record_carries_its_traceback_as_text():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = _record("Import failed for %s", ("rows 1-500",), exc_info=sys.exc_info())
+    log_queue = queue.SimpleQueue()
+
+    _QueueHandler(log_queue).emit(record)
+    queued = log_queue.get_nowait()
+
+    assert (queued.msg, queued.args, queued.exc_info) == ("Import failed for rows 1-500", None, None)
+    entry = json.loads(JsonFormatter().format(queued))
+    assert entry["message"] == "Import failed for rows 1-500"
+    assert "ValueError: boom" in entry["exc_info"]
+
+
+def test_log_levels_spec_is_parsed():
+    assert _parse_levels(" src.app.db.slow_query=warning, httpx=DEBUG ,") == {
+        "src.app.db.slow_query": "WARNING",
+        "httpx": "DEBUG",
+    }
+
+
+def test_listener_flushes_queued_records_on_shutdown(tmp_path):
+    log_file = tmp_path / "app.log"
+    script = textwrap.dedent("""
+        import logging
+        from src.app.config.logging_config import setup_logging
+
+        setup_logging()
+        setup_logging()   # A second call must not add another listener.
+        for i in range(500):
+            logging.getLogger("app.test").info("record %d", i, extra={"n": i})
+    """)
+    subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT,
+        env={"LOG_FILE": str(log_file), "LOG_FORMAT": "json", "LOG_LEVEL": "INFO", "PATH": ""},
+        capture_output=True,
+        check=True,
+        timeout=30,
+    )
+
+    entries = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert [entry["n"] for entry in entries] == list(range(500))
+    assert entries[-1]["message"] == "record 499"
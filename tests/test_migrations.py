@@ -0,0 +1,137 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import MetaData, UniqueConstraint, create_engine, func, inspect, select
+from sqlmodel import SQLModel
+
+from src.app.db.migrations import discover, m0002_hot_path_indexes, run_migrations, schema_migrations
+from src.app.db.migrations.ops import MigrationError
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+def _unique_keys(engine, table):
+    inspector = inspect(engine)
+    keys = [tuple(c["column_names"]) for c in inspector.get_unique_constraints(table)]
+    keys += [tuple(i["column_names"]) for i in inspector.get_indexes(table) if i["unique"]]
+    return keys
+
+
+def _legacy_metadata():
+    """The tables as they were before 0002: no unique constraints."""
+    metadata = MetaData()
+    for table in SQLModel.metadata.tables.values():
+        table = table.to_metadata(metadata)
+        table.constraints = {c for c in table.constraints if not isinstance(c, UniqueConstraint)}
+    return metadata
+
+
+def test_migrations_apply_once_and_are_recorded(engine):
+    versions = [migration.VERSION for migration in discover()]
+
+    assert run_migrations(engine) == versions
+    assert run_migrations(engine) == []
+
+    with engine.connect() as conn:
+        recorded = dict(conn.execute(select(schema_migrations.c.version, schema_migrations.c.description)).all())
+    assert recorded == {migration.VERSION: migration.DESCRIPTION for migration in discover()}
+
+
+def test_fresh_schema_has_each_index_and_constraint_once(engine):
+    run_migrations(engine)
+
+    inspector = inspect(engine)
+    for name, table, columns in m0002_hot_path_indexes.INDEXES:
+        assert name in {index["name"] for index in inspector.get_indexes(table)}
+    for name, table, columns in m0002_hot_path_indexes.UNIQUE_CONSTRAINTS:
+        assert _unique_keys(engine, table).count(tuple(columns)) == 1, table
+
+
+def test_duplicates_are_removed_before_adding_constraints(engine):
+    legacy = _legacy_metadata()
+    legacy.create_all(engine)
+    t = legacy.tables
+    user, quiz, video, course = (uuid.uuid4() for _ in range(4))
+    first_attempt = uuid.uuid4()
+    started = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(t["videoprogress"].insert(), [
+            {"id": uuid.uuid4(), "user_id": user, "video_id": video, "completed": False},
+            {"id": (watched := uuid.uuid4()), "user_id": user, "video_id": video, "completed": True},
+            {"id": uuid.uuid4(), "user_id": user, "video_id": video, "completed": False},
+        ])
+        conn.execute(t["quizsubmission"].insert(), [
+            {"id": uuid.uuid4(), "quiz_id": quiz, "student_id": user, "submitted_at": started + timedelta(seconds=1)},
+            {"id": first_attempt, "quiz_id": quiz, "student_id": user, "submitted_at": started},
+        ])
+        conn.execute(t["answer"].insert(), [
+            {"id": uuid.uuid4(), "submission_id": submission_id, "question_id": uuid.uuid4()}
+            for (submission_id,) in conn.execute(select(t["quizsubmission"].c.id))
+        ])
+        conn.execute(t["courseprogress"].insert(), [
+            {"id": uuid.uuid4(), "user_id": user, "course_id": course, "completed": False, "progress_percentage": 10.0},
+            {"id": (furthest := uuid.uuid4()), "user_id": user, "course_id": course, "completed": False,
+             "progress_percentage": 80.0},
+        ])
+
+    run_migrations(engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(select(t["videoprogress"].c.id)).scalars().all() == [watched]
+        assert conn.execute(select(t["quizsubmission"].c.id)).scalars().all() == [first_attempt]
+        assert conn.execute(select(t["answer"].c.submission_id)).scalars().all() == [first_attempt]
+        assert conn.execute(select(t["courseprogress"].c.id)).scalars().all() == [furthest]
+    for name, table, columns in m0002_hot_path_indexes.UNIQUE_CONSTRAINTS:
+        assert _unique_keys(engine, table).count(tuple(columns)) == 1, table
+    assert run_migrations(engine) == []
+
+
+def test_oauth_duplicates_keep_the_most_complete_rows(engine):
+    legacy = _legacy_metadata()
+    legacy.create_all(engine)
+    t = legacy.tables
+    user = uuid.uuid4()
+    with engine.begin() as conn:
+        conn.execute(t["profile"].insert(), [
+            {"id": uuid.uuid4(), "user_id": user, "full_name": "Ada", "avatar_url": None},
+            {"id": (complete := uuid.uuid4()), "user_id": user, "full_name": "Ada", "avatar_url": "a.png"},
+            {"id": uuid.uuid4(), "user_id": user, "full_name": None, "avatar_url": None},
+        ])
+        conn.execute(t["oauthaccount"].insert(), [
+            {"id": uuid.uuid4(), "user_id": user, "provider": "google", "provider_account_id": "1",
+             "expires_at": datetime(2024, 1, 1), "refresh_token": "r"},
+            {"id": (latest := uuid.uuid4()), "user_id": user, "provider": "google", "provider_account_id": "1",
+             "expires_at": datetime(2024, 2, 1), "refresh_token": "r"},
+            {"id": uuid.uuid4(), "user_id": user, "provider": "google", "provider_account_id": "1",
+             "expires_at": datetime(2024, 3, 1), "refresh_token": None},
+        ])
+
+    run_migrations(engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(select(t["profile"].c.id)).scalars().all() == [complete]
+        assert conn.execute(select(t["oauthaccount"].c.id)).scalars().all() == [latest]
+
+
+def test_provider_account_linked_to_two_users_is_refused(engine, caplog):
+    legacy = _legacy_metadata()
+    legacy.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(legacy.tables["oauthaccount"].insert(), [
+            {"id": uuid.uuid4(), "user_id": uuid.uuid4(), "provider": "google", "provider_account_id": "1"},
+            {"id": uuid.uuid4(), "user_id": uuid.uuid4(), "provider": "google", "provider_account_id": "1"},
+        ])
+
+    with pytest.raises(MigrationError):
+        run_migrations(engine)
+
+    assert "google account 1 is linked to more than one user" in caplog.text
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(legacy.tables["oauthaccount"])).scalar() == 2
+        assert "0005" not in set(conn.execute(select(schema_migrations.c.version)).scalars())
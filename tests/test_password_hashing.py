@@ -0,0 +1,73 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from src.app.utils import password_hashing
+from src.app.utils.password_hashing import PasswordHasher
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def blocked_hash(monkeypatch):
+    """Make `hash_password` wait for the returned event; records the threads it ran on."""
+    release, threads = threading.Event(), []
+
+    def slow_hash(password):
+        threads.append(threading.current_thread().name)
+        release.wait(5)
+        return f"hashed:{password}"
+
+    monkeypatch.setattr(password_hashing, "hash_password", slow_hash)
+    yield release, threads
+    release.set()
+
+
+async def test_calls_beyond_max_pending_fail_fast_with_503(blocked_hash):
+    release, threads = blocked_hash
+    hasher = PasswordHasher(workers=1, max_pending=2)
+    running = [asyncio.create_task(hasher.hash(p)) for p in ("a", "b")]
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(HTTPException) as rejected:
+        await hasher.hash("c")
+    assert rejected.value.status_code == 503
+    assert rejected.value.headers == {"Retry-After": "1"}
+    assert (hasher.pending, hasher.rejected) == (2, 1)
+
+    release.set()
+    assert await asyncio.gather(*running) == ["hashed:a", "hashed:b"]
+    stats = hasher.stats()
+    assert (stats["pending"], stats["completed"], stats["max_pending_seen"]) == (0, 2, 2)
+    assert threads and all(name.startswith("bcrypt") for name in threads)
+
+
+async def test_pool_runs_at_most_workers_hashes_at_once(blocked_hash):
+    release, threads = blocked_hash
+    hasher = PasswordHasher(workers=2, max_pending=10)
+    running = [asyncio.create_task(hasher.hash(str(i))) for i in range(5)]
+    await asyncio.sleep(0.05)
+
+    assert (len(threads), hasher.pending) == (2, 5)
+
+    release.set()
+    await asyncio.gather(*running)
+    assert len(threads) == 5
+
+
+async def test_bulk_hashing_is_not_limited_by_max_pending(blocked_hash):
+    release, _ = blocked_hash
+    release.set()
+    hasher = PasswordHasher(workers=2, max_pending=0)
+
+    assert await hasher.hash_many(["a", "b", "c"]) == ["hashed:a", "hashed:b", "hashed:c"]
+    assert hasher.stats()["completed"] == 3
+
+
+async def test_account_without_password_is_not_queued():
+    hasher = PasswordHasher(workers=1, max_pending=0)
+
+    assert await hasher.verify_and_update("secret", None) == (False, None)
+    assert hasher.rejected == 0
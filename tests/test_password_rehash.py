@@ -0,0 +1,79 @@
+import uuid
+
+import pytest
+from passlib.hash import bcrypt
+from sqlmodel import Session
+
+from src.app.models.user import User
+from src.app.utils.security import BCRYPT_ROUNDS, verify_password
+
+pytestmark = pytest.mark.anyio
+
+PASSWORD = "correct horse battery"
+
+
+@pytest.fixture
+def db(app):
+    from src.app.db.session import engine
+
+    with Session(engine) as session:
+        yield session
+
+
+def _user(db, rounds, role="student"):
+    user = User(
+        email=f"{uuid.uuid4().hex}@example.com",
+        role=role,
+        hashed_password=bcrypt.using(rounds=rounds).hash(PASSWORD),
+    )
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def _rounds(hashed: str) -> int:
+    return int(hashed.split("$")[2])
+
+
+async def _login(client, user, password=PASSWORD, path="/api/auth/api/auth/token"):
+    return await client.post(path, data={"username": user.email, "password": password})
+
+
+async def test_login_upgrades_a_hash_made_with_an_old_cost(client, db):
+    user = _user(db, rounds=4)
+
+    assert (await _login(client, user)).status_code == 200
+
+    db.refresh(user)
+    assert _rounds(user.hashed_password) == BCRYPT_ROUNDS
+    assert verify_password(PASSWORD, user.hashed_password)
+
+
+async def test_admin_login_upgrades_the_hash_too(client, db):
+    admin = _user(db, rounds=4, role="admin")
+
+    assert (await _login(client, admin, path="/api/auth/api/auth/admin-login")).status_code == 200
+
+    db.refresh(admin)
+    assert _rounds(admin.hashed_password) == BCRYPT_ROUNDS
+
+
+async def test_failed_login_leaves_the_hash_alone(client, db):
+    user = _user(db, rounds=4)
+    before = user.hashed_password
+
+    assert (await _login(client, user, "wrong password")).status_code == 401
+
+    db.refresh(user)
+    assert user.hashed_password == before
+
+
+async def test_current_cost_hash_is_not_rewritten(client, db):
+    user = _user(db, rounds=BCRYPT_ROUNDS)
+    before = user.hashed_password
+
+    assert (await _login(client, user)).status_code == 200
+
+    db.refresh(user)
+    assert user.hashed_password == before
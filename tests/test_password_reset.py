@@ -0,0 +1,117 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session
+
+from src.app.controllers import auth_controller
+from src.app.models.password_reset import PasswordReset
+from src.app.models.user import User
+from src.app.utils import security
+from src.app.utils.security import hash_reset_pin, verify_password
+
+pytestmark = pytest.mark.anyio
+
+FORGOT = "/api/auth/api/auth/forgot-password"
+RESET = "/api/auth/api/auth/reset-password"
+
+
+@pytest.fixture
+def db(app):
+    from src.app.db.session import engine
+
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def user(db):
+    user = User(email=f"{uuid.uuid4().hex}@example.com", role="student")
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+@pytest.fixture
+def sent_pins(monkeypatch):
+    sent = {}
+    monkeypatch.setattr(auth_controller, "send_reset_pin_email", lambda email, pin: sent.__setitem__(email, pin))
+    return sent
+
+
+def _pin(db, user, pin, **fields):
+    db.add(PasswordReset(user_id=user.id, pin_hash=hash_reset_pin(pin), **fields))
+    db.commit()
+
+
+async def _reset(client, user, pin, password="n3w-Passw0rd"):
+    return await client.post(RESET, json={"email": user.email, "pin": pin, "new_password": password})
+
+
+async def test_emailed_pin_resets_the_password_once(client, db, user, sent_pins):
+    response = await client.post(FORGOT, json={"email": user.email})
+    assert response.json()["status"] == "sent"
+    pin = sent_pins[user.email]
+
+    assert (await _reset(client, user, pin)).status_code == 200
+    db.refresh(user)
+    assert verify_password("n3w-Passw0rd", user.hashed_password)
+
+    again = await _reset(client, user, pin, "an0ther-Passw0rd")
+    assert again.status_code == 400
+    assert "already been used" in again.json()["detail"]
+
+
+async def test_wrong_pin_is_rejected(client, db, user):
+    _pin(db, user, "123456")
+
+    response = await _reset(client, user, "654321")
+
+    assert response.status_code == 400
+    assert "Invalid PIN" in response.json()["detail"]
+
+
+async def test_expired_pin_is_rejected(client, db, user):
+    _pin(db, user, "123456", expires_at=datetime.utcnow() - timedelta(minutes=1))
+
+    response = await _reset(client, user, "123456")
+
+    assert response.status_code == 400
+    assert "expired" in response.json()["detail"]
+    db.refresh(user)
+    assert user.hashed_password is None
+
+
+async def test_reset_attempts_are_rate_limited_per_account(client, db, user):
+    _pin(db, user, "123456")
+    for _ in range(auth_controller.PASSWORD_RESET_MAX_ATTEMPTS):
+        assert (await _reset(client, user, "000000")).status_code == 400
+
+    blocked = await _reset(client, user, "123456")   # Even the right PIN is refused once the window is full.
+
+    assert blocked.status_code == 429
+    assert int(blocked.headers["retry-after"]) >= 1
+    auth_controller.reset_password_limiter.reset(user.email.lower())
+    assert (await _reset(client, user, "123456")).status_code == 200
+
+
+async def test_forgot_password_requests_are_rate_limited(client, user, sent_pins):
+    for _ in range(auth_controller.FORGOT_PASSWORD_MAX_REQUESTS):
+        assert (await client.post(FORGOT, json={"email": user.email})).status_code == 200
+
+    assert (await client.post(FORGOT, json={"email": user.email.upper()})).status_code == 429
+
+
+def test_production_requires_a_dedicated_pin_key(monkeypatch):
+    monkeypatch.delenv("PASSWORD_RESET_PIN_KEY")
+    monkeypatch.setenv("APP_ENV", "production")
+    with pytest.raises(RuntimeError, match="PASSWORD_RESET_PIN_KEY"):
+        security._reset_pin_key()
+
+    monkeypatch.setenv("APP_ENV", "development")
+    assert security._reset_pin_key() == security.SECRET_KEY
+
+    monkeypatch.setenv("PASSWORD_RESET_PIN_KEY", "dedicated")
+    monkeypatch.setenv("APP_ENV", "production")
+    assert security._reset_pin_key() == "dedicated"
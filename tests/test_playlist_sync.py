@@ -0,0 +1,133 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlmodel import Session, select
+
+from src.app.db.video_repository import PlaylistChanges, PlaylistSyncError, _diff_playlist, sync_playlist
+from src.app.models.course import Course
+from src.app.models.course_progress import CourseProgress
+from src.app.models.user import User
+from src.app.models.video import Video
+from src.app.models.video_progress import VideoProgress
+from src.app.schemas.video import PlaylistVideo
+
+pytestmark = pytest.mark.anyio
+
+COURSE_ID = uuid.uuid4()
+
+
+def _current(count=3):
+    rows = [
+        SimpleNamespace(id=uuid.uuid4(), youtube_url=f"https://youtu.be/{i}", title=f"Video {i}", description=None,
+                        position=i)
+        for i in range(count)
+    ]
+    return {row.id: row for row in rows}, rows
+
+
+def test_reorder_only_moves_without_updating():
+    current, (a, b, c) = _current()
+    changes = PlaylistChanges()
+
+    inserts, updates, deleted = _diff_playlist(
+        COURSE_ID, current, [PlaylistVideo(id=c.id), PlaylistVideo(id=a.id), PlaylistVideo(id=b.id)], changes
+    )
+
+    assert (inserts, deleted) == ([], [])
+    assert {(u["b_id"], u["b_position"]) for u in updates} == {(c.id, 0), (a.id, 1), (b.id, 2)}
+    assert all(u["b_youtube_url"] == current[u["b_id"]].youtube_url for u in updates)
+    assert (changes.updated, changes.moved) == (0, 3)
+
+
+def test_partial_update_keeps_fields_that_were_not_sent():
+    current, (a, b) = _current(2)
+    changes = PlaylistChanges()
+
+    _, updates, _ = _diff_playlist(
+        COURSE_ID, current, [PlaylistVideo(id=a.id, title="Renamed"), PlaylistVideo(id=b.id)], changes
+    )
+
+    assert updates == [{
+        "b_id": a.id, "b_position": 0, "b_youtube_url": a.youtube_url, "b_title": "Renamed", "b_description": None,
+    }]
+    assert (changes.updated, changes.moved) == (1, 0)
+
+
+def test_duplicate_id_is_rejected():
+    current, (a, b) = _current(2)
+
+    with pytest.raises(PlaylistSyncError, match="more than once"):
+        _diff_playlist(COURSE_ID, current, [PlaylistVideo(id=a.id), PlaylistVideo(id=a.id)], PlaylistChanges())
+
+
+def test_video_of_another_course_is_rejected():
+    current, _ = _current(2)
+
+    with pytest.raises(PlaylistSyncError, match="does not belong"):
+        _diff_playlist(COURSE_ID, current, [PlaylistVideo(id=uuid.uuid4())], PlaylistChanges())
+
+
+@pytest.fixture
+def db(app):
+    from src.app.db.session import engine
+
+    with Session(engine) as session:
+        yield session
+
+
+def _course_with_videos(db, count=3):
+    course = Course(title="Playlist", description="Playlist test course")
+    db.add(course)
+    db.flush()
+    videos = [Video(course_id=course.id, youtube_url=f"https://youtu.be/{i}", position=i) for i in range(count)]
+    db.add_all(videos)
+    db.commit()
+    return course, videos
+
+
+async def _sync(course_id, items):
+    from src.app.db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        return await sync_playlist(session, course_id, items)
+
+
+async def test_deleting_the_preview_and_last_accessed_video(db):
+    course, (first, second, third) = _course_with_videos(db)
+    user = User(email=f"{uuid.uuid4().hex}@example.com")
+    db.add(user)
+    db.flush()
+    course.preview_video_id = first.id
+    db.add(CourseProgress(user_id=user.id, course_id=course.id, last_accessed_video_id=first.id))
+    db.add(VideoProgress(user_id=user.id, video_id=first.id, completed=True))
+    db.commit()
+    course_id, first_id, second_id, third_id = course.id, first.id, second.id, third.id
+
+    changes = await _sync(course_id, [PlaylistVideo(id=third_id), PlaylistVideo(id=second_id)])
+
+    assert changes == PlaylistChanges(inserted=0, updated=0, moved=1, deleted=1)   # second stays at 1.
+    db.expire_all()
+    assert db.get(Course, course_id).preview_video_id is None
+    assert db.exec(select(CourseProgress.last_accessed_video_id).where(CourseProgress.course_id == course_id)).all() == [None]
+    assert db.exec(select(VideoProgress).where(VideoProgress.video_id == first_id)).all() == []
+    assert db.exec(
+        select(Video.id).where(Video.course_id == course_id).order_by(Video.position)
+    ).all() == [third_id, second_id]
+
+
+async def test_rejected_sync_changes_nothing(db):
+    course, videos = _course_with_videos(db, 2)
+    _, other_videos = _course_with_videos(db, 1)
+
+    for items in (
+        [PlaylistVideo(id=videos[0].id), PlaylistVideo(id=videos[0].id)],
+        [PlaylistVideo(id=videos[1].id), PlaylistVideo(id=other_videos[0].id)],
+    ):
+        with pytest.raises(PlaylistSyncError):
+            await _sync(course.id, items)
+
+    db.expire_all()
+    assert db.exec(
+        select(Video.id).where(Video.course_id == course.id).order_by(Video.position)
+    ).all() == [video.id for video in videos]
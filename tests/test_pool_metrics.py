@@ -0,0 +1,96 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import QueuePool
+from sqlmodel import Session
+
+from src.app.db.pool_metrics import PoolMetrics
+from src.app.models.user import User
+from src.app.utils.security import create_access_token
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def db(app):
+    from src.app.db.session import engine
+
+    with Session(engine) as session:
+        yield session
+
+
+def _headers(db, role, subject_claim):
+    user = User(email=f"{uuid.uuid4().hex}@example.com", role=role)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    token = create_access_token({subject_claim: str(user.id), "role": role, "email": user.email, "ver": 0})
+    return {"Cookie": f"access_token={token}"}
+
+
+@pytest.fixture
+def metered_engine(tmp_path):
+    metrics = PoolMetrics(f"test-{uuid.uuid4().hex[:8]}")
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=metrics.pool_class(QueuePool),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    metrics.attach(engine)
+    yield engine, metrics
+    engine.dispose()
+
+
+def test_snapshot_reports_checkouts_waits_and_timeouts(metered_engine):
+    engine, metrics = metered_engine
+
+    with engine.connect() as held:
+        held.execute(text("SELECT 1"))
+        busy = metrics.snapshot()
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+    idle = metrics.snapshot()
+
+    assert (busy["pool_size"], busy["max_overflow"], busy["checked_out"]) == (1, 0, 1)
+    assert (idle["checked_out"], idle["checked_in"]) == (0, 1)
+    assert idle["connections_opened"] == 1
+    assert idle["checkout_timeouts"] == 1
+    assert idle["checkout_wait"]["count"] == 2
+    assert sum(idle["checkout_wait"]["histogram"].values()) == 2
+    assert idle["checkout_wait"]["max_ms"] >= 50
+
+
+def test_metrics_survive_pool_recreate(metered_engine):
+    engine, metrics = metered_engine
+    engine.dispose()
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    assert metrics.snapshot()["checkout_wait"]["count"] == 1
+
+
+def test_only_pre_ping_errors_count_as_pre_ping_failures(metered_engine):
+    _, metrics = metered_engine
+
+    metrics._on_error(SimpleNamespace(is_pre_ping=False))
+    metrics._on_error(SimpleNamespace(is_pre_ping=True))
+
+    assert metrics.snapshot()["pre_ping_failures"] == 1
+
+
+async def test_endpoint_is_admin_only_and_lists_every_engine(client, db):
+    url = "/api/admin/system/db-pool"
+    assert (await client.get(url)).status_code == 401
+    assert (await client.get(url, headers=_headers(db, "student", "sub"))).status_code == 403
+
+    response = await client.get(url, headers=_headers(db, "admin", "sub"))
+
+    assert response.status_code == 200
+    pools = response.json()
+    assert {"primary", "primary_async"} <= set(pools)
+    assert {"checked_out", "overflow", "checkout_wait", "pre_ping_failures"} <= set(pools["primary"])
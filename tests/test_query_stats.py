@@ -0,0 +1,78 @@
+import logging
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from src.app.db import query_stats
+from src.app.db.query_stats import QueryStatsMiddleware, RequestQueryStats
+
+pytestmark = pytest.mark.anyio
+
+
+def test_statement_is_flagged_from_the_threshold_on():
+    stats = RequestQueryStats(track_shapes=True)
+    for _ in range(4):
+        stats.record("SELECT * FROM option WHERE id = ?", 1.0)
+    stats.record("SELECT * FROM quiz WHERE id = ?", 1.0)
+
+    assert stats.repeated_statements(threshold=5) == []
+    stats.record("SELECT * FROM option WHERE id = ?", 1.0)
+    assert stats.repeated_statements(threshold=5) == [("SELECT * FROM option WHERE id = ?", 5)]
+    assert (stats.count, stats.total_ms) == (6, 6.0)
+
+
+def test_shapes_are_not_tracked_outside_development():
+    stats = RequestQueryStats(track_shapes=False)
+    for _ in range(10):
+        stats.record("SELECT 1", 0.5)
+
+    assert stats.repeated_statements(threshold=5) == []
+    assert stats.count == 10
+
+
+def _app(queries: int):
+    from src.app.db.session import engine
+
+    async def loop(request):
+        with engine.connect() as conn:
+            for i in range(queries):
+                conn.execute(text("SELECT :i"), {"i": i})
+        return PlainTextResponse("ok")
+
+    return QueryStatsMiddleware(Starlette(routes=[Route("/loop", loop)]))
+
+
+async def _get(queries: int):
+    async with AsyncClient(transport=ASGITransport(app=_app(queries)), base_url="http://test") as client:
+        return await client.get("/loop")
+
+
+THRESHOLD = query_stats.N_PLUS_ONE_THRESHOLD
+
+
+@pytest.mark.parametrize("queries, flagged", [(THRESHOLD - 1, False), (THRESHOLD, True)])
+async def test_middleware_reports_queries_and_flags_n_plus_one_in_development(
+    app, monkeypatch, caplog, queries, flagged
+):
+    monkeypatch.setattr(query_stats, "DEV_MODE", True)
+
+    with caplog.at_level(logging.WARNING, logger=query_stats.__name__):
+        response = await _get(queries)
+
+    timing = response.headers.get_list("server-timing")
+    assert timing[0].startswith("db;dur=") and timing[0].endswith(f'desc="{queries} queries"')
+    assert any("n-plus-one" in entry for entry in timing) is flagged
+    assert any("Suspected N+1 on GET /loop" in r.getMessage() for r in caplog.records) is flagged
+
+
+async def test_production_reports_timing_without_n_plus_one(app, monkeypatch):
+    monkeypatch.setattr(query_stats, "DEV_MODE", False)
+
+    response = await _get(20)
+
+    assert response.headers.get_list("server-timing") == [response.headers["server-timing"]]
+    assert response.headers["server-timing"].endswith('desc="20 queries"')
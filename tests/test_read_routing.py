@@ -0,0 +1,96 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, insert, select
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from src.app.db.routing import (
+    WRITE_COOKIE,
+    ReadYourWrites,
+    ReadYourWritesMiddleware,
+    ReplicaHealth,
+    RoutingSession,
+)
+from src.app.models.course import Course
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _session(read_your_writes, cookies=None, user_id=None):
+    primary = create_engine("sqlite://")
+    replica = create_engine("sqlite://")
+    session = RoutingSession(
+        primary=primary,
+        replica=replica,
+        replica_health=ReplicaHealth(30),
+        read_your_writes=read_your_writes,
+    )
+    session.info["request"] = SimpleNamespace(state=SimpleNamespace(user_id=user_id), cookies=cookies or {})
+    return session, primary, replica
+
+
+def test_reads_go_to_replica_without_a_recent_write():
+    session, _, replica = _session(ReadYourWrites(10, secret="k"))
+    assert session.get_bind(clause=select(Course)) is replica
+
+
+def test_writes_go_to_primary():
+    session, primary, _ = _session(ReadYourWrites(10, secret="k"))
+    assert session.get_bind(clause=insert(Course)) is primary
+
+
+def test_signed_cookie_pins_reads_to_primary_in_a_fresh_process():
+    writer = ReadYourWrites(10, secret="k")
+    cookie = writer.cookie_value(time.time())
+    # A different ReadYourWrites instance stands in for another worker with no in-memory record.
+    session, primary, _ = _session(ReadYourWrites(10, secret="k"), cookies={WRITE_COOKIE: cookie})
+    assert session.get_bind(clause=select(Course)) is primary
+
+
+def test_forged_or_expired_cookie_is_ignored():
+    rw = ReadYourWrites(10, secret="k")
+    forged = ReadYourWrites(10, secret="other").cookie_value(time.time())
+    expired = rw.cookie_value(time.time() - 11)
+    for value in (forged, expired, "garbage", f"{time.time():.3f}"):
+        session, _, replica = _session(rw, cookies={WRITE_COOKIE: value})
+        assert session.get_bind(clause=select(Course)) is replica
+
+
+def test_in_process_record_pins_reads_to_primary():
+    rw = ReadYourWrites(10, secret="k")
+    rw.record("u1")
+    session, primary, _ = _session(rw, user_id="u1")
+    assert session.get_bind(clause=select(Course)) is primary
+
+
+async def test_middleware_sets_cookie_only_after_a_commit():
+    rw = ReadYourWrites(10, secret="k")
+
+    async def write(request):
+        request.state.last_write_at = time.time()
+        return PlainTextResponse("ok")
+
+    async def read(request):
+        return PlainTextResponse("ok")
+
+    app = ReadYourWritesMiddleware(
+        Starlette(routes=[Route("/write", write), Route("/read", read)]), read_your_writes=rw
+    )
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        written = await client.get("/write")
+        read = await client.get("/read")
+
+    set_cookie = written.headers["set-cookie"]
+    assert set_cookie.startswith(f"{WRITE_COOKIE}=")
+    assert "Max-Age=10" in set_cookie and "HttpOnly" in set_cookie
+    assert rw.cookie_is_recent(set_cookie.split(";")[0].split("=", 1)[1])
+    assert "set-cookie" not in read.headers
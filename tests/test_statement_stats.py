@@ -0,0 +1,82 @@
+import logging
+
+import pytest
+
+from src.app.db import statement_stats as module
+from src.app.db.query_stats import RequestQueryStats, _current
+from src.app.db.statement_stats import StatementStats, fingerprint
+
+
+@pytest.mark.parametrize(
+    "statement, expected",
+    [
+        ("SELECT * FROM users WHERE email = 'a@b.c'", "SELECT * FROM users WHERE email = ?"),
+        ("SELECT * FROM users WHERE name = 'O''Brien'", "SELECT * FROM users WHERE name = ?"),
+        ("SELECT * FROM course WHERE id = $1 LIMIT $2", "SELECT * FROM course WHERE id = ? LIMIT ?"),
+        ("SELECT * FROM course WHERE id = %(id_1)s", "SELECT * FROM course WHERE id = ?"),
+        ("SELECT * FROM course WHERE id = :id", "SELECT * FROM course WHERE id = ?"),
+        ("SELECT * FROM course WHERE price > 10.5 LIMIT 20", "SELECT * FROM course WHERE price > ? LIMIT ?"),
+        ("SELECT * FROM video WHERE id IN (1, 2, 3)", "SELECT * FROM video WHERE id IN (?+)"),
+        ("SELECT * FROM video WHERE id IN ($1, $2)", "SELECT * FROM video WHERE id IN (?+)"),
+        ("SELECT * FROM video WHERE id IN (__[POSTCOMPILE_id_1])", "SELECT * FROM video WHERE id IN (?)"),
+        ("SELECT *\n  FROM   video", "SELECT * FROM video"),
+    ],
+)
+def test_fingerprint_collapses_values(statement, expected):
+    assert fingerprint(statement) == expected
+
+
+def test_fingerprint_keeps_identifiers_with_digits_and_casts():
+    assert fingerprint("SELECT col1 FROM t2 WHERE x::text = $1") == "SELECT col1 FROM t2 WHERE x::text = ?"
+
+
+def test_percentiles_over_the_rolling_window():
+    stats = StatementStats(window=100)
+    for ms in range(1, 201):   # Only the last 100 samples (101..200) stay in the window.
+        stats.observe(f"SELECT * FROM course WHERE id = {ms}", float(ms))
+
+    [row] = stats.top()
+
+    assert row["fingerprint"] == "SELECT * FROM course WHERE id = ?"
+    assert row["calls"] == 200
+    assert row["total_ms"] == sum(range(1, 201))
+    assert row["max_ms"] == 200
+    assert (row["p50_ms"], row["p95_ms"], row["p99_ms"]) == (151, 195, 199)
+
+
+def test_least_recently_used_fingerprint_is_evicted():
+    stats = StatementStats(max_fingerprints=2)
+    stats.observe("SELECT 1 FROM a", 1)
+    stats.observe("SELECT 1 FROM b", 1)
+    stats.observe("SELECT 1 FROM a", 1)
+    stats.observe("SELECT 1 FROM c", 1)
+
+    assert {row["fingerprint"] for row in stats.top()} == {"SELECT ? FROM a", "SELECT ? FROM c"}
+    assert stats.evicted == 1
+
+
+def test_top_orders_by_the_requested_column():
+    stats = StatementStats()
+    for _ in range(10):
+        stats.observe("SELECT 1 FROM frequent", 1)
+    stats.observe("SELECT 1 FROM slow", 50)
+
+    assert [row["fingerprint"] for row in stats.top(order_by="calls")][0] == "SELECT ? FROM frequent"
+    assert [row["fingerprint"] for row in stats.top(order_by="max_ms", limit=1)] == ["SELECT ? FROM slow"]
+
+
+def test_slow_statement_is_logged_with_its_route(monkeypatch, caplog):
+    monkeypatch.setattr(module, "SLOW_QUERY_MS", 100)
+    stats = StatementStats()
+    token = _current.set(RequestQueryStats({"method": "GET", "path": "/api/courses/my-courses"}))
+    try:
+        with caplog.at_level(logging.WARNING, logger="src.app.db.slow_query"):
+            stats.observe("SELECT * FROM enrollment WHERE user_id = $1", 99)
+            stats.observe("SELECT * FROM enrollment WHERE user_id = $1", 150)
+    finally:
+        _current.reset(token)
+
+    [record] = caplog.records
+    assert record.route == "GET /api/courses/my-courses"
+    assert record.duration_ms == 150
+    assert record.fingerprint == "SELECT * FROM enrollment WHERE user_id = ?"
@@ -0,0 +1,179 @@
+import io
+import threading
+import uuid
+
+import pytest
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, func, select
+
+from src.app.models.course import Course
+from src.app.models.enrollment import Enrollment
+from src.app.models.password_reset import PasswordReset
+from src.app.models.user import User
+from src.app.utils import student_import
+from src.app.utils.student_import import ImportOptions, import_students
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def db(app):
+    from src.app.db.session import engine
+
+    with Session(engine) as session:
+        yield session
+
+
+async def _import(content: str, fmt: str = "csv", **options):
+    from src.app.db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        return await import_students(session, io.BytesIO(content.encode()), fmt, ImportOptions(**options))
+
+
+def _domain():
+    return f"{uuid.uuid4().hex[:8]}.example.com"
+
+
+def _count(db, model, *where):
+    return db.exec(select(func.count()).select_from(model).where(*where)).one()
+
+
+async def test_invalid_rows_are_reported_and_valid_ones_created(db):
+    domain = _domain()
+    result = await _import(
+        "email,full_name\n"
+        f"ada@{domain},Ada\n"
+        "not-an-email,Bob\n"
+        f"ADA@{domain},Ada again\n"
+        ",No email\n"
+    )
+
+    assert result.created == 1
+    assert [(e["row"], e["error"]) for e in result.errors] == [
+        (2, "Invalid email address"), (3, "Duplicate email in file"), (4, "Missing email"),
+    ]
+    assert db.exec(select(User.email).where(User.email.like(f"%@{domain}"))).all() == [f"ada@{domain}"]
+
+
+async def test_already_registered_email_matches_in_any_case(db):
+    domain = _domain()
+    db.add(User(email=f"Grace@{domain}"))
+    db.commit()
+
+    result = await _import(f'{{"email": "grace@{domain}"}}\n{{"email": "GRACE@{domain.upper()}"}}\n', fmt="ndjson")
+
+    assert result.created == 0
+    assert [(e["row"], e["error"]) for e in result.errors] == [
+        (1, "Email already registered"), (2, "Duplicate email in file"),
+    ]
+    assert _count(db, User, func.lower(User.email) == f"grace@{domain}") == 1
+
+
+async def test_unknown_course_id_is_a_row_error(db):
+    course = Course(title="Import", description="Import test course")
+    db.add(course)
+    db.commit()
+    domain = _domain()
+
+    result = await _import(
+        "email,course_id\n"
+        f"a@{domain},{course.id}\n"
+        f"b@{domain},{uuid.uuid4()}\n"
+        f"c@{domain},not-a-uuid\n"
+    )
+
+    assert (result.created, result.enrollments_created) == (1, 1)
+    assert [(e["row"], e["error"]) for e in result.errors] == [(2, "Unknown course_id"), (3, "Invalid course_id")]
+    assert _count(db, Enrollment, Enrollment.course_id == course.id) == 1
+
+
+async def test_dry_run_with_reset_pins_writes_nothing(db):
+    domain = _domain()
+    content = f"email\na@{domain}\nb@{domain}\n"
+
+    dry = await _import(content, send_reset_pins=True, dry_run=True)
+
+    assert (dry.created, dry.reset_pins_sent, dry.pins) == (2, 0, [])
+    assert _count(db, User, User.email.like(f"%@{domain}")) == 0
+
+    real = await _import(content, send_reset_pins=True)
+
+    assert (real.created, real.reset_pins_sent) == (2, 2)
+    assert sorted(email for email, _ in real.pins) == [f"a@{domain}", f"b@{domain}"]
+    user_ids = db.exec(select(User.id).where(User.email.like(f"%@{domain}"))).all()
+    assert _count(db, PasswordReset, PasswordReset.user_id.in_(user_ids)) == 2
+
+
+async def test_rows_are_checked_across_batch_boundaries(db, monkeypatch):
+    monkeypatch.setattr(student_import, "STUDENT_IMPORT_BATCH_SIZE", 2)
+    domain = _domain()
+    db.add(User(email=f"taken@{domain}"))
+    db.commit()
+
+    result = await _import(
+        "email\n"
+        f"a@{domain}\n"
+        f"b@{domain}\n"
+        f"A@{domain}\n"        # Duplicate of a row from the previous batch.
+        f"taken@{domain}\n"
+        f"c@{domain}\n"
+    )
+
+    assert (result.total_rows, result.created) == (5, 3)
+    assert [(e["row"], e["error"]) for e in result.errors] == [
+        (3, "Duplicate email in file"), (4, "Email already registered"),
+    ]
+    assert _count(db, User, User.email.like(f"%@{domain}")) == 4
+
+
+async def test_upload_is_parsed_off_the_event_loop(monkeypatch):
+    parse_row = student_import.parse_row
+    threads = set()
+
+    def recording_parse_row(*args):
+        threads.add(threading.current_thread())
+        return parse_row(*args)
+
+    monkeypatch.setattr(student_import, "parse_row", recording_parse_row)
+    domain = _domain()
+
+    result = await _import(f"email\na@{domain}\nb@{domain}\n", dry_run=True)
+
+    assert result.created == 2
+    assert threads and threading.main_thread() not in threads
+
+
+async def test_failed_batch_is_rolled_back_and_reported(db, monkeypatch):
+    monkeypatch.setattr(student_import, "STUDENT_IMPORT_BATCH_SIZE", 2)
+    insert_for = student_import.insert_for
+    calls = []
+
+    def failing_second_insert(session, table):
+        calls.append(table)
+        if len(calls) == 2:
+            raise OperationalError("INSERT INTO users", {}, Exception("connection lost"))
+        return insert_for(session, table)
+
+    monkeypatch.setattr(student_import, "insert_for", failing_second_insert)
+    domain = _domain()
+    course = Course(title="Batch failure", description="")
+    db.add(course)
+    db.commit()
+
+    result = await _import(
+        "email,course_id\n"
+        f"a@{domain},\n"
+        f"b@{domain},\n"
+        f"c@{domain},\n"
+        f"d@{domain},{uuid.uuid4()}\n"   # Already an error before the batch fails.
+        f"e@{domain},{course.id}\n"
+    )
+
+    assert (result.total_rows, result.created, result.enrollments_created) == (5, 3, 1)
+    assert [(e["row"], e["email"], e["error"]) for e in result.errors] == [
+        (3, f"c@{domain}", "Database error; row not imported"),
+        (4, f"d@{domain}", "Unknown course_id"),
+    ]
+    emails = db.exec(select(User.email).where(User.email.like(f"%@{domain}"))).all()
+    assert sorted(emails) == [f"a@{domain}", f"b@{domain}", f"e@{domain}"]
@@ -0,0 +1,65 @@
+import uuid
+
+import pytest
+from sqlmodel import Session
+
+from src.app.models.user import User
+from src.app.utils.security import create_access_token
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def db(app):
+    from src.app.db.session import engine
+
+    with Session(engine) as session:
+        yield session
+
+
+def _user(db, role):
+    user = User(email=f"{uuid.uuid4().hex}@example.com", role=role)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def _cookie(user, subject_claim):
+    token = create_access_token({subject_claim: str(user.id), "role": user.role, "email": user.email, "ver": 0})
+    return {"Cookie": f"access_token={token}"}
+
+
+async def test_suspended_student_token_is_rejected(client, db):
+    student = _user(db, "student")
+    headers = _cookie(student, "user_id")
+    assert (await client.get("/api/profile/profile", headers=headers)).status_code == 404   # Authorized, no profile.
+
+    student.is_active = False
+    db.commit()
+
+    response = await client.get("/api/profile/profile", headers=headers)
+    assert response.status_code == 401
+    assert student.token_version == 1
+
+
+async def test_demoted_admin_token_is_rejected(client, db):
+    admin = _user(db, "admin")
+    headers = _cookie(admin, "sub")
+    assert (await client.get("/api/admin/system/runtime", headers=headers)).status_code == 200
+
+    admin.role = "student"
+    db.commit()
+
+    assert (await client.get("/api/admin/system/runtime", headers=headers)).status_code in (401, 403)
+
+
+def test_explicit_revocation_is_not_doubled(db):
+    from src.app.utils.token_revocation import revoke_user_tokens
+
+    user = _user(db, "student")
+    user.is_active = False
+    revoke_user_tokens(user)
+    db.commit()
+
+    assert user.token_version == 1
@@ -0,0 +1,109 @@
+import uuid
+
+import pytest
+from sqlmodel import Session
+
+from src.app.models.profile import Profile
+from src.app.models.user import User
+from src.app.utils.cache import TTLCache
+from src.app.utils.security import create_access_token
+from src.app.utils.user_cache import user_cache
+
+pytestmark = pytest.mark.anyio
+
+PROFILE = "/api/profile/profile"
+
+
+@pytest.fixture
+def db(app):
+    from src.app.db.session import engine
+
+    with Session(engine) as session:
+        yield session
+
+
+def _user(db, role="student"):
+    user = User(email=f"{uuid.uuid4().hex}@example.com", role=role)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def _cookie(user, subject_claim="user_id", version=None):
+    claims = {subject_claim: str(user.id), "role": user.role, "email": user.email}
+    if version is not None:
+        claims["ver"] = version
+    return {"Cookie": f"access_token={create_access_token(claims)}"}
+
+
+async def _authorized(client, headers) -> bool:
+    return (await client.get(PROFILE, headers=headers)).status_code == 404   # Authorized, no profile.
+
+
+async def test_legacy_token_is_served_from_the_cache_until_the_user_changes(client, db):
+    student = _user(db)
+    headers = _cookie(student)
+
+    assert await _authorized(client, headers)
+    assert user_cache.get(str(student.id)).is_active
+
+    student.is_active = False
+    db.commit()
+
+    assert user_cache.get(str(student.id)) is None
+    assert (await client.get(PROFILE, headers=headers)).status_code == 401
+
+
+async def test_suspension_revokes_cached_and_versioned_tokens(client, db):
+    admin, student = _user(db, "admin"), _user(db)
+    legacy, versioned = _cookie(student), _cookie(student, version=0)
+    assert await _authorized(client, legacy) and await _authorized(client, versioned)
+
+    suspended = await client.post(f"/api/admin/users/{student.id}/suspend", headers=_cookie(admin, "sub", 0))
+    assert suspended.status_code == 200
+
+    assert user_cache.get(str(student.id)) is None
+    assert (await client.get(PROFILE, headers=legacy)).status_code == 401
+    assert (await client.get(PROFILE, headers=versioned)).status_code == 401
+
+    # Reactivation does not resurrect tokens issued before the suspension.
+    assert (await client.post(f"/api/admin/users/{student.id}/reactivate", headers=_cookie(admin, "sub", 0))).status_code == 200
+    db.refresh(student)
+    assert (await client.get(PROFILE, headers=versioned)).status_code == 401
+    assert await _authorized(client, _cookie(student, version=student.token_version))
+
+
+async def test_rolled_back_change_keeps_the_entry(client, db):
+    student = _user(db)
+    assert await _authorized(client, _cookie(student))
+
+    student.is_active = False
+    db.flush()
+    db.rollback()
+
+    assert user_cache.get(str(student.id)) is not None
+
+
+async def test_profile_edit_invalidates_the_owner_only(client, db):
+    ada, bob = _user(db), _user(db)
+    for user in (ada, bob):
+        assert await _authorized(client, _cookie(user))
+    profile = Profile(user_id=ada.id, full_name="Ada")
+    db.add(profile)
+    db.commit()
+
+    profile.full_name = "Ada Lovelace"
+    db.commit()
+
+    assert user_cache.get(str(ada.id)) is None
+    assert user_cache.get(str(bob.id)) is not None
+
+
+def test_value_loaded_before_an_invalidation_is_not_stored():
+    cache = TTLCache(10, 60)
+    generation = cache.generation   # A reader starts loading...
+    cache.invalidate("user")        # ...the row changes and commits...
+    cache.set("user", "stale", generation=generation)
+
+    assert cache.get("user") is None